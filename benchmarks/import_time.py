@@ -0,0 +1,129 @@
+"""
+Import-time budget for the headless modules.
+
+zup-timesheet is meant to be run from cron and scripts, so importing it (and
+the core it builds on) must stay cheap: no Qt, and no ClickUp SDK/requests
+until something is actually fetched. Each module is imported in a fresh
+interpreter a few times; the median import time must be within its budget
+and none of the forbidden modules may have been loaded.
+
+Usage:
+    python benchmarks/import_time.py [--runs N] [--verbose]
+
+Exits with status 1 if any module is over budget or imports a forbidden
+module. --verbose lists the slowest imports of each module (python -X
+importtime).
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+import click
+
+# Module -> budget in milliseconds.
+BUDGETS_MS = {
+    "zup.config_store": 40,
+    "zup.clickup_client": 40,
+    "zup.state_store": 40,
+    "zup.time_entry_store": 40,
+    "zup.timesheet": 100,
+}
+
+FORBIDDEN_PREFIXES = ("PySide6", "shiboken6", "clickup_python_sdk", "requests")
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed_ms = (time.perf_counter() - start) * 1000
+forbidden = sorted(
+    name for name in sys.modules if name.split(".")[0] in {forbidden!r}
+)
+print(json.dumps({{"ms": elapsed_ms, "forbidden": forbidden}}))
+"""
+
+_REPOSITORY_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _environment() -> dict[str, str]:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [_REPOSITORY_ROOT, env.get("PYTHONPATH")])
+    )
+    return env
+
+
+def _probe(module: str) -> dict:
+    output = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            _PROBE.format(module=module, forbidden=FORBIDDEN_PREFIXES),
+        ],
+        check=True,
+        capture_output=True,
+        text=True,
+        env=_environment(),
+    ).stdout
+    return json.loads(output)
+
+
+def _slowest_imports(module: str, count: int = 8) -> list[tuple[int, str]]:
+    """Returns (cumulative microseconds, name) of the slowest imports."""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        check=True,
+        capture_output=True,
+        text=True,
+        env=_environment(),
+    ).stderr
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        # Children are listed (indented) before their parent, so the module's
+        # own imports follow the previous top-level import (e.g. site's).
+        if not name.startswith("  "):
+            if name.strip() != module:
+                imports = []
+                continue
+        imports.append((int(cumulative), name.rstrip()))
+    return sorted(imports, reverse=True)[:count]
+
+
+@click.command()
+@click.option(
+    "--runs",
+    default=5,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Fresh interpreters per module.",
+)
+@click.option("--verbose", is_flag=True, help="List the slowest imports.")
+def main(runs: int, verbose: bool) -> None:
+    """Check the import time of the headless modules against their budget."""
+    failed = False
+    for module, budget_ms in BUDGETS_MS.items():
+        probes = [_probe(module) for _ in range(runs)]
+        median_ms = statistics.median(probe["ms"] for probe in probes)
+        forbidden = probes[0]["forbidden"]
+        ok = median_ms <= budget_ms and not forbidden
+        failed |= not ok
+        click.echo(
+            f"{'ok  ' if ok else 'FAIL'} {module:<22} {median_ms:6.1f} ms"
+            f" (budget {budget_ms} ms)"
+        )
+        if forbidden:
+            click.echo(f"     imports {', '.join(forbidden)}")
+        if verbose:
+            for cumulative_us, name in _slowest_imports(module):
+                click.echo(f"     {cumulative_us / 1000:6.1f} ms {name}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Per-keystroke budget for the task search.
+
+The log-work dialog searches on every keystroke, so a search must fit in a
+frame. An IssueSearchIndex is built over a synthetic workspace of ClickUp-like
+tasks: names drawn from a small vocabulary, a handful of lists, and IDs that
+all share the "86" prefix, as modern ClickUp task IDs do. Each query is timed
+a few times; the median must be within budget. The queries include broad
+ones, such as the ID prefix "8", that match nearly every task.
+
+Usage:
+    python benchmarks/search_time.py [--issues N] [--runs N] [--budget MS]
+
+Exits with status 1 if any query is over budget.
+"""
+
+import os
+import random
+import statistics
+import string
+import sys
+import time
+
+import click
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from zup.issue_search import IssueSearchIndex  # noqa: E402
+
+DEFAULT_BUDGET_MS = 16
+
+QUERIES = (
+    "8",
+    "86",
+    "86c",
+    "8 a",
+    "a",
+    "fix",
+    "fix log",
+    "lgoin",
+    "release 8",
+    "zzz",
+)
+
+_WORDS = (
+    "add api backend bug build cache cleanup client config crash dashboard"
+    " deploy docs error export feature fix form import invoice layout login"
+    " logout mobile onboarding page payment performance refactor release"
+    " report search settings signup support sync test timeout ui update"
+    " upgrade user validation web"
+).split()
+
+
+def _issues(count: int) -> list[dict]:
+    generator = random.Random(4)
+    lists = [f"{generator.choice(_WORDS).title()} team" for _ in range(12)]
+    alphabet = string.ascii_lowercase + string.digits
+    return [
+        {
+            "id": "86" + "".join(generator.choices(alphabet, k=7)),
+            "name": " ".join(generator.choices(_WORDS, k=generator.randint(2, 7))),
+            "list_name": generator.choice(lists),
+        }
+        for _ in range(count)
+    ]
+
+
+@click.command()
+@click.option(
+    "--issues",
+    "issue_count",
+    default=20_000,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Tasks in the index.",
+)
+@click.option(
+    "--runs",
+    default=5,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Searches per query.",
+)
+@click.option(
+    "--budget",
+    "budget_ms",
+    default=DEFAULT_BUDGET_MS,
+    show_default=True,
+    type=click.FloatRange(min=0),
+    help="Budget per search, in milliseconds.",
+)
+def main(issue_count: int, runs: int, budget_ms: float) -> None:
+    """Check the time of a search against the per-keystroke budget."""
+    issues = _issues(issue_count)
+    start = time.perf_counter()
+    index = IssueSearchIndex(issues)
+    click.echo(
+        f"     index of {issue_count} tasks built in"
+        f" {(time.perf_counter() - start) * 1000:.1f} ms"
+    )
+    generator = random.Random(5)
+    usage = {
+        issue["id"]: generator.random() * 5 for issue in generator.sample(issues, 50)
+    }
+    failed = False
+    for query in QUERIES:
+        timings = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            index.search(query, usage)
+            timings.append((time.perf_counter() - start) * 1000)
+        median_ms = statistics.median(timings)
+        ok = median_ms <= budget_ms
+        failed |= not ok
+        click.echo(
+            f"{'ok  ' if ok else 'FAIL'} {query!r:<12} {median_ms:6.1f} ms"
+            f" (budget {budget_ms:g} ms)"
+        )
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
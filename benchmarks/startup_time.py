@@ -0,0 +1,155 @@
+"""
+Startup-time budget for the tray application.
+
+The tray icon is the only sign that Zup is running, so it must show up as soon
+as possible after launch; the registration queue, the scheduler and the
+dialogs are set up or loaded after it. zup.zup.main() is run in a fresh
+interpreter a few times, with empty temporary config/data/cache directories,
+and the time from interpreter start to the icon being shown is measured.
+
+Usage:
+    python benchmarks/startup_time.py [--runs N] [--budget MS] [--verbose]
+
+Exits with status 1 if the median time to the icon is over budget, or if any
+of the modules that should only be loaded later was loaded before it.
+
+The time depends on the machine, so the budget can also be set with the
+ZUP_STARTUP_BUDGET_MS environment variable. The default, 400 ms, leaves room
+for a slower machine than the one it was measured on: about 280 ms there,
+against about 550 ms before the icon was shown ahead of the rest of the
+startup.
+--verbose lists the slowest imports of zup.zup (python -X importtime).
+
+Qt's offscreen platform is used unless QT_QPA_PLATFORM is set.
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import click
+
+DEFAULT_BUDGET_MS = 400
+
+# Loaded after the icon is shown, or when first used.
+DEFERRED_MODULES = (
+    "clickup_python_sdk",
+    "pendulum",
+    "requests",
+    "zup.configuration",
+    "zup.list_picker",
+    "zup.log_work",
+    "zup.registration_queue",
+    "zup.scheduler",
+)
+
+_PROBE = """
+import json, os, sys, time
+import zup.zup
+def show(self):
+    zup.zup.QSystemTrayIcon.show(self)
+    loaded = sorted(
+        name for name in sys.modules
+        if name in {deferred!r} or name.split(".")[0] in {deferred!r}
+    )
+    print(json.dumps({{"shown": time.time(), "loaded": loaded}}), flush=True)
+    os._exit(0)
+zup.zup.SystemTrayIcon.show = show
+zup.zup.main()
+"""
+
+_REPOSITORY_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _environment(home: str) -> dict[str, str]:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [_REPOSITORY_ROOT, env.get("PYTHONPATH")])
+    )
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    for variable in ("XDG_CONFIG_HOME", "XDG_DATA_HOME", "XDG_CACHE_HOME"):
+        env[variable] = os.path.join(home, variable.lower())
+    return env
+
+
+def _probe() -> dict:
+    with tempfile.TemporaryDirectory() as home:
+        started = time.time()
+        output = subprocess.run(
+            [sys.executable, "-c", _PROBE.format(deferred=DEFERRED_MODULES)],
+            check=True,
+            capture_output=True,
+            text=True,
+            env=_environment(home),
+            timeout=60,
+        ).stdout
+    probe = json.loads(output.splitlines()[-1])
+    probe["ms"] = (probe["shown"] - started) * 1000
+    return probe
+
+
+def _slowest_imports(count: int = 8) -> list[tuple[int, str]]:
+    """Returns (cumulative microseconds, name) of the slowest imports."""
+    with tempfile.TemporaryDirectory() as home:
+        stderr = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import zup.zup"],
+            check=True,
+            capture_output=True,
+            text=True,
+            env=_environment(home),
+        ).stderr
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        imports.append((int(cumulative), name.rstrip()))
+    return sorted(imports, reverse=True)[:count]
+
+
+@click.command()
+@click.option(
+    "--runs",
+    default=5,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Launches to measure.",
+)
+@click.option(
+    "--budget",
+    "budget_ms",
+    default=DEFAULT_BUDGET_MS,
+    envvar="ZUP_STARTUP_BUDGET_MS",
+    show_default=True,
+    type=click.IntRange(min=1),
+    help=(
+        "Budget for the median time to the tray icon, in milliseconds."
+        " Also read from ZUP_STARTUP_BUDGET_MS."
+    ),
+)
+@click.option("--verbose", is_flag=True, help="List the slowest imports.")
+def main(runs: int, budget_ms: int, verbose: bool) -> None:
+    """Check the time from launch to the tray icon against its budget."""
+    probes = [_probe() for _ in range(runs)]
+    median_ms = statistics.median(probe["ms"] for probe in probes)
+    loaded = probes[0]["loaded"]
+    ok = median_ms <= budget_ms and not loaded
+    click.echo(
+        f"{'ok  ' if ok else 'FAIL'} time to tray icon {median_ms:6.1f} ms"
+        f" (budget {budget_ms} ms; min {min(p['ms'] for p in probes):.1f},"
+        f" max {max(p['ms'] for p in probes):.1f})"
+    )
+    if loaded:
+        click.echo(f"     loaded before the icon: {', '.join(loaded)}")
+    if verbose:
+        for cumulative_us, name in _slowest_imports():
+            click.echo(f"     {cumulative_us / 1000:6.1f} ms {name}")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
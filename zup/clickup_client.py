@@ -3,7 +3,7 @@ ClickUp client for fetching tasks and registering time.
 
 The ClickUpClient class is the primary interface used by the application.
 It mirrors the interface of the old TargetProcessClient:
-  - get_relevant_issues(list_ids) -> list of {"id": str, "name": str}
+  - get_relevant_issues(list_ids, max_workers) -> list of {"id": str, "name": str}
   - submit_time_registration(issue_id, decimal_hours)
 
 Time is expressed in decimal hours throughout the application (e.g. 0.5 = 30 min).
@@ -11,12 +11,32 @@ The client converts to milliseconds when calling the ClickUp API.
 
 The user token is passed at construction time. The caller (zup.py) is responsible
 for reading it from ConfigStore. This module has no knowledge of ConfigStore.
+
+The SDK keeps its token and API object in class attributes, so there is really
+only one SDK client per process. The application shares one ClickUpClient
+between its dialogs and worker threads as well (see shared_client()), so that
+the token is authorised, and the team and Release type IDs are fetched, once
+per session rather than once per dialog. With a metadata cache (see
+zup.metadata_cache) they are kept across sessions too.
+
+Requests go through a pool of keep-alive connections shared by all threads
+(see zup.clickup_transport), rather than a new connection per request.
+
+The ClickUp SDK (and with it requests) is only imported once a client talks to
+ClickUp, so that commands served from local data start quickly.
 """
 
+import collections
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable
+
+if TYPE_CHECKING:
+    from clickup_python_sdk.api import ClickupClient
 
-from clickup_python_sdk.api import ClickupClient
-from clickup_python_sdk.clickupobjects.task import Task
+    from zup.metadata_cache import ClickUpMetadataCache
 
 LOG = logging.getLogger(__name__)
 
@@ -27,6 +47,133 @@ _DECIMAL_HOURS_TO_MS = 3600 * 1000
 
 _NOT_FETCHED = object()  # sentinel distinguishing "not yet fetched" from None
 
+# Cached metadata older than this is used, but revalidated in the background.
+METADATA_TTL_SECONDS = 24 * 3600
+
+
+def _init_sdk_client(user_token: str, user: dict | None = None) -> "ClickupClient":
+    """
+    Install a pooled SDK client for user_token as the SDK's default API, like
+    ClickupClient.init() does. The token's user is fetched (a network call)
+    unless it is given.
+    """
+    from clickup_python_sdk.api import ClickupClient
+
+    from zup.clickup_transport import PooledClickupClient
+
+    # Set on the base class, which is where the SDK objects look them up.
+    ClickupClient._set_default_headers(user_token)
+    client = PooledClickupClient()
+    ClickupClient._set_default_api(client)
+    if user is None:
+        client.set_token_user()
+    else:
+        from clickup_python_sdk.clickupobjects.user import User
+
+        # The SDK annotates data as a User, but it takes the API response.
+        client.TOKEN_USER = User.create_object(
+            data=user, target_class=User  # type: ignore[arg-type]
+        )
+    return client
+
+
+def is_retryable_error(exc: Exception) -> bool:
+    """
+    Whether a failed request may succeed when retried later.
+
+    Network errors, timeouts (408), rate limiting (429) and server errors
+    (5xx) are retryable. Everything else, including other client errors and
+    errors raised before a request was made, is not; but see is_auth_error().
+    """
+    import requests
+    from clickup_python_sdk.exceptions import ClickupRequestException
+
+    if isinstance(exc, ClickupRequestException):
+        status = exc.http_status()
+        return status in (408, 429) or 500 <= status < 600
+    return isinstance(exc, requests.RequestException)
+
+
+def is_auth_error(exc: Exception) -> bool:
+    """
+    Whether a request failed because ClickUp rejected the API token (401 or
+    403). Such a request may succeed once the token has been fixed.
+    """
+    from clickup_python_sdk.exceptions import ClickupRequestException
+
+    if isinstance(exc, ClickupRequestException):
+        return exc.http_status() in (401, 403)
+    return False
+
+
+class RateLimiter:
+    """
+    Allows at most max_calls calls per sliding window of window_seconds,
+    across threads. acquire() blocks until the next call is allowed.
+    """
+
+    def __init__(self, max_calls: int, window_seconds: float = 60.0) -> None:
+        self._max_calls = max(1, max_calls)
+        self._window_seconds = window_seconds
+        self._calls: collections.deque[float] = collections.deque()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._calls and now - self._calls[0] >= self._window_seconds:
+                    self._calls.popleft()
+                if len(self._calls) < self._max_calls:
+                    self._calls.append(now)
+                    return
+                wait = self._window_seconds - (now - self._calls[0])
+            time.sleep(wait)
+
+
+def _for_each(fn: Callable[[Any], None], items: list, max_workers: int) -> None:
+    """
+    Call fn on every item, on up to max_workers threads at once.
+
+    With max_workers <= 1 (or a single item) the calls are made one after the
+    other on the calling thread.
+    """
+    if max_workers <= 1 or len(items) <= 1:
+        for item in items:
+            fn(item)
+        return
+    with ThreadPoolExecutor(
+        max_workers=min(max_workers, len(items)), thread_name_prefix="clickup"
+    ) as executor:
+        list(executor.map(fn, items))
+
+
+def _max_date_updated(high_water: int | None, task: dict) -> int | None:
+    """Return the later of high_water and the task's "date_updated" (ms)."""
+    date_updated = task.get("date_updated")
+    if not date_updated:
+        return high_water
+    return max(high_water or 0, int(date_updated))
+
+
+def merge_list_issues(list_ids: list[str], per_list: dict[str, list[dict]]) -> list[dict]:
+    """
+    Concatenate per-list issues in the order of list_ids, deduplicating by ID.
+
+    The first occurrence of a task wins, so a task present in several lists is
+    attributed to the earliest configured one. Lists missing from per_list
+    (e.g. because fetching them failed) are skipped.
+    """
+    seen_ids: set[str] = set()
+    result: list[dict] = []
+    for list_id in list_ids:
+        for issue in per_list.get(list_id, []):
+            if issue["id"] in seen_ids:
+                continue
+            seen_ids.add(issue["id"])
+            result.append(issue)
+    return result
+
 
 class ClickUpClient:
     """
@@ -36,86 +183,255 @@ class ClickUpClient:
     the rest of the application.
     """
 
-    def __init__(self, user_token: str) -> None:
+    def __init__(
+        self,
+        user_token: str,
+        metadata_cache: "ClickUpMetadataCache | None" = None,
+    ) -> None:
         self._user_token = user_token
-        self._client: ClickupClient | None = None
+        # Where the user, team and Release type IDs are kept across sessions.
+        self._metadata_cache = metadata_cache
+        # When what is known of them was fetched, for the cache's TTL.
+        self._metadata_fetched_at: float | None = None
+        self._revalidating = False
+        self._client: "ClickupClient | None" = None
+        # Serialises the lazy SDK initialisation across worker threads.
+        self._client_lock = threading.Lock()
+        # Serialises fetching the team and Release type IDs below.
+        self._metadata_lock = threading.RLock()
         # Cached team ID (str) or None if workspace has no teams.
         self._team_id: str | None | object = _NOT_FETCHED
+        # Members of that team, fetched together with its ID.
+        self._team_members: list[dict] = []
         # Cached numeric custom_item_id for the "Release" task type, or None.
         self._release_type_id: int | None | object = _NOT_FETCHED
 
-    def _get_client(self) -> ClickupClient:
-        """Lazily initialise the underlying SDK client (makes a network call)."""
-        if self._client is None:
-            self._client = ClickupClient.init(user_token=self._user_token)
-            user = self._client.TOKEN_USER
-            LOG.debug(
-                "Authorised as: %s (email=%s, id=%s)",
-                user["username"],
-                user["email"],
-                user["id"],
-            )
+    def _get_client(self) -> "ClickupClient":
+        """
+        Lazily initialise the underlying SDK client. This makes a network
+        call, unless the token's user was cached by an earlier session.
+        """
+        with self._client_lock:
+            if self._client is None:
+                if self._load_cached_metadata():
+                    return self._client  # type: ignore[return-value]
+                self._client = _init_sdk_client(self._user_token)
+                self._metadata_fetched_at = time.time()
+                self._save_metadata()
+                user = self._client.TOKEN_USER
+                LOG.debug(
+                    "Authorised as: %s (email=%s, id=%s)",
+                    user["username"],
+                    user["email"],
+                    user["id"],
+                )
         return self._client
 
-    def _get_team_id(self) -> str | None:
-        """Return the first workspace/team ID, cached after the first call."""
+    def _load_cached_metadata(self) -> bool:
+        """
+        Initialise the SDK client from the metadata cache, without the
+        authorisation call, and take the team and Release type IDs from it
+        if they are cached too. Starts revalidating them in the background
+        if they are older than METADATA_TTL_SECONDS.
+
+        Returns False if the token's user is not cached. Must be called
+        with _client_lock held.
+        """
+        if self._metadata_cache is None:
+            return False
+        cached = self._metadata_cache.get(self._user_token)
+        if cached is None or not cached[0].get("user"):
+            return False
+        metadata, fetched_at = cached
+        client = _init_sdk_client(self._user_token, user=metadata["user"])
+        if "team_id" in metadata:
+            self._team_members = metadata.get("team_members") or []
+            self._team_id = metadata["team_id"]
+        if "release_type_id" in metadata:
+            self._release_type_id = metadata["release_type_id"]
+        self._metadata_fetched_at = fetched_at
+        self._client = client
+        LOG.debug(
+            "Authorised as: %s (id=%s), from the cache",
+            metadata["user"].get("username"),
+            metadata["user"].get("id"),
+        )
+        if time.time() - fetched_at >= METADATA_TTL_SECONDS:
+            self._revalidate_metadata_in_background()
+        return True
+
+    def prewarm(self) -> None:
+        """
+        Initialise the SDK client and open a pooled connection to ClickUp,
+        so that the next request goes straight to the server. Meant to run
+        on a background thread ahead of a burst of requests; errors are
+        logged, not raised.
+        """
+        try:
+            self._get_client()
+        except Exception:
+            LOG.exception("Failed to initialise the ClickUp client")
+            return
+        from zup.clickup_transport import prewarm
+
+        prewarm()
+
+    def _save_metadata(self) -> None:
+        """Write what is known of the user, team and Release type IDs."""
+        if self._metadata_cache is None or self._client is None:
+            return
+        metadata: dict[str, Any] = {"user": dict(self._client.TOKEN_USER._data)}
         if self._team_id is not _NOT_FETCHED:
-            return self._team_id  # type: ignore[return-value]
-        teams = self._get_client().get_teams()
+            metadata["team_id"] = self._team_id
+            metadata["team_members"] = self._team_members
+        if self._release_type_id is not _NOT_FETCHED:
+            metadata["release_type_id"] = self._release_type_id
+        try:
+            self._metadata_cache.set(
+                self._user_token, metadata, self._metadata_fetched_at
+            )
+        except OSError:
+            LOG.exception("Failed to write the ClickUp metadata cache")
+
+    def _revalidate_metadata_in_background(self) -> None:
+        """Start _revalidate_metadata() on a thread, unless it is running."""
+        with self._metadata_lock:
+            if self._revalidating:
+                return
+            self._revalidating = True
+        threading.Thread(
+            target=self._revalidate_metadata,
+            name="clickup-metadata",
+            daemon=True,
+        ).start()
+
+    def _revalidate_metadata(self) -> None:
+        """
+        Re-fetch the user, team and Release type IDs and update the cache.
+        Until this is done, the cached values stay in use.
+        """
+        try:
+            client = self._get_client()
+            client.set_token_user()
+            teams = client.get_teams()
+            release_type_id = self._fetch_release_type_id(
+                teams[0]["id"] if teams else None
+            )
+            with self._metadata_lock:
+                self._set_teams(teams)
+                self._release_type_id = release_type_id
+                self._metadata_fetched_at = time.time()
+                self._save_metadata()
+            LOG.debug("Revalidated the cached ClickUp metadata.")
+        except Exception:
+            LOG.exception("Failed to revalidate the cached ClickUp metadata")
+        finally:
+            self._revalidating = False
+
+    def _set_teams(self, teams: list) -> None:
+        """Take the team ID and members from the first of the teams."""
         if teams:
             LOG.debug("Available workspaces:")
             for team in teams:
                 LOG.debug("  [%s] %s", team["id"], team["name"])
+            # Members first: readers check _team_id without the lock.
+            self._team_members = [
+                member["user"]
+                for member in teams[0]._data.get("members") or []
+                if member.get("user")
+            ]
             self._team_id = teams[0]["id"]
             LOG.debug("Using workspace: %s (%s)", teams[0]["name"], teams[0]["id"])
         else:
             LOG.debug("No workspaces found for this token.")
             self._team_id = None
+
+    def _get_team_id(self) -> str | None:
+        """Return the first workspace/team ID, cached after the first call."""
+        if self._team_id is not _NOT_FETCHED:
+            return self._team_id  # type: ignore[return-value]
+        # Not under _metadata_lock: this may fill in the ID from the cache.
+        client = self._get_client()
+        with self._metadata_lock:
+            if self._team_id is not _NOT_FETCHED:
+                return self._team_id  # type: ignore[return-value]
+            self._set_teams(client.get_teams())
+            self._save_metadata()
         return self._team_id  # type: ignore[return-value]
 
+    def get_team_members(self) -> list[dict]:
+        """
+        Return the members of the workspace as {"id": str, "username": str,
+        "email": str} dicts. Fetched together with the team ID.
+        """
+        self._get_team_id()
+        return [
+            {
+                "id": str(user["id"]),
+                "username": user.get("username") or "",
+                "email": user.get("email") or "",
+            }
+            for user in self._team_members
+        ]
+
     def _get_release_type_id(self) -> int | None:
         """
         Return the numeric custom_item_id for the "Release" task type, or None.
 
         The result is fetched once per session and cached on the instance.
+        A failed fetch is not cached, so the next call tries again.
         Requires the SDK singleton to be initialised before calling.
         """
         if self._release_type_id is not _NOT_FETCHED:
             return self._release_type_id  # type: ignore[return-value]
-
-        try:
-            team_id = self._get_team_id()
-            if not team_id:
-                self._release_type_id = None
-                return None
-            response = self._get_client().make_request(
-                method="GET", route=f"team/{team_id}/custom_item"
-            )
-            response_data: dict = response or {}  # type: ignore[assignment]
-            custom_items = response_data.get("custom_items", [])
-            if custom_items:
-                LOG.debug("Custom task types in workspace:")
-                for item in custom_items:
-                    LOG.debug("  [%s] %s", item.get("id"), item.get("name"))
-            else:
-                LOG.debug("No custom task types found in workspace.")
-            for item in custom_items:
-                if item.get("name", "").strip().lower() == "release":
-                    self._release_type_id = int(item["id"])
-                    LOG.debug("Release custom_item_id resolved to %s", self._release_type_id)
-                    return self._release_type_id  # type: ignore[return-value]
-            LOG.debug("No 'Release' custom task type found in workspace.")
-            self._release_type_id = None
-        except Exception:
-            LOG.exception("Failed to fetch custom task types; Release expansion disabled.")
-            self._release_type_id = None
-
+        with self._metadata_lock:
+            if self._release_type_id is _NOT_FETCHED:
+                try:
+                    self._release_type_id = self._fetch_release_type_id(
+                        self._get_team_id()
+                    )
+                    self._save_metadata()
+                except Exception:
+                    LOG.exception(
+                        "Failed to fetch custom task types;"
+                        " Release expansion disabled this time."
+                    )
+                    return None
         return self._release_type_id  # type: ignore[return-value]
 
-    def _fetch_subtasks(self, parent_task_id: str) -> list[dict]:
+    def _fetch_release_type_id(self, team_id: str | None) -> int | None:
+        """
+        Look up the "Release" custom task type of the team; see
+        _get_release_type_id(). Raises on API error.
+        """
+        if not team_id:
+            return None
+        response = self._get_client().make_request(
+            method="GET", route=f"team/{team_id}/custom_item"
+        )
+        response_data: dict = response or {}  # type: ignore[assignment]
+        custom_items = response_data.get("custom_items", [])
+        if custom_items:
+            LOG.debug("Custom task types in workspace:")
+            for item in custom_items:
+                LOG.debug("  [%s] %s", item.get("id"), item.get("name"))
+        else:
+            LOG.debug("No custom task types found in workspace.")
+        for item in custom_items:
+            if item.get("name", "").strip().lower() == "release":
+                release_type_id = int(item["id"])
+                LOG.debug("Release custom_item_id resolved to %s", release_type_id)
+                return release_type_id
+        LOG.debug("No 'Release' custom task type found in workspace.")
+        return None
+
+    def _fetch_subtasks(
+        self, parent_task_id: str, params: dict | None = None
+    ) -> list[dict]:
         """
         Fetch direct subtasks of a task via GET /team/{team_id}/task?parent={id}.
 
+        Extra query parameters (e.g. "date_updated_gt") are passed through.
         Returns a list of raw task dicts. Raises on API error.
         """
         team_id = self._get_team_id()
@@ -124,12 +440,252 @@ class ClickUpClient:
         response = self._get_client().make_request(
             method="GET",
             route=f"team/{team_id}/task",
-            params={"parent": parent_task_id},
+            params={**(params or {}), "parent": parent_task_id},
         )
         response_data: dict = response or {}  # type: ignore[assignment]
         return response_data.get("tasks", [])
 
-    def get_relevant_issues(self, list_ids: list[str]) -> list[dict]:
+    def _fetch_list_snapshot(self, list_id: str, release_type_id: int | None) -> dict:
+        """
+        Fetch the open tasks of a single ClickUp list, expanding Release tasks.
+
+        Returns a snapshot dict:
+            {
+              "list_name": str,
+              "tasks": [{"id": str, "name": str, "list_name": str}],
+              "releases": {release_task_id: [subtask_id, ...]},
+              "high_water": int | None,   # latest date_updated seen, in ms
+              "full_sync_at": float,      # UNIX timestamp of this full fetch
+            }
+        The tasks are in API order and are not deduplicated; see
+        merge_list_issues(). Raises on API error.
+        """
+        from clickup_python_sdk.clickupobjects.list import List as CUList
+
+        full_sync_at = time.time()
+        cu_list = CUList(id=list_id)
+        cu_list.get()  # populates list metadata, including "name"
+        list_name: str = cu_list["name"] if "name" in cu_list else list_id
+        tasks = cu_list.get_tasks(
+            params={"subtasks": "false", "include_closed": "false"}
+        )
+        LOG.debug("List '%s' (%s): fetched %d task(s)", list_name, list_id, len(tasks))
+        result: list[dict] = []
+        releases: dict[str, list[str]] = {}
+        high_water: int | None = None
+        skipped = 0
+        for task in tasks:
+            high_water = _max_date_updated(high_water, task._data)
+            status = task["status"]["status"].lower()
+            if status in TERMINAL_STATUSES:
+                skipped += 1
+                continue
+
+            task_id = task["id"]
+            custom_item_id = task._data.get("custom_item_id")
+
+            # Release tasks: expand into direct subtasks instead.
+            if release_type_id is not None and custom_item_id == release_type_id:
+                try:
+                    subtasks = self._fetch_subtasks(task_id)
+                    releases[task_id] = []
+                    for subtask in subtasks:
+                        high_water = _max_date_updated(high_water, subtask)
+                        sub_status = subtask["status"]["status"].lower()
+                        if sub_status in TERMINAL_STATUSES:
+                            continue
+                        releases[task_id].append(subtask["id"])
+                        result.append(
+                            {
+                                "id": subtask["id"],
+                                "name": subtask["name"],
+                                "list_name": list_name,
+                            }
+                        )
+                    LOG.debug(
+                        "  Release task '%s' (%s): expanded into %d subtask(s)",
+                        task["name"],
+                        task_id,
+                        len(releases[task_id]),
+                    )
+                except Exception:
+                    LOG.exception(
+                        "Failed to fetch subtasks for Release task %s", task_id
+                    )
+                continue  # do not include the Release task itself
+
+            result.append({"id": task_id, "name": task["name"], "list_name": list_name})
+        LOG.debug(
+            "  Skipped %d terminal task(s), expanded %d Release task(s)",
+            skipped,
+            len(releases),
+        )
+        return {
+            "list_name": list_name,
+            "tasks": result,
+            "releases": releases,
+            "high_water": high_water,
+            "full_sync_at": full_sync_at,
+        }
+
+    def _sync_list_snapshot(
+        self, list_id: str, snapshot: dict, release_type_id: int | None
+    ) -> dict:
+        """
+        Bring a snapshot from _fetch_list_snapshot() up to date incrementally.
+
+        Only tasks updated after the snapshot's high-water mark are fetched.
+        Closed tasks are included so that completions show up as removals.
+        Subtasks of known Release tasks are synced the same way, since
+        changing a subtask does not touch its parent's date_updated.
+
+        Returns a new snapshot. Raises on API error.
+        """
+        from clickup_python_sdk.clickupobjects.list import List as CUList
+
+        high_water: int | None = snapshot["high_water"]
+        list_name: str = snapshot["list_name"]
+        since = {"include_closed": "true", "date_updated_gt": str(high_water)}
+        tasks = {task["id"]: task for task in snapshot["tasks"]}
+        releases = {
+            release_id: list(subtask_ids)
+            for release_id, subtask_ids in snapshot["releases"].items()
+        }
+
+        def apply(task: dict, release_id: str | None = None) -> None:
+            task_id = task["id"]
+            if task["status"]["status"].lower() in TERMINAL_STATUSES:
+                tasks.pop(task_id, None)
+                if release_id is not None and task_id in releases[release_id]:
+                    releases[release_id].remove(task_id)
+                return
+            issue = {"id": task_id, "name": task["name"], "list_name": list_name}
+            tasks[task_id] = issue  # replaces in place, or appends
+            if release_id is not None and task_id not in releases[release_id]:
+                releases[release_id].append(task_id)
+
+        changed = CUList(id=list_id).get_tasks(params={"subtasks": "false", **since})
+        refreshed_releases: set[str] = set()
+        for task in changed:
+            high_water = _max_date_updated(high_water, task._data)
+            task_id = task["id"]
+            # Whether or not it still is one, drop what we knew about a
+            # Release task; open ones are re-expanded below.
+            for subtask_id in releases.pop(task_id, []):
+                tasks.pop(subtask_id, None)
+            is_release = (
+                release_type_id is not None
+                and task._data.get("custom_item_id") == release_type_id
+            )
+            if not is_release:
+                apply(task._data)
+                continue
+            tasks.pop(task_id, None)
+            if task["status"]["status"].lower() in TERMINAL_STATUSES:
+                continue
+            releases[task_id] = []
+            refreshed_releases.add(task_id)
+            for subtask in self._fetch_subtasks(task_id):
+                high_water = _max_date_updated(high_water, subtask)
+                apply(subtask, release_id=task_id)
+
+        for release_id in list(releases):
+            if release_id in refreshed_releases:
+                continue
+            for subtask in self._fetch_subtasks(release_id, params=since):
+                high_water = _max_date_updated(high_water, subtask)
+                apply(subtask, release_id=release_id)
+
+        LOG.debug(
+            "List '%s' (%s): synced %d changed task(s) since %d",
+            list_name,
+            list_id,
+            len(changed),
+            snapshot["high_water"],
+        )
+        return {
+            "list_name": list_name,
+            "tasks": list(tasks.values()),
+            "releases": releases,
+            "high_water": high_water,
+            "full_sync_at": snapshot["full_sync_at"],
+        }
+
+    def sync_list_snapshots(
+        self,
+        list_ids: list[str],
+        snapshots: dict[str, dict] | None = None,
+        max_workers: int = 1,
+        on_snapshot: Callable[[str, dict], None] | None = None,
+    ) -> dict[str, dict]:
+        """
+        Fetch or incrementally sync the snapshots of the given lists.
+
+        Lists with a snapshot that has a high-water mark are synced
+        incrementally; all others are fetched in full. Lists that fail to
+        sync are logged and left out of the result, so callers can tell
+        "failed" apart from "empty".
+
+        Args:
+            list_ids: List of ClickUp list ID strings to fetch tasks from.
+            snapshots: Previous snapshots by list ID, as returned by an
+                earlier call.
+            max_workers: Number of lists to fetch concurrently. 1 fetches the
+                lists one after the other on the calling thread.
+            on_snapshot: Called with (list_id, snapshot) as soon as each list
+                is synced, possibly from a worker thread.
+
+        Returns:
+            Dict mapping list ID to its up-to-date snapshot (see
+            _fetch_list_snapshot() for the shape).
+        """
+        snapshots = snapshots or {}
+        self._get_client()  # ensure the SDK singleton is initialised
+        # Resolved up front so that the worker threads only read the cache.
+        release_type_id = self._get_release_type_id()
+        result: dict[str, dict] = {}
+
+        def fetch(list_id: str) -> None:
+            snapshot = snapshots.get(list_id)
+            try:
+                if snapshot is not None and snapshot.get("high_water") is not None:
+                    snapshot = self._sync_list_snapshot(
+                        list_id, snapshot, release_type_id
+                    )
+                else:
+                    snapshot = self._fetch_list_snapshot(list_id, release_type_id)
+            except Exception:
+                LOG.exception("Failed to fetch tasks from list %s", list_id)
+                return
+            result[list_id] = snapshot
+            if on_snapshot is not None:
+                on_snapshot(list_id, snapshot)
+
+        _for_each(fetch, list(dict.fromkeys(list_ids)), max_workers)
+        return result
+
+    def fetch_list_issues(
+        self, list_ids: list[str], max_workers: int = 1
+    ) -> dict[str, list[dict]]:
+        """
+        Fetch open tasks per ClickUp list, without cross-list deduplication.
+
+        Lists that fail to fetch are logged and left out of the result.
+
+        Returns:
+            Dict mapping list ID to that list's issue dicts (see
+            get_relevant_issues() for their shape).
+        """
+        return {
+            list_id: snapshot["tasks"]
+            for list_id, snapshot in self.sync_list_snapshots(
+                list_ids, max_workers=max_workers
+            ).items()
+        }
+
+    def get_relevant_issues(
+        self, list_ids: list[str], max_workers: int = 1
+    ) -> list[dict]:
         """
         Fetch open tasks from all given ClickUp list IDs.
 
@@ -138,10 +694,13 @@ class ClickUpClient:
         appears in multiple lists.
 
         Tasks are returned grouped by list (i.e. all tasks from the first list,
-        then all from the second, etc.).
+        then all from the second, etc.), regardless of the order in which the
+        lists were fetched.
 
         Args:
             list_ids: List of ClickUp list ID strings to fetch tasks from.
+            max_workers: Number of lists to fetch concurrently. 1 fetches the
+                lists one after the other on the calling thread.
 
         Returns:
             Deduplicated list of dicts with keys:
@@ -150,85 +709,9 @@ class ClickUpClient:
               "list_name" (str) – name of the ClickUp list the task came from
             in the order they were encountered across lists.
         """
-        from clickup_python_sdk.clickupobjects.list import List as CUList
-
-        self._get_client()  # ensure the SDK singleton is initialised
-        release_type_id = self._get_release_type_id()
-        seen_ids: set[str] = set()
-        result: list[dict] = []
-
-        for list_id in list_ids:
-            try:
-                cu_list = CUList(id=list_id)
-                cu_list.get()  # populates list metadata, including "name"
-                list_name: str = cu_list["name"] if "name" in cu_list else list_id
-                tasks = cu_list.get_tasks(
-                    params={"subtasks": "false", "include_closed": "false"}
-                )
-                LOG.debug("List '%s' (%s): fetched %d task(s)", list_name, list_id, len(tasks))
-                skipped = 0
-                release_expanded = 0
-                for task in tasks:
-                    status = task["status"]["status"].lower()
-                    if status in TERMINAL_STATUSES:
-                        skipped += 1
-                        continue
-
-                    task_id = task["id"]
-                    custom_item_id = task._data.get("custom_item_id")
-
-                    # Release tasks: expand into direct subtasks instead.
-                    if (
-                        release_type_id is not None
-                        and custom_item_id == release_type_id
-                    ):
-                        try:
-                            subtasks = self._fetch_subtasks(task_id)
-                            added = 0
-                            for subtask in subtasks:
-                                sub_status = subtask["status"]["status"].lower()
-                                if sub_status in TERMINAL_STATUSES:
-                                    continue
-                                sub_id = subtask["id"]
-                                if sub_id in seen_ids:
-                                    continue
-                                seen_ids.add(sub_id)
-                                result.append(
-                                    {
-                                        "id": sub_id,
-                                        "name": subtask["name"],
-                                        "list_name": list_name,
-                                    }
-                                )
-                                added += 1
-                            LOG.debug(
-                                "  Release task '%s' (%s): expanded into %d subtask(s)",
-                                task["name"],
-                                task_id,
-                                added,
-                            )
-                            release_expanded += 1
-                        except Exception:
-                            LOG.exception(
-                                "Failed to fetch subtasks for Release task %s", task_id
-                            )
-                        continue  # do not include the Release task itself
-
-                    if task_id in seen_ids:
-                        continue
-                    seen_ids.add(task_id)
-                    result.append(
-                        {"id": task_id, "name": task["name"], "list_name": list_name}
-                    )
-                LOG.debug(
-                    "  Skipped %d terminal task(s), expanded %d Release task(s)",
-                    skipped,
-                    release_expanded,
-                )
-            except Exception:
-                LOG.exception("Failed to fetch tasks from list %s", list_id)
-
-        return result
+        return merge_list_issues(
+            list_ids, self.fetch_list_issues(list_ids, max_workers=max_workers)
+        )
 
     def submit_time_registration(
         self, issue_id: str, decimal_hours: float
@@ -246,17 +729,71 @@ class ClickUpClient:
             decimal_hours,
         )
         self._get_client()  # ensure the SDK singleton is initialised
+        from clickup_python_sdk.clickupobjects.task import Task
+
         milliseconds = int(decimal_hours * _DECIMAL_HOURS_TO_MS)
         task = Task(id=issue_id)
         task.track_time(time=milliseconds)
         LOG.debug("Time registration submitted.")
 
-    def get_workspace_tree(self) -> list[dict]:
+    def get_spaces(self) -> list[dict]:
+        """
+        Return the spaces of the first workspace as [{"id": str, "name": str}].
+        """
+        from clickup_python_sdk.clickupobjects.team import Team
+
+        self._get_client()  # ensure the SDK singleton is initialised
+        team_id = self._get_team_id()
+        if not team_id:
+            return []
+        return [
+            {"id": space["id"], "name": space["name"]}
+            for space in Team(id=team_id).get_spaces()
+        ]
+
+    def get_space_lists(self, space_id: str) -> list[dict]:
+        """
+        Return the folderless lists of a space as [{"id": str, "name": str}].
+        """
+        from clickup_python_sdk.clickupobjects.space import Space
+
+        self._get_client()  # ensure the SDK singleton is initialised
+        return [
+            {"id": lst["id"], "name": lst["name"]}
+            for lst in Space(id=space_id).get_lists()
+        ]
+
+    def get_space_folders(self, space_id: str) -> list[dict]:
+        """
+        Return the folders of a space as [{"id": str, "name": str}].
+        """
+        from clickup_python_sdk.clickupobjects.space import Space
+
+        self._get_client()  # ensure the SDK singleton is initialised
+        return [
+            {"id": folder["id"], "name": folder["name"]}
+            for folder in Space(id=space_id).get_folders()
+        ]
+
+    def get_folder_lists(self, folder_id: str) -> list[dict]:
+        """
+        Return the lists of a folder as [{"id": str, "name": str}].
+        """
+        from clickup_python_sdk.clickupobjects.folder import Folder
+
+        self._get_client()  # ensure the SDK singleton is initialised
+        return [
+            {"id": lst["id"], "name": lst["name"]}
+            for lst in Folder(id=folder_id).get_lists()
+        ]
+
+    def get_workspace_tree(self, max_workers: int = 1) -> list[dict]:
         """
         Return the full space/folder/list hierarchy for the first workspace.
 
         This performs multiple API round trips and should be called from a
-        background thread.
+        background thread. The per-space calls, and then the per-folder
+        calls, are each made on up to max_workers threads at once.
 
         Returns:
             List of space dicts with shape:
@@ -270,65 +807,77 @@ class ClickUpClient:
               }
             ]
         """
-        teams = self._get_client().get_teams()
-        if not teams:
-            return []
-        team = teams[0]
-
-        spaces_result = []
-        for space in team.get_spaces():
-            space_entry: dict = {
-                "id": space["id"],
-                "name": space["name"],
-                "folders": [],
-                "lists": [],
-            }
+        spaces_result = [
+            {**space, "folders": [], "lists": []} for space in self.get_spaces()
+        ]
 
+        def fetch_space(space_entry: dict) -> None:
             # Folderless lists directly in the space
             try:
-                for lst in space.get_lists():
-                    space_entry["lists"].append(
-                        {"id": lst["id"], "name": lst["name"]}
-                    )
+                space_entry["lists"] = self.get_space_lists(space_entry["id"])
             except Exception:
                 LOG.exception(
-                    "Failed to fetch folderless lists for space %s", space["id"]
+                    "Failed to fetch folderless lists for space %s", space_entry["id"]
                 )
 
-            # Folders and their lists
+            # Folders; their lists are fetched below
             try:
-                for folder in space.get_folders():
-                    folder_entry: dict = {
-                        "id": folder["id"],
-                        "name": folder["name"],
-                        "lists": [],
-                    }
-                    try:
-                        for lst in folder.get_lists():
-                            folder_entry["lists"].append(
-                                {"id": lst["id"], "name": lst["name"]}
-                            )
-                    except Exception:
-                        LOG.exception(
-                            "Failed to fetch lists for folder %s", folder["id"]
-                        )
-                    space_entry["folders"].append(folder_entry)
+                space_entry["folders"] = [
+                    {**folder, "lists": []}
+                    for folder in self.get_space_folders(space_entry["id"])
+                ]
             except Exception:
                 LOG.exception(
-                    "Failed to fetch folders for space %s", space["id"]
+                    "Failed to fetch folders for space %s", space_entry["id"]
                 )
 
-            spaces_result.append(space_entry)
+        def fetch_folder(folder_entry: dict) -> None:
+            try:
+                folder_entry["lists"] = self.get_folder_lists(folder_entry["id"])
+            except Exception:
+                LOG.exception("Failed to fetch lists for folder %s", folder_entry["id"])
 
+        _for_each(fetch_space, spaces_result, max_workers)
+        _for_each(
+            fetch_folder,
+            [folder for space in spaces_result for folder in space["folders"]],
+            max_workers,
+        )
         return spaces_result
 
 
+_shared_client: ClickUpClient | None = None
+_shared_client_lock = threading.Lock()
+
+
+def shared_client(user_token: str) -> ClickUpClient:
+    """
+    Return the application-wide ClickUpClient for user_token.
+
+    The same instance is returned to every caller, on any thread, for as long
+    as the token stays the same, so the token is authorised and the team and
+    Release type IDs are fetched only once, and are kept in the metadata cache
+    for the next session. A different token (changed in the settings)
+    replaces the shared client with a new one.
+    """
+    global _shared_client
+    with _shared_client_lock:
+        if _shared_client is None or _shared_client._user_token != user_token:
+            from zup.metadata_cache import ClickUpMetadataCache
+
+            _shared_client = ClickUpClient(
+                user_token=user_token, metadata_cache=ClickUpMetadataCache()
+            )
+        return _shared_client
+
+
 # ----------------------------------------------------------------------
 # Standalone test entry point
 # ----------------------------------------------------------------------
 
 if __name__ == "__main__":
     from zup.config_store import ConfigStore
+    from zup.constants import DEFAULT_FETCH_WORKERS
 
     logging.basicConfig(
         level=logging.WARNING,
@@ -350,7 +899,9 @@ if __name__ == "__main__":
         )
 
     client = ClickUpClient(user_token=token)
-    issues = client.get_relevant_issues(list_ids)
+    issues = client.get_relevant_issues(
+        list_ids, max_workers=_store.get("fetch_workers", DEFAULT_FETCH_WORKERS)
+    )
 
     LOG.info("Found %d open issue(s):", len(issues))
     for issue in issues:
@@ -0,0 +1,131 @@
+"""
+Keep-alive HTTP transport for the ClickUp SDK.
+
+The SDK makes every request with the module-level requests functions, so each
+call opens (and TLS-handshakes) a connection of its own. PooledClickupClient
+makes the same requests through one requests.Session instead, whose pool
+keeps connections to ClickUp open between calls and is shared by all
+threads. prewarm() opens one ahead of time. Every request has a (connect,
+read) timeout, so that a stalled connection fails instead of hanging a
+worker.
+
+This module imports the SDK and requests, so only import it once a client
+actually talks to ClickUp.
+"""
+
+import json
+import logging
+import threading
+
+import requests
+from clickup_python_sdk.api import ClickupClient
+from requests.adapters import HTTPAdapter
+
+from zup.config_store import ConfigStore
+from zup.constants import DEFAULT_FETCH_WORKERS, DEFAULT_SUBMIT_WORKERS
+
+LOG = logging.getLogger(__name__)
+
+# (connect, read) timeout of every request, in seconds.
+TIMEOUT_SECONDS = (10, 60)
+
+_session: requests.Session | None = None
+_session_lock = threading.Lock()
+
+
+def _pool_size() -> int:
+    """
+    Connections kept open: enough for the configured fetch and submit
+    workers at once. Any further concurrent requests open a connection of
+    their own, which is closed afterwards.
+    """
+    config_store = ConfigStore()
+    return max(
+        1,
+        config_store.get("fetch_workers", DEFAULT_FETCH_WORKERS)
+        + config_store.get("submit_workers", DEFAULT_SUBMIT_WORKERS),
+    )
+
+
+def _get_session() -> requests.Session:
+    """Return the process-wide session, creating it on first use."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=1, pool_maxsize=_pool_size(), pool_block=False
+            )
+            _session.mount("https://", adapter)
+            _session.mount("http://", adapter)
+        return _session
+
+
+def prewarm() -> None:
+    """
+    Open a connection to ClickUp and leave it in the pool, so that the next
+    request does not wait for the TCP and TLS handshakes. Errors are logged,
+    not raised.
+    """
+    try:
+        _get_session().head(ClickupClient.API, timeout=TIMEOUT_SECONDS).close()
+        LOG.debug("Pre-warmed a connection to %s", ClickupClient.API)
+    except requests.RequestException as exc:
+        LOG.debug("Failed to pre-warm a connection to ClickUp: %s", exc)
+
+
+class PooledClickupClient(ClickupClient):
+    """
+    A ClickupClient whose requests go through the shared session.
+
+    Install it as the SDK's default API (see ClickupClient._set_default_api)
+    so that the SDK objects (List, Task, ...) use it too.
+    """
+
+    def make_request(
+        self, method, route, params=None, values=None, file=None, api_version="v2"
+    ):
+        # Same requests, and the same handling of the responses, as
+        # ClickupClient.make_request().
+        session = _get_session()
+        url = self.API + api_version + "/" + route
+        params = params or {}
+        if method in ("GET", "DELETE"):
+            response = session.request(
+                method,
+                url,
+                headers=self.DEFAULT_HEADERS,
+                params=params,
+                timeout=TIMEOUT_SECONDS,
+            )
+        elif method == "POST":
+            if file:
+                headers = {"Authorization": self.DEFAULT_HEADERS["Authorization"]}
+                session.post(
+                    url, files=file, headers=headers, timeout=TIMEOUT_SECONDS
+                )
+                return None
+            response = session.post(
+                url,
+                data=None if values is None else json.dumps(values),
+                headers=self.DEFAULT_HEADERS,
+                timeout=TIMEOUT_SECONDS,
+            )
+        elif method == "PUT":
+            response = session.put(
+                url,
+                data=json.dumps(values),
+                headers=self.DEFAULT_HEADERS,
+                timeout=TIMEOUT_SECONDS,
+            )
+        else:
+            raise ValueError("Invalid request method")
+
+        self._update_rate_limits(response.headers)
+        self._verify_response(response, method, url, params, self.DEFAULT_HEADERS)
+        if not response.text:
+            return None
+        try:
+            return response.json()
+        except json.JSONDecodeError:
+            return response.text
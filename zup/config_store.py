@@ -1,19 +1,33 @@
 """
 Handles reading and writing configuration to a file.
+
+Changes are applied in memory at once and written to disk by a background
+thread, coalescing the changes made within _WRITE_DELAY_SECONDS into a single
+write. Use ConfigStore.transaction() to apply several changes as one, and
+ConfigStore.flush() to write pending changes immediately (this also happens
+at interpreter exit).
+
+Only stdlib locking is used, so the headless commands (zup-timesheet) can use
+the configuration without loading Qt.
 """
 
+import atexit
+import contextlib
 import json
 import logging
 import os
-from typing import Any
+import threading
+import time
+from typing import Any, Iterator
 
 from appdirs import user_config_dir
-from PySide6.QtCore import QMutex, QMutexLocker
 
 from zup.constants import APPLICATION_AUTHOR, APPLICATION_NAME
 
 LOG = logging.getLogger(__name__)
 
+_WRITE_DELAY_SECONDS = 0.5
+
 
 class ConfigStore:
     """
@@ -21,17 +35,32 @@ class ConfigStore:
     """
 
     _instance: "ConfigStore | None" = None
-    _lock = QMutex()
+    _lock = threading.Lock()
     _config: dict[str, Any]
 
     def __new__(cls):
         if cls._instance is None:
-            with QMutexLocker(cls._lock):
+            with cls._lock:
                 if cls._instance is None:
-                    cls._instance = super(ConfigStore, cls).__new__(cls)
-                    cls._instance._config = cls._instance._read_config()
+                    instance = super(ConfigStore, cls).__new__(cls)
+                    instance._config = instance._read_config()
+                    instance._init_writer()
+                    cls._instance = instance
+                    atexit.register(instance.flush)
         return cls._instance
 
+    def _init_writer(self) -> None:
+        # Nesting depth of transaction() and whether a change happened in it.
+        self._transaction_depth = 0
+        self._transaction_dirty = False
+        # Serialises snapshot-and-write, so the newest snapshot lands last.
+        self._file_lock = threading.Lock()
+        self._write_condition = threading.Condition()
+        self._write_due: float | None = None
+        # Whether the writer thread is writing; flush() waits for it.
+        self._writing = False
+        self._writer: threading.Thread | None = None
+
     def _get_config_path(self) -> str:
         """Returns the path to the configuration file."""
         config_dir = user_config_dir(APPLICATION_NAME, APPLICATION_AUTHOR)
@@ -55,10 +84,41 @@ class ConfigStore:
 
     def set(self, parameter: str, value: Any) -> None:
         """
-        Sets the value of the specified configuration parameter and writes it to disk.
+        Sets the value of the specified configuration parameter and schedules
+        a write to disk.
+        """
+        with self._lock:
+            self._config[parameter] = value
+        self._changed()
+
+    def update(self, values: dict[str, Any]) -> None:
+        """
+        Sets several configuration parameters with a single write.
+        """
+        with self._lock:
+            self._config.update(values)
+        self._changed()
+
+    @contextlib.contextmanager
+    def transaction(self) -> Iterator["ConfigStore"]:
         """
-        self._config[parameter] = value
-        self._write_config()
+        Defers writing until the outermost transaction ends, so that all
+        changes made within it are written together:
+
+            with config_store.transaction():
+                config_store.set("a", 1)
+                config_store.set("b", 2)
+
+        Transactions are meant for the GUI thread; they are not per-thread.
+        """
+        self._transaction_depth += 1
+        try:
+            yield self
+        finally:
+            self._transaction_depth -= 1
+            if self._transaction_depth == 0 and self._transaction_dirty:
+                self._transaction_dirty = False
+                self._schedule_write()
 
     def get_legacy_tp_keys(self) -> list[str]:
         """
@@ -72,15 +132,76 @@ class ConfigStore:
         """
         Removes the given keys from config and writes to disk.
         """
-        for key in keys:
-            self._config.pop(key, None)
-        self._write_config()
+        with self._lock:
+            for key in keys:
+                self._config.pop(key, None)
+        self._changed()
+
+    def _changed(self) -> None:
+        if self._transaction_depth > 0:
+            self._transaction_dirty = True
+        else:
+            self._schedule_write()
+
+    def _schedule_write(self) -> None:
+        """
+        Has the writer thread write the configuration within
+        _WRITE_DELAY_SECONDS, together with any other changes made until then.
+        """
+        with self._write_condition:
+            if self._write_due is None:
+                self._write_due = time.monotonic() + _WRITE_DELAY_SECONDS
+            if self._writer is None:
+                self._writer = threading.Thread(
+                    target=self._writer_loop, name="config-writer", daemon=True
+                )
+                self._writer.start()
+            self._write_condition.notify()
+
+    def _writer_loop(self) -> None:
+        while True:
+            with self._write_condition:
+                while self._write_due is None:
+                    self._write_condition.wait()
+                delay = self._write_due - time.monotonic()
+                if delay > 0:
+                    # Woken early by flush() or another change; re-check.
+                    self._write_condition.wait(delay)
+                    continue
+                self._write_due = None
+                self._writing = True
+            try:
+                self._write_config()
+            except OSError:
+                LOG.exception("Failed to write the configuration")
+            finally:
+                with self._write_condition:
+                    self._writing = False
+                    self._write_condition.notify_all()
+
+    def flush(self) -> None:
+        """
+        Writes any pending changes to disk now, on the calling thread, after
+        waiting for a write the writer thread has already started.
+        """
+        with self._write_condition:
+            pending = self._write_due is not None
+            self._write_due = None
+            while self._writing:
+                self._write_condition.wait()
+        if pending:
+            self._write_config()
 
     def _write_config(self) -> None:
         """
-        Writes the configuration to disk.
+        Writes the configuration to disk, atomically.
         """
-        config_path = self._get_config_path()
-        os.makedirs(os.path.dirname(config_path), exist_ok=True)
-        with open(config_path, "w") as f:
-            json.dump(self._config, f, indent=4)
+        with self._file_lock:
+            with self._lock:
+                data = json.dumps(self._config, indent=4)
+            config_path = self._get_config_path()
+            os.makedirs(os.path.dirname(config_path), exist_ok=True)
+            tmp_path = config_path + ".tmp"
+            with open(tmp_path, "w") as f:
+                f.write(data)
+            os.replace(tmp_path, config_path)
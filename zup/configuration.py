@@ -1,12 +1,12 @@
 import logging
 import re
 import sys
-from typing import Optional
 
-from PySide6.QtCore import QObject, Qt, QThread, Signal, Slot
+from PySide6.QtCore import Qt, Signal
 from PySide6.QtWidgets import (
     QApplication,
     QButtonGroup,
+    QComboBox,
     QDialog,
     QDialogButtonBox,
     QFormLayout,
@@ -14,28 +14,42 @@ from PySide6.QtWidgets import (
     QLabel,
     QLineEdit,
     QListWidget,
+    QListWidgetItem,
     QMessageBox,
+    QPlainTextEdit,
     QPushButton,
     QRadioButton,
     QSpinBox,
-    QTreeWidget,
-    QTreeWidgetItem,
     QVBoxLayout,
 )
 
 from zup.config_store import ConfigStore
 from zup.constants import (
+    DEFAULT_FETCH_WORKERS,
     DEFAULT_INTERVAL_HOURS,
     DEFAULT_INTERVAL_MINUTES,
+    DEFAULT_LIST_PICKER_LAZY,
+    DEFAULT_SCHEDULE_EXCLUSIONS,
     DEFAULT_SCHEDULE_LIST,
     DEFAULT_SCHEDULE_TYPE,
+    DEFAULT_WORKING_HOURS,
 )
+from zup.metadata_cache import ClickUpMetadataCache
+from zup.scheduler import WEEKDAYS, Schedule
+from zup.task_cache import TaskCache
 
 LOG = logging.getLogger(__name__)
 
 # Regex for extracting the list ID from a list widget entry like "My List (abc123)"
 _LIST_ENTRY_RE = re.compile(r"^(.*)\s+\(([^)]+)\)$")
 
+# (label, DAYS) choices for new schedule times; see zup.scheduler.
+_SCHEDULE_DAY_CHOICES = [
+    ("Every day", ""),
+    ("Mon–Fri", "mon-fri"),
+    ("Sat–Sun", "sat-sun"),
+] + [(day.capitalize(), day) for day in WEEKDAYS]
+
 
 class TimeSpinner(QSpinBox):
     """
@@ -49,148 +63,6 @@ class TimeSpinner(QSpinBox):
         return "{:02d}".format(val)
 
 
-# ---------------------------------------------------------------------------
-# List picker dialog
-# ---------------------------------------------------------------------------
-
-
-class _TreeLoaderThread(QThread):
-    """
-    Background thread that fetches the full ClickUp workspace tree.
-
-    Using QThread (a QObject subclass) instead of QRunnable so that Python
-    retains ownership and the signal source is never garbage-collected while
-    the thread is running.
-    """
-
-    finished = Signal(list)  # emits the workspace tree on success
-    error = Signal(str)  # emits an error message on failure
-
-    def __init__(self, user_token: str, parent: Optional[QObject] = None) -> None:
-        super().__init__(parent)
-        self._user_token = user_token
-
-    def run(self) -> None:
-        try:
-            from zup.clickup_client import ClickUpClient
-
-            client = ClickUpClient(user_token=self._user_token)
-            tree = client.get_workspace_tree()
-            self.finished.emit(tree)
-        except Exception as exc:
-            self.error.emit(str(exc))
-
-
-class ListPickerDialog(QDialog):
-    """
-    A dialog that shows the full ClickUp workspace tree and lets the user
-    select lists to add to their configuration.
-
-    The user token is passed at construction time (taken from the token field
-    in the parent Configuration dialog before it has been saved).
-    """
-
-    def __init__(self, user_token: str, parent=None) -> None:
-        super().__init__(parent)
-        self.setWindowTitle(self.tr("Add ClickUp Lists"))
-        self.setMinimumSize(420, 480)
-        self._selected: list[dict] = []  # [{"id": str, "name": str}]
-
-        # Loading label (visible while fetching)
-        self._loading_label = QLabel(self.tr("Loading lists from ClickUp..."))
-        self._loading_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-
-        # Tree widget (hidden until loaded)
-        self._tree = QTreeWidget()
-        self._tree.setHeaderHidden(True)
-        self._tree.setVisible(False)
-
-        # Error label (hidden unless something goes wrong)
-        self._error_label = QLabel()
-        self._error_label.setVisible(False)
-        self._error_label.setWordWrap(True)
-
-        button_box = QDialogButtonBox(
-            QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel
-        )
-        button_box.accepted.connect(self._accept_action)
-        button_box.rejected.connect(self.reject)
-        self._ok_button = button_box.button(QDialogButtonBox.StandardButton.Ok)
-        self._ok_button.setEnabled(False)
-
-        layout = QVBoxLayout()
-        layout.addWidget(self._loading_label)
-        layout.addWidget(self._tree)
-        layout.addWidget(self._error_label)
-        layout.addWidget(button_box)
-        self.setLayout(layout)
-
-        # Kick off background load. Parenting the thread to self (the dialog)
-        # ensures Qt keeps it alive for at least as long as the dialog lives,
-        # and Python retains ownership via self._loader.
-        self._loader = _TreeLoaderThread(user_token=user_token, parent=self)
-        self._loader.finished.connect(self._on_tree_loaded)
-        self._loader.error.connect(self._on_tree_error)
-        self._loader.start()
-
-    @Slot(list)
-    def _on_tree_loaded(self, tree: list) -> None:
-        self._loading_label.setVisible(False)
-        self._populate_tree(tree)
-        self._tree.setVisible(True)
-        self._ok_button.setEnabled(True)
-
-    @Slot(str)
-    def _on_tree_error(self, message: str) -> None:
-        self._loading_label.setVisible(False)
-        self._error_label.setText(self.tr("Failed to load lists: ") + message)
-        self._error_label.setVisible(True)
-
-    def _populate_tree(self, tree: list) -> None:
-        for space in tree:
-            space_item = QTreeWidgetItem(self._tree, [space["name"]])
-            space_item.setFlags(space_item.flags() & ~Qt.ItemFlag.ItemIsUserCheckable)
-
-            # Folders within the space
-            for folder in space.get("folders", []):
-                folder_item = QTreeWidgetItem(space_item, [folder["name"]])
-                folder_item.setFlags(
-                    folder_item.flags() & ~Qt.ItemFlag.ItemIsUserCheckable
-                )
-                for lst in folder.get("lists", []):
-                    self._add_list_item(folder_item, lst)
-
-            # Folderless lists directly under the space
-            for lst in space.get("lists", []):
-                self._add_list_item(space_item, lst)
-
-    def _add_list_item(self, parent: QTreeWidgetItem, lst: dict) -> None:
-        label = f"{lst['name']} ({lst['id']})"
-        item = QTreeWidgetItem(parent, [label])
-        item.setFlags(item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
-        item.setCheckState(0, Qt.CheckState.Unchecked)
-        item.setData(0, Qt.ItemDataRole.UserRole, lst)
-
-    def _accept_action(self) -> None:
-        self._selected = []
-        root = self._tree.invisibleRootItem()
-        self._collect_checked(root)
-        self.accept()
-
-    def _collect_checked(self, parent: QTreeWidgetItem) -> None:
-        for i in range(parent.childCount()):
-            child = parent.child(i)
-            if child.checkState(0) == Qt.CheckState.Checked:
-                data = child.data(0, Qt.ItemDataRole.UserRole)
-                if data:
-                    self._selected.append(data)
-            self._collect_checked(child)
-
-    def selected_lists(self) -> list[dict]:
-        """Returns list of {"id": str, "name": str} for all checked items."""
-        return self._selected
-
-
 # ---------------------------------------------------------------------------
 # Main configuration dialog
 # ---------------------------------------------------------------------------
@@ -201,6 +73,8 @@ class Configuration(QDialog):
     Application settings dialog.
     """
 
+    saved = Signal()  # emitted once the settings have been stored
+
     def __init__(self, config_store: ConfigStore, parent=None):
         super(Configuration, self).__init__(parent)
         self.config_store = config_store
@@ -231,16 +105,26 @@ class Configuration(QDialog):
         remove_list_button = QPushButton(self.tr("&Remove selected"))
         remove_list_button.clicked.connect(self._remove_list_action)
 
+        clear_cache_button = QPushButton(self.tr("Clear &cached tasks"))
+        clear_cache_button.setToolTip(
+            self.tr(
+                "Forget the tasks cached for the log-work window, and the"
+                " workspace and Release task type looked up for them."
+            )
+        )
+        clear_cache_button.clicked.connect(self._clear_task_cache_action)
+
         lists_buttons_layout = QHBoxLayout()
         lists_buttons_layout.addWidget(add_list_button)
         lists_buttons_layout.addWidget(remove_list_button)
         lists_buttons_layout.addStretch()
+        lists_buttons_layout.addWidget(clear_cache_button)
 
         lists_layout = QVBoxLayout()
         lists_layout.addWidget(self._lists_widget)
         lists_layout.addLayout(lists_buttons_layout)
 
-        # --- Schedule section (unchanged) ---
+        # --- Schedule section ---
         self.schedule_type_group = QButtonGroup()
 
         self.schedule_radio_button = QRadioButton(self.tr("Schedule"))
@@ -253,6 +137,11 @@ class Configuration(QDialog):
             managed_widget(self.schedule_widgets, QLabel(self.tr("New time:")))
         )
         schedule_time_layout.addSpacing(5)
+        self.schedule_days = managed_widget(self.schedule_widgets, QComboBox())
+        for label, days in _SCHEDULE_DAY_CHOICES:
+            self.schedule_days.addItem(self.tr(label), days)
+        schedule_time_layout.addWidget(self.schedule_days)
+        schedule_time_layout.addSpacing(5)
         self.schedule_time_hour = managed_widget(self.schedule_widgets, TimeSpinner())
         self.schedule_time_hour.setMaximumWidth(40)
         self.schedule_time_hour.setRange(0, 23)
@@ -279,8 +168,15 @@ class Configuration(QDialog):
         self.schedule_list = managed_widget(self.schedule_widgets, QListWidget())
         self.schedule_list.setMaximumWidth(360)
         self.schedule_list.setSortingEnabled(True)
+        self.schedule_list.setToolTip(
+            self.tr(
+                "Double-click an entry to edit it. Entries are [DAYS] TIMES, "
+                'e.g. "09:00", "mon-fri 09:00,13:00" or "sat 10:00-16:00/60" '
+                "(every 60 minutes from 10:00 through 16:00)."
+            )
+        )
         for time_value in self.config_store.get("schedule_list", DEFAULT_SCHEDULE_LIST):
-            self.schedule_list.addItem(time_value)
+            self._add_schedule_item(time_value)
         self.schedule_list.itemSelectionChanged.connect(self._schedule_item_action)
         schedule_list_layout = QHBoxLayout()
         schedule_list_layout.addWidget(self.schedule_list)
@@ -329,6 +225,36 @@ class Configuration(QDialog):
         interval_time_layout.addWidget(self.interval_time_minute)
         interval_time_layout.setSpacing(0)
         interval_time_layout.setAlignment(Qt.AlignmentFlag.AlignRight)
+        self.working_hours = managed_widget(
+            self.interval_widgets,
+            QLineEdit(
+                "; ".join(
+                    self.config_store.get("working_hours", DEFAULT_WORKING_HOURS)
+                )
+            ),
+        )
+        self.working_hours.setPlaceholderText(
+            self.tr("Always, or e.g. mon-fri 08:00-12:00; mon-fri 13:00-17:00")
+        )
+        working_hours_layout = QHBoxLayout()
+        working_hours_layout.addWidget(
+            managed_widget(self.interval_widgets, QLabel(self.tr("Working hours:")))
+        )
+        working_hours_layout.addWidget(self.working_hours)
+        interval_layout.addLayout(working_hours_layout)
+
+        # Applies to both the schedule and the interval.
+        self.schedule_exclusions = QPlainTextEdit(
+            "\n".join(
+                self.config_store.get(
+                    "schedule_exclusions", DEFAULT_SCHEDULE_EXCLUSIONS
+                )
+            )
+        )
+        self.schedule_exclusions.setPlaceholderText(
+            self.tr("One YYYY-MM-DD day or YYYY-MM-DD..YYYY-MM-DD range per line")
+        )
+        self.schedule_exclusions.setMaximumHeight(60)
 
         button_box = QDialogButtonBox(
             QDialogButtonBox.StandardButton.Save
@@ -344,6 +270,7 @@ class Configuration(QDialog):
         layout.addRow(schedule_layout)
         layout.addRow(self.interval_radio_button)
         layout.addRow(interval_layout)
+        layout.addRow(self.tr("No pop-ups on"), self.schedule_exclusions)
         layout.addRow(button_box)
         self.setLayout(layout)
 
@@ -374,7 +301,14 @@ class Configuration(QDialog):
             if m:
                 existing_ids.add(m.group(2))
 
-        self._picker = ListPickerDialog(user_token=token, parent=self)
+        from zup.list_picker import ListPickerDialog
+
+        self._picker = ListPickerDialog(
+            user_token=token,
+            parent=self,
+            lazy=self.config_store.get("list_picker_lazy", DEFAULT_LIST_PICKER_LAZY),
+            max_workers=self.config_store.get("fetch_workers", DEFAULT_FETCH_WORKERS),
+        )
         if self._picker.exec() == QDialog.DialogCode.Accepted:
             for lst in self._picker.selected_lists():
                 if lst["id"] not in existing_ids:
@@ -386,11 +320,13 @@ class Configuration(QDialog):
         if row >= 0:
             self._lists_widget.takeItem(row)
 
+    def _clear_task_cache_action(self) -> None:
+        TaskCache().invalidate()
+        ClickUpMetadataCache().invalidate()
+
     # --- Save / Cancel ---
 
     def _save_action(self) -> None:
-        self.config_store.set("clickup_token", self.clickup_token.text().strip())
-
         display_entries = [
             self._lists_widget.item(i).text() for i in range(self._lists_widget.count())
         ]
@@ -400,25 +336,57 @@ class Configuration(QDialog):
             m = _LIST_ENTRY_RE.match(entry)
             if m:
                 list_ids.append(m.group(2))
-        self.config_store.set("clickup_lists", list_ids)
-        self.config_store.set("clickup_lists_display", display_entries)
 
         schedule_items = [
-            self.schedule_list.item(i).text() for i in range(self.schedule_list.count())
+            self.schedule_list.item(i).text().strip()
+            for i in range(self.schedule_list.count())
+        ]
+        schedule_type = (
+            "schedule" if self.schedule_radio_button.isChecked() else "interval"
+        )
+        working_hours = [
+            entry.strip()
+            for entry in self.working_hours.text().split(";")
+            if entry.strip()
         ]
-        self.config_store.set("schedule_list", schedule_items)
-        self.config_store.set(
-            "schedule_type",
-            "schedule" if self.schedule_radio_button.isChecked() else "interval",
+        exclusions = [
+            line.strip()
+            for line in self.schedule_exclusions.toPlainText().splitlines()
+            if line.strip()
+        ]
+        try:
+            Schedule(
+                schedule_type,
+                schedule_items,
+                self.interval_time_hour.value(),
+                self.interval_time_minute.value(),
+                working_hours,
+                exclusions,
+            )
+        except ValueError as exc:
+            QMessageBox.warning(self, self.tr("Invalid schedule"), str(exc))
+            return
+
+        self.config_store.update(
+            {
+                "clickup_token": self.clickup_token.text().strip(),
+                "clickup_lists": list_ids,
+                "clickup_lists_display": display_entries,
+                "schedule_list": schedule_items,
+                "schedule_type": schedule_type,
+                "interval_minutes": self.interval_time_minute.value(),
+                "interval_hours": self.interval_time_hour.value(),
+                "working_hours": working_hours,
+                "schedule_exclusions": exclusions,
+            }
         )
-        self.config_store.set("interval_minutes", self.interval_time_minute.value())
-        self.config_store.set("interval_hours", self.interval_time_hour.value())
         self.hide()
+        self.saved.emit()
 
     def _cancel_action(self) -> None:
         self.hide()
 
-    # --- Schedule helpers (unchanged logic) ---
+    # --- Schedule helpers ---
 
     def _schedule_radio_action(self) -> None:
         for widget in self.schedule_widgets:
@@ -437,17 +405,24 @@ class Configuration(QDialog):
         for widget in self.schedule_widgets:
             widget.setEnabled(False)
 
+    def _add_schedule_item(self, time_value: str) -> None:
+        item = QListWidgetItem(time_value)
+        item.setFlags(item.flags() | Qt.ItemFlag.ItemIsEditable)
+        self.schedule_list.addItem(item)
+
     def _add_time_action(self) -> None:
-        time_value = "{:02d}:{:02d}".format(
-            self.schedule_time_hour.value(), self.schedule_time_minute.value()
-        )
+        time_value = "{} {:02d}:{:02d}".format(
+            self.schedule_days.currentData(),
+            self.schedule_time_hour.value(),
+            self.schedule_time_minute.value(),
+        ).strip()
         matches = [
             self.schedule_list.item(i)
             for i in range(self.schedule_list.count())
             if self.schedule_list.item(i).text() == time_value
         ]
         if not matches:
-            self.schedule_list.addItem(time_value)
+            self._add_schedule_item(time_value)
 
     def _remove_time_action(self) -> None:
         self.schedule_list.takeItem(self.schedule_list.currentRow())
@@ -7,3 +7,20 @@ DEFAULT_SCHEDULE_TYPE = "schedule"
 DEFAULT_SCHEDULE_LIST = ["06:00", "11:00", "14:00"]
 DEFAULT_INTERVAL_HOURS = 0
 DEFAULT_INTERVAL_MINUTES = 15
+DEFAULT_WORKING_HOURS: list[str] = []
+DEFAULT_SCHEDULE_EXCLUSIONS: list[str] = []
+
+DEFAULT_FETCH_WORKERS = 8
+DEFAULT_REQUESTS_PER_MINUTE = 90
+DEFAULT_TIMESHEET_WINDOW_DAYS = 7
+DEFAULT_TIMESHEET_LOCK_MONTHS = 1
+
+DEFAULT_TASK_CACHE_MAX_AGE_HOURS = 7 * 24
+DEFAULT_TASK_CACHE_MAX_LISTS = 50
+DEFAULT_TASK_FULL_SYNC_HOURS = 24
+
+DEFAULT_LIST_PICKER_LAZY = True
+DEFAULT_SUBMIT_WORKERS = 2
+DEFAULT_PREFETCH_MINUTES = 5
+
+REGISTRATION_HISTORY_PAGE_SIZE = 10
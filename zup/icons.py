@@ -0,0 +1,9 @@
+"""
+Paths of the icons bundled with Zup.
+"""
+
+import os
+
+
+def resolve_icon(filename: str) -> str:
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), "icons", filename)
@@ -0,0 +1,115 @@
+"""
+Item models backing the issue selector of the log-work dialog.
+
+A single IssueListModel holds the tasks once for the combo box; the completer
+only ever holds the current search results (see zup.issue_search).
+"""
+
+from typing import Any, Optional
+
+from PySide6.QtCore import (
+    QAbstractListModel,
+    QModelIndex,
+    QObject,
+    QPersistentModelIndex,
+    Qt,
+)
+
+_TEXT_ROLES = (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole)
+# Match flags for which a display string can only match the row of the ID at
+# its end.
+_PATTERN_FLAGS = (
+    Qt.MatchFlag.MatchContains
+    | Qt.MatchFlag.MatchStartsWith
+    | Qt.MatchFlag.MatchEndsWith
+    | Qt.MatchFlag.MatchRegularExpression
+    | Qt.MatchFlag.MatchWildcard
+)
+
+
+def issue_display_string(issue: dict) -> str:
+    """Returns the text shown for an issue, e.g. "[List] Name  (id)"."""
+    list_prefix = f"[{issue['list_name']}] " if issue.get("list_name") else ""
+    return f"{list_prefix}{issue['name']}  ({issue['id']})"
+
+
+class IssueListModel(QAbstractListModel):
+    """
+    A read-only list model of issues.
+
+    The model keeps the issue dicts it is given, as they are, plus a dict
+    from issue ID to row; display strings are only built for the rows a view
+    or the combo box actually asks for. Exact-text lookups (QComboBox's
+    findText()) go by the issue ID at the end of the text instead of
+    comparing every row.
+    """
+
+    def __init__(self, parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self._issues: list[dict] = []
+        self._rows: dict[str, int] = {}
+
+    def set_issues(self, issues: list[dict]) -> None:
+        """
+        Replaces all issues (dicts with "id", "name" and "list_name"). The
+        list is kept, not copied, so it must not be changed afterwards.
+        """
+        self.beginResetModel()
+        self._issues = issues
+        self._rows = {issue["id"]: row for row, issue in enumerate(issues)}
+        self.endResetModel()
+
+    def rowCount(
+        self, parent: QModelIndex | QPersistentModelIndex = QModelIndex()
+    ) -> int:
+        if parent.isValid():
+            return 0
+        return len(self._issues)
+
+    def data(
+        self,
+        index: QModelIndex | QPersistentModelIndex,
+        role: int = Qt.ItemDataRole.DisplayRole,
+    ) -> Any:
+        if role not in _TEXT_ROLES or not 0 <= index.row() < len(self._issues):
+            return None
+        return issue_display_string(self._issues[index.row()])
+
+    def match(
+        self,
+        start: QModelIndex | QPersistentModelIndex,
+        role: int,
+        value: Any,
+        hits: int = 1,
+        flags: Qt.MatchFlag = Qt.MatchFlag.MatchStartsWith | Qt.MatchFlag.MatchWrap,
+    ) -> list[QModelIndex]:
+        if (
+            role not in _TEXT_ROLES
+            or not isinstance(value, str)
+            or flags & _PATTERN_FLAGS
+        ):
+            return super().match(start, role, value, hits, flags)
+        _, _, issue_id = value.rpartition("  (")
+        row = self.row_of(issue_id.removesuffix(")"))
+        if row < 0 or (row < start.row() and not flags & Qt.MatchFlag.MatchWrap):
+            return []
+        text = self.label(row)
+        if flags & Qt.MatchFlag.MatchCaseSensitive:
+            found = text == value
+        else:
+            found = text.casefold() == value.casefold()
+        return [self.index(row)] if found and hits != 0 else []
+
+    def row_of(self, issue_id: str) -> int:
+        """Returns the row of the given issue, or -1 if it is not present."""
+        return self._rows.get(issue_id, -1)
+
+    def issue_id(self, row: int) -> Optional[str]:
+        """Returns the ID of the issue in the given row, or None."""
+        if 0 <= row < len(self._issues):
+            return self._issues[row]["id"]
+        return None
+
+    def label(self, row: int) -> str:
+        """Returns the display string of the issue in the given row."""
+        return issue_display_string(self._issues[row])
@@ -0,0 +1,226 @@
+"""
+Fuzzy search over issues for the task picker.
+
+IssueSearchIndex indexes the words of every issue's name, list name and ID.
+Every distinct word is stored once, in a sorted vocabulary (for prefix
+lookups with bisect) and in a trigram index over that vocabulary (for fuzzy,
+typo-tolerant lookups). Each vocabulary word maps to the rows it occurs in.
+The rows are also stored flat, in vocabulary order, so that the rows of all
+words sharing a prefix are one slice, however many words that is (every
+ClickUp task ID starts with "86").
+
+A query matches a row when every query word matches some word of the row,
+either as a prefix or fuzzily. Rows are ranked by how well they matched plus
+a usage score, see usage_scores().
+"""
+
+import bisect
+import heapq
+import math
+import re
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Iterable, Optional
+
+_WORD_RE = re.compile(r"\w+")
+
+# Minimum Dice similarity between the trigrams of a query word and of a
+# vocabulary word for them to match fuzzily.
+_FUZZY_THRESHOLD = 0.5
+# Score of a fuzzy match relative to an exact one.
+_FUZZY_WEIGHT = 0.6
+_PREFIX_WEIGHT = 0.9
+# Weight of log(1 + usage score) in the final ranking.
+_USAGE_WEIGHT = 0.5
+# Registrations lose half their weight every this many days.
+_USAGE_HALF_LIFE_DAYS = 14
+# Registrations older than this weigh less than 1/256 and may be left out.
+USAGE_HORIZON_DAYS = 8 * _USAGE_HALF_LIFE_DAYS
+
+
+def _words(text: str) -> list[str]:
+    return _WORD_RE.findall(text.casefold())
+
+
+def _trigrams(word: str) -> set[str]:
+    padded = f" {word} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def usage_scores(
+    registration_history: Iterable[dict], now: Optional[datetime] = None
+) -> dict[str, float]:
+    """
+    Returns a usage ("frecency") score per issue ID: the number of
+    registrations against it, each weighted down by its age.
+
+    Registrations are dicts with "issue_id" and either "registered_ms" (UTC
+    milliseconds) or "datetime" (ISO 8601).
+    """
+    if now is None:
+        now = datetime.now(timezone.utc)
+    now_ms = now.timestamp() * 1000
+    scores: dict[str, float] = defaultdict(float)
+    for item in registration_history:
+        issue_id = item.get("issue_id")
+        if not issue_id:
+            continue
+        registered_ms = item.get("registered_ms")
+        if not registered_ms:
+            try:
+                registered_at = datetime.fromisoformat(item["datetime"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            registered_ms = registered_at.timestamp() * 1000
+        age_days = max(now_ms - registered_ms, 0) / 86_400_000
+        scores[issue_id] += 0.5 ** (age_days / _USAGE_HALF_LIFE_DAYS)
+    return dict(scores)
+
+
+class IssueSearchIndex:
+    """
+    A search index over a list of issues (dicts with "id", "name" and
+    "list_name").
+
+    The index is immutable, so it can be built on a worker thread and keeps
+    answering (by issue ID) while a newer one is being built.
+    """
+
+    def __init__(self, issues: list[dict]) -> None:
+        self._ids = [issue["id"] for issue in issues]
+        self._rows = {issue_id: row for row, issue_id in enumerate(self._ids)}
+        postings: dict[str, list[int]] = defaultdict(list)
+        for row, issue in enumerate(issues):
+            text = f"{issue['name']} {issue.get('list_name') or ''} {issue['id']}"
+            for word in set(_words(text)):
+                postings[word].append(row)
+        self._postings = dict(postings)
+        self._vocabulary = sorted(self._postings)
+        # The rows of _vocabulary[i] are _flat_rows[_offsets[i]:_offsets[i + 1]].
+        self._flat_rows: list[int] = []
+        self._offsets: list[int] = [0]
+        for word in self._vocabulary:
+            self._flat_rows.extend(self._postings[word])
+            self._offsets.append(len(self._flat_rows))
+
+        # IDs and numbers are only ever matched by prefix, which also keeps
+        # the trigram index small.
+        trigram_words: dict[str, list[int]] = defaultdict(list)
+        self._trigram_counts: list[int] = [0] * len(self._vocabulary)
+        for word_index, word in enumerate(self._vocabulary):
+            if not word.isalpha():
+                continue
+            trigrams = _trigrams(word)
+            self._trigram_counts[word_index] = len(trigrams)
+            for trigram in trigrams:
+                trigram_words[trigram].append(word_index)
+        self._trigram_words = dict(trigram_words)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def _match_word(self, query_word: str) -> dict[int, float]:
+        """
+        Returns the rows matching a query word, with the score of their best
+        matching word.
+        """
+        # Prefix matches, all at once.
+        start = bisect.bisect_left(self._vocabulary, query_word)
+        end = bisect.bisect_left(self._vocabulary, query_word + "\U0010ffff", start)
+        row_scores = dict.fromkeys(
+            self._flat_rows[self._offsets[start] : self._offsets[end]], _PREFIX_WEIGHT
+        )
+
+        # Fuzzy matches; these score below prefix matches.
+        if len(query_word) >= 3 and query_word.isalpha():
+            query_trigrams = _trigrams(query_word)
+            hits: dict[int, int] = defaultdict(int)
+            for trigram in query_trigrams:
+                for word_index in self._trigram_words.get(trigram, ()):
+                    hits[word_index] += 1
+            for word_index, count in hits.items():
+                if start <= word_index < end:
+                    continue
+                similarity = (
+                    2 * count / (len(query_trigrams) + self._trigram_counts[word_index])
+                )
+                if similarity < _FUZZY_THRESHOLD:
+                    continue
+                score = _FUZZY_WEIGHT * similarity
+                for row in self._postings[self._vocabulary[word_index]]:
+                    if score > row_scores.get(row, 0):
+                        row_scores[row] = score
+
+        # The exact match, if any, scores best.
+        if start < end and self._vocabulary[start] == query_word:
+            row_scores.update(dict.fromkeys(self._postings[query_word], 1.0))
+        return row_scores
+
+    @staticmethod
+    def _best_rows(row_scores: dict[int, float], limit: int) -> set[int]:
+        """
+        Returns the limit rows with the highest score, preferring the first
+        rows among those with the same score.
+
+        A broad query (say, the "86" all task IDs start with) matches most
+        rows with the same few scores, so the rows are picked by comparing
+        plain floats and ints rather than by sorting (score, row) pairs.
+        """
+        if len(row_scores) <= limit:
+            return set(row_scores)
+        scores = row_scores.values()
+        if max(scores) == min(scores):
+            return set(heapq.nsmallest(limit, row_scores))
+        threshold = heapq.nlargest(limit, scores)[-1]
+        above = [row for row, score in row_scores.items() if score > threshold]
+        tied = [row for row, score in row_scores.items() if score == threshold]
+        return set(above).union(heapq.nsmallest(limit - len(above), tied))
+
+    def search(
+        self,
+        query: str,
+        usage: Optional[dict[str, float]] = None,
+        limit: int = 50,
+    ) -> list[str]:
+        """
+        Returns the IDs of the best matching issues, best first.
+
+        usage maps issue IDs to usage scores (see usage_scores()); issues that
+        are registered against often and recently rank higher.
+        """
+        query_words = _words(query)
+        if not query_words:
+            return []
+
+        row_scores: Optional[dict[int, float]] = None
+        for query_word in query_words:
+            word_scores = self._match_word(query_word)
+            if row_scores is None:
+                row_scores = word_scores
+            else:
+                if len(word_scores) < len(row_scores):
+                    row_scores, word_scores = word_scores, row_scores
+                row_scores = {
+                    row: total + word_scores[row]
+                    for row, total in row_scores.items()
+                    if row in word_scores
+                }
+            if not row_scores:
+                return []
+        assert row_scores is not None
+        word_count = len(query_words)
+
+        # Rank on the match alone first, then let the few issues with a usage
+        # score compete with those. Ties keep the original order of the
+        # issues.
+        boosts: dict[int, float] = {}
+        for issue_id, score in (usage or {}).items():
+            row = self._rows.get(issue_id)
+            if row is not None and row in row_scores and score > 0:
+                boosts[row] = _USAGE_WEIGHT * math.log1p(score)
+        candidates = self._best_rows(row_scores, limit) | boosts.keys()
+        ranked = sorted(
+            candidates,
+            key=lambda row: (-(row_scores[row] / word_count + boosts.get(row, 0)), row),
+        )
+        return [self._ids[row] for row in ranked[:limit]]
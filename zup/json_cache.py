@@ -0,0 +1,93 @@
+"""
+Base class of the caches kept as a single JSON file in the user cache dir.
+"""
+
+import json
+import logging
+import os
+import threading
+from typing import Any, ClassVar, Self
+
+from appdirs import user_cache_dir
+
+from zup.constants import APPLICATION_AUTHOR, APPLICATION_NAME
+
+LOG = logging.getLogger(__name__)
+
+
+class JsonFileCache:
+    """
+    A singleton cache stored in the JSON file _FILENAME.
+
+    Every subclass has its own instance and its own lock. The file is written
+    to a temporary file first, which then replaces it, so a crash never
+    leaves a half-written cache behind. _load(), _save() and _remove() must
+    be called with the lock held.
+    """
+
+    _FILENAME: ClassVar[str]
+    # The instance of the subclass (or None), set per subclass.
+    _instance: ClassVar[Any]
+    _lock: ClassVar[threading.Lock]
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._instance = None
+        cls._lock = threading.Lock()
+
+    def __new__(cls) -> Self:
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    instance = super().__new__(cls)
+                    instance._initialize()
+                    cls._instance = instance
+        return cls._instance
+
+    def _initialize(self) -> None:
+        """
+        Sets up the instance when it is created. Called with the lock held.
+        """
+
+    def _get_cache_path(self) -> str:
+        """Returns the path to the cache file."""
+        cache_dir = user_cache_dir(APPLICATION_NAME, APPLICATION_AUTHOR)
+        return os.path.join(cache_dir, self._FILENAME)
+
+    def _load(self) -> Any:
+        """
+        Reads the cache file, or returns None if it is missing or corrupt.
+        """
+        try:
+            with open(self._get_cache_path(), "r") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def _save(self, data: Any) -> None:
+        """
+        Writes the cache file atomically.
+        """
+        cache_path = self._get_cache_path()
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = cache_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, cache_path)
+
+    def _remove(self) -> None:
+        """
+        Removes the cache file, if any.
+        """
+        try:
+            os.remove(self._get_cache_path())
+        except FileNotFoundError:
+            pass
+
+    def invalidate(self) -> None:
+        """
+        Drops the cache file.
+        """
+        with self._lock:
+            self._remove()
+        LOG.debug("%s invalidated.", type(self).__name__)
@@ -0,0 +1,378 @@
+"""
+The list browser: a tree of the ClickUp workspace to pick lists from.
+
+Loaded by the settings dialog the first time a list is added.
+"""
+
+import logging
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+from PySide6.QtCore import QObject, Qt, QThread, Signal, Slot
+from PySide6.QtWidgets import (
+    QDialog,
+    QDialogButtonBox,
+    QLabel,
+    QTreeWidget,
+    QTreeWidgetItem,
+    QVBoxLayout,
+)
+
+from zup.constants import DEFAULT_FETCH_WORKERS, DEFAULT_LIST_PICKER_LAZY
+from zup.workspace_cache import WorkspaceTreeCache
+
+if TYPE_CHECKING:
+    from zup.clickup_client import ClickUpClient
+
+LOG = logging.getLogger(__name__)
+
+
+def _children(item: QTreeWidgetItem) -> list[QTreeWidgetItem]:
+    """Returns the children of item, in order."""
+    children = []
+    for i in range(item.childCount()):
+        child = item.child(i)
+        if child is not None:
+            children.append(child)
+    return children
+
+
+class _TreeLoaderThread(QThread):
+    """
+    Background thread that fetches (part of) the ClickUp workspace tree.
+
+    The load callable is given the ClickUpClient and its return value is
+    emitted on success.
+
+    Using QThread (a QObject subclass) instead of QRunnable so that Python
+    retains ownership and the signal source is never garbage-collected while
+    the thread is running.
+    """
+
+    finished = Signal(object)  # emits the loaded tree (or subtree) on success
+    error = Signal(str)  # emits an error message on failure
+
+    def __init__(
+        self,
+        client: "ClickUpClient",
+        load: Callable[["ClickUpClient"], Any],
+        parent: Optional[QObject] = None,
+    ) -> None:
+        super().__init__(parent)
+        self._client = client
+        self._load = load
+
+    def run(self) -> None:
+        try:
+            self.finished.emit(self._load(self._client))
+        except Exception as exc:
+            self.error.emit(str(exc))
+
+
+# Item data role holding ("space" | "folder" | "list", id) for every node.
+# Qt.ItemDataRole.UserRole holds the list dict of list items.
+_NODE_ROLE = Qt.ItemDataRole.UserRole + 1
+# Item data role set to True on spaces and folders whose children have not
+# been fetched yet (lazy mode).
+_UNLOADED_ROLE = Qt.ItemDataRole.UserRole + 2
+
+
+class ListPickerDialog(QDialog):
+    """
+    A dialog that shows the ClickUp workspace tree and lets the user select
+    lists to add to their configuration.
+
+    The user token is passed at construction time (taken from the token field
+    in the parent Configuration dialog before it has been saved).
+
+    In lazy mode only the spaces are fetched up front; the folders and lists
+    of a node are fetched when it is first expanded. Otherwise the whole tree
+    is fetched at once, with up to max_workers concurrent requests.
+
+    The last known tree is shown from the WorkspaceTreeCache straight away
+    and refreshed in the background; refreshed nodes are merged into the
+    widget in place, so check states survive.
+    """
+
+    def __init__(
+        self,
+        user_token: str,
+        parent=None,
+        lazy: bool = DEFAULT_LIST_PICKER_LAZY,
+        max_workers: int = DEFAULT_FETCH_WORKERS,
+    ) -> None:
+        super().__init__(parent)
+        from zup.clickup_client import shared_client
+
+        self.setWindowTitle(self.tr("Add ClickUp Lists"))
+        self.setMinimumSize(420, 480)
+        self._selected: list[dict] = []  # [{"id": str, "name": str}]
+        self._user_token = user_token
+        self._lazy = lazy
+        self._client = shared_client(user_token)
+        self._loaders: list[_TreeLoaderThread] = []
+        # Nodes whose cached children have been revalidated this session.
+        self._refreshed_nodes: set[tuple[str, str]] = set()
+
+        # Loading label (visible while fetching)
+        self._loading_label = QLabel(self.tr("Loading lists from ClickUp..."))
+        self._loading_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+
+        # Tree widget (hidden until loaded)
+        self._tree = QTreeWidget()
+        self._tree.setHeaderHidden(True)
+        self._tree.setVisible(False)
+        self._tree.itemExpanded.connect(self._on_item_expanded)
+
+        # Error label (hidden unless something goes wrong)
+        self._error_label = QLabel()
+        self._error_label.setVisible(False)
+        self._error_label.setWordWrap(True)
+
+        button_box = QDialogButtonBox(
+            QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel
+        )
+        button_box.accepted.connect(self._accept_action)
+        button_box.rejected.connect(self.reject)
+        self._ok_button = button_box.button(QDialogButtonBox.StandardButton.Ok)
+        self._ok_button.setEnabled(False)
+
+        layout = QVBoxLayout()
+        layout.addWidget(self._loading_label)
+        layout.addWidget(self._tree)
+        layout.addWidget(self._error_label)
+        layout.addWidget(button_box)
+        self.setLayout(layout)
+
+        cached = WorkspaceTreeCache().get(user_token)
+        if cached is not None:
+            tree, _fetched_at = cached
+            self._merge_tree(tree)
+            self._loading_label.setText(self.tr("Refreshing lists from ClickUp..."))
+            self._tree.setVisible(True)
+            self._ok_button.setEnabled(True)
+
+        # Kick off background load.
+        if lazy:
+            self._start_loader(
+                lambda client: client.get_spaces(),
+                self._on_tree_loaded,
+                self._on_tree_error,
+            )
+        else:
+            self._start_loader(
+                lambda client: client.get_workspace_tree(max_workers=max_workers),
+                self._on_tree_loaded,
+                self._on_tree_error,
+            )
+
+    def _start_loader(
+        self,
+        load: Callable[["ClickUpClient"], Any],
+        on_finished: Callable[[Any], None],
+        on_error: Callable[[str], None],
+    ) -> None:
+        # Parenting the thread to self (the dialog) ensures Qt keeps it alive
+        # for at least as long as the dialog lives, and Python retains
+        # ownership via self._loaders.
+        loader = _TreeLoaderThread(self._client, load, parent=self)
+        loader.finished.connect(on_finished)
+        loader.error.connect(on_error)
+        self._loaders.append(loader)
+        loader.start()
+
+    @Slot(object)
+    def _on_tree_loaded(self, tree: list) -> None:
+        self._loading_label.setVisible(False)
+        self._merge_tree(tree)
+        self._tree.setVisible(True)
+        self._ok_button.setEnabled(True)
+        self._save_tree()
+
+    @Slot(str)
+    def _on_tree_error(self, message: str) -> None:
+        self._loading_label.setVisible(False)
+        self._error_label.setText(self.tr("Failed to load lists: ") + message)
+        self._error_label.setVisible(True)
+
+    # --- Merging fetched (sub)trees into the widget ---
+
+    def _merge_tree(self, tree: list) -> None:
+        self._merge_children(self._tree.invisibleRootItem(), "space", tree, 0)
+
+    def _merge_space(self, space_item: QTreeWidgetItem, space: dict) -> None:
+        # Folders within the space, then folderless lists directly under it
+        folders = space.get("folders", [])
+        self._merge_children(space_item, "folder", folders, 0)
+        self._merge_children(space_item, "list", space.get("lists", []), len(folders))
+        self._mark_loaded(space_item)
+
+    def _merge_folder(self, folder_item: QTreeWidgetItem, folder: dict) -> None:
+        self._merge_children(folder_item, "list", folder.get("lists", []), 0)
+        self._mark_loaded(folder_item)
+
+    def _merge_children(
+        self, parent: QTreeWidgetItem, kind: str, entries: list[dict], offset: int
+    ) -> None:
+        """
+        Make the children of the given kind match entries: nodes are added,
+        removed or renamed in place, so existing items keep their state.
+
+        New nodes are inserted at their position in entries, counted from
+        offset. Entries without loaded children ("folders" for spaces, "lists"
+        for folders) leave the children of existing nodes untouched.
+        """
+        existing: dict[str, QTreeWidgetItem] = {}
+        for child in reversed(_children(parent)):
+            node = child.data(0, _NODE_ROLE)
+            if not node or node[0] != kind:
+                continue
+            existing[node[1]] = child
+        wanted = {entry["id"] for entry in entries}
+        for node_id, child in existing.items():
+            if node_id not in wanted:
+                parent.removeChild(child)
+
+        for index, entry in enumerate(entries):
+            item = existing.get(entry["id"])
+            if item is None:
+                item = self._new_item(kind, entry)
+                parent.insertChild(min(offset + index, parent.childCount()), item)
+            elif kind == "list":
+                item.setText(0, f"{entry['name']} ({entry['id']})")
+                item.setData(0, Qt.ItemDataRole.UserRole, entry)
+            else:
+                item.setText(0, entry["name"])
+
+            if kind == "space" and "folders" in entry:
+                self._merge_space(item, entry)
+            elif kind == "folder" and "lists" in entry:
+                self._merge_folder(item, entry)
+
+    def _new_item(self, kind: str, entry: dict) -> QTreeWidgetItem:
+        if kind == "list":
+            item = QTreeWidgetItem([f"{entry['name']} ({entry['id']})"])
+            item.setFlags(item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
+            item.setCheckState(0, Qt.CheckState.Unchecked)
+            item.setData(0, Qt.ItemDataRole.UserRole, entry)
+        else:
+            item = QTreeWidgetItem([entry["name"]])
+            item.setFlags(item.flags() & ~Qt.ItemFlag.ItemIsUserCheckable)
+            # Children are filled in by _merge_space()/_merge_folder(), or
+            # fetched on first expansion.
+            item.setData(0, _UNLOADED_ROLE, True)
+            item.setChildIndicatorPolicy(
+                QTreeWidgetItem.ChildIndicatorPolicy.ShowIndicator
+            )
+        item.setData(0, _NODE_ROLE, (kind, entry["id"]))
+        return item
+
+    def _mark_loaded(self, item: QTreeWidgetItem) -> None:
+        item.setData(0, _UNLOADED_ROLE, False)
+        item.setChildIndicatorPolicy(
+            QTreeWidgetItem.ChildIndicatorPolicy.DontShowIndicatorWhenChildless
+        )
+
+    def _tree_snapshot(self) -> list[dict]:
+        """
+        Serialise the widget back into the get_workspace_tree() shape, leaving
+        out the children of nodes that have not been loaded.
+        """
+        return [
+            self._node_snapshot(child)
+            for child in _children(self._tree.invisibleRootItem())
+            if child.data(0, _NODE_ROLE)
+        ]
+
+    def _node_snapshot(self, item: QTreeWidgetItem) -> dict:
+        kind, node_id = item.data(0, _NODE_ROLE)
+        if kind == "list":
+            return dict(item.data(0, Qt.ItemDataRole.UserRole))
+        entry: dict = {"id": node_id, "name": item.text(0)}
+        if item.data(0, _UNLOADED_ROLE):
+            return entry
+        children = [
+            (child.data(0, _NODE_ROLE)[0], self._node_snapshot(child))
+            for child in _children(item)
+            if child.data(0, _NODE_ROLE)
+        ]
+        if kind == "space":
+            entry["folders"] = [child for k, child in children if k == "folder"]
+        entry["lists"] = [child for k, child in children if k == "list"]
+        return entry
+
+    def _save_tree(self) -> None:
+        try:
+            WorkspaceTreeCache().set(self._user_token, self._tree_snapshot())
+        except OSError:
+            LOG.exception("Failed to write the workspace tree cache")
+
+    @Slot(QTreeWidgetItem)
+    def _on_item_expanded(self, item: QTreeWidgetItem) -> None:
+        node = item.data(0, _NODE_ROLE)
+        if not node or node[0] == "list" or node in self._refreshed_nodes:
+            return
+        unloaded = item.data(0, _UNLOADED_ROLE)
+        if not unloaded and not self._lazy:
+            return  # the full tree refresh covers this node
+        kind, node_id = node
+        self._refreshed_nodes.add(node)
+
+        # Drop the placeholder of an earlier, failed attempt.
+        for child in _children(item):
+            if not child.data(0, _NODE_ROLE):
+                item.removeChild(child)
+        placeholder = None
+        if unloaded:
+            placeholder = QTreeWidgetItem(item, [self.tr("Loading...")])
+            placeholder.setFlags(Qt.ItemFlag.NoItemFlags)
+
+        def on_finished(children: Any) -> None:
+            if placeholder is not None:
+                item.removeChild(placeholder)
+            if kind == "space":
+                self._merge_space(item, children)
+            else:
+                self._merge_folder(item, {"lists": children})
+            self._save_tree()
+
+        def on_error(message: str) -> None:
+            # Allow another attempt on the next expansion.
+            self._refreshed_nodes.discard(node)
+            if placeholder is not None:
+                placeholder.setText(0, self.tr("Failed to load: ") + message)
+            else:
+                LOG.warning("Failed to refresh %s %s: %s", kind, node_id, message)
+
+        if kind == "space":
+            self._start_loader(
+                lambda client: {
+                    "folders": client.get_space_folders(node_id),
+                    "lists": client.get_space_lists(node_id),
+                },
+                on_finished,
+                on_error,
+            )
+        else:
+            self._start_loader(
+                lambda client: client.get_folder_lists(node_id),
+                on_finished,
+                on_error,
+            )
+
+    def _accept_action(self) -> None:
+        self._selected = []
+        root = self._tree.invisibleRootItem()
+        self._collect_checked(root)
+        self.accept()
+
+    def _collect_checked(self, parent: QTreeWidgetItem) -> None:
+        for child in _children(parent):
+            if child.checkState(0) == Qt.CheckState.Checked:
+                data = child.data(0, Qt.ItemDataRole.UserRole)
+                if data:
+                    self._selected.append(data)
+            self._collect_checked(child)
+
+    def selected_lists(self) -> list[dict]:
+        """Returns list of {"id": str, "name": str} for all checked items."""
+        return self._selected
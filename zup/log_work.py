@@ -0,0 +1,568 @@
+"""
+The log-work dialog: pick a task, enter the time spent and register it.
+
+Loaded by the tray icon the first time the dialog is needed.
+"""
+
+import logging
+import re
+import sqlite3
+from typing import Any, Callable, Optional, cast
+
+import pendulum
+from PySide6.QtCore import (
+    QEvent,
+    QStringListModel,
+    Qt,
+    QThreadPool,
+    QTimer,
+    Signal,
+    Slot,
+)
+from PySide6.QtGui import QCloseEvent, QIcon, QKeyEvent
+from PySide6.QtWidgets import (
+    QApplication,
+    QComboBox,
+    QCompleter,
+    QDialog,
+    QHBoxLayout,
+    QLabel,
+    QListView,
+    QMenu,
+    QMessageBox,
+    QPushButton,
+    QToolButton,
+    QVBoxLayout,
+    QWidget,
+)
+
+from zup.clickup_client import ClickUpClient, merge_list_issues, shared_client
+from zup.config_store import ConfigStore
+from zup.constants import (
+    DEFAULT_CLICKUP_LISTS,
+    DEFAULT_FETCH_WORKERS,
+    DEFAULT_TASK_CACHE_MAX_AGE_HOURS,
+    DEFAULT_TASK_CACHE_MAX_LISTS,
+    DEFAULT_TASK_FULL_SYNC_HOURS,
+    REGISTRATION_HISTORY_PAGE_SIZE,
+)
+from zup.icons import resolve_icon
+from zup.issue_model import IssueListModel
+from zup.issue_search import USAGE_HORIZON_DAYS, IssueSearchIndex, usage_scores
+from zup.registration_queue import RegistrationQueue
+from zup.scheduler import Scheduler
+from zup.state_store import StateStore
+from zup.task_cache import TaskCache
+from zup.worker import Worker
+
+LOG = logging.getLogger(__name__)
+
+
+_SEARCH_INDEX_DELAY_MS = 200
+_SEARCH_RESULT_LIMIT = 50
+
+_DURATION_TOKEN = re.compile(r"(\d+(?:\.\d+)?)\s*(h|m|d)", re.IGNORECASE)
+
+
+def _parse_duration(text: str) -> float:
+    """
+    Parse a human-readable duration string into decimal hours.
+
+    Supported units: h (hours), m (minutes), d (day = 8 hours).
+    Multiple tokens are summed: e.g. "1 h 30 m" -> 1.5.
+    Raises ValueError for unrecognised content.
+    """
+    text = text.strip()
+    matches = _DURATION_TOKEN.findall(text)
+    if not matches:
+        raise ValueError(f"no valid tokens found in {text!r}")
+    remainder = _DURATION_TOKEN.sub("", text).strip()
+    if remainder:
+        raise ValueError(f"unrecognised content {remainder!r}")
+    total = 0.0
+    for value, unit in matches:
+        n = float(value)
+        if unit.lower() == "h":
+            total += n
+        elif unit.lower() == "m":
+            total += n / 60
+        elif unit.lower() == "d":
+            total += n * 8
+    return total
+
+
+def _sync_task_cache(
+    client: ClickUpClient,
+    config_store: ConfigStore,
+    on_snapshot: Optional[Callable[[str, dict], None]] = None,
+) -> None:
+    """
+    Sync the configured lists into the TaskCache.
+
+    Lists with a recent enough snapshot are synced incrementally. Meant to
+    run on a worker thread.
+    """
+    task_cache = TaskCache()
+    list_ids = config_store.get("clickup_lists", DEFAULT_CLICKUP_LISTS)
+    snapshots = client.sync_list_snapshots(
+        list_ids,
+        task_cache.get_snapshots(
+            list_ids,
+            full_sync_hours=config_store.get(
+                "task_full_sync_hours", DEFAULT_TASK_FULL_SYNC_HOURS
+            ),
+        ),
+        max_workers=config_store.get("fetch_workers", DEFAULT_FETCH_WORKERS),
+        on_snapshot=on_snapshot,
+    )
+    task_cache.update(
+        snapshots,
+        max_lists=config_store.get("task_cache_max_lists", DEFAULT_TASK_CACHE_MAX_LISTS),
+    )
+
+
+class LogWorkDialog(QDialog):
+    """
+    This is the main log-work dialog of this application.
+    """
+
+    # Emitted from the fetch worker's threads with (list_id, tasks) as soon as
+    # each list has been synced; delivered to the GUI thread queued.
+    list_fetched = Signal(str, object)
+
+    def __init__(
+        self,
+        config_store: ConfigStore,
+        registration_queue: RegistrationQueue,
+        scheduler: Scheduler,
+        parent: Optional[QWidget] = None,
+    ) -> None:
+        QDialog.__init__(self, parent)
+        self.config_store = config_store
+        self.registration_queue = registration_queue
+        self.scheduler = scheduler
+        self.setWindowTitle(self.tr("Log Work"))
+        self.installEventFilter(self)
+        self.internal_close_flag = False
+        self.submit_thread_pool = QThreadPool()
+
+        self.task_cache = TaskCache()
+        self.state_store = StateStore()
+
+        token = self.config_store.get("clickup_token", "")
+        self._list_ids = self.config_store.get("clickup_lists", DEFAULT_CLICKUP_LISTS)
+        self.cu_client: Optional[ClickUpClient] = shared_client(token)
+
+        self._issue_model = IssueListModel(self)
+        self.issue_selector = QComboBox(self)
+        self.issue_selector.setEditable(True)
+        self.issue_selector.setModel(self._issue_model)
+        self.issue_selector.setInsertPolicy(QComboBox.InsertPolicy.NoInsert)
+        # Sizing to contents would measure every single task.
+        self.issue_selector.setSizeAdjustPolicy(
+            QComboBox.SizeAdjustPolicy.AdjustToMinimumContentsLengthWithIcon
+        )
+        self.issue_selector.setMinimumContentsLength(60)
+        cast(QListView, self.issue_selector.view()).setUniformItemSizes(True)
+        # Restored as soon as it shows up, unless the user picks something first.
+        self._pending_issue_id = self.state_store.get(
+            "last_registration_issue_id", ""
+        )
+        issue_line_edit = self.issue_selector.lineEdit()
+        assert issue_line_edit is not None
+        self.issue_selector.activated.connect(self._on_issue_chosen)
+        issue_line_edit.textEdited.connect(self._on_issue_chosen)
+
+        # The completer shows the search results as they are, best first.
+        self._search_results = QStringListModel(self)
+        self._completer = QCompleter(self._search_results, self)
+        self._completer.setCompletionMode(
+            QCompleter.CompletionMode.UnfilteredPopupCompletion
+        )
+        self.issue_selector.setCompleter(self._completer)
+        issue_line_edit.textEdited.connect(self._search_issues)
+
+        # The search index is rebuilt in the background whenever the issues
+        # change (at most once per burst of streamed lists); until then the
+        # previous one keeps answering.
+        usage_start = pendulum.now().subtract(days=USAGE_HORIZON_DAYS)
+        self._issue_usage = usage_scores(
+            self.state_store.iter_registrations(
+                start_ms=int(usage_start.timestamp() * 1000)
+            )
+        )
+        self._issues: list[dict] = []
+        self._search_index: Optional[IssueSearchIndex] = None
+        self._search_index_generation = 0
+        self._search_index_worker: Optional[Worker] = None
+        self._search_index_timer = QTimer(self)
+        self._search_index_timer.setSingleShot(True)
+        self._search_index_timer.setInterval(_SEARCH_INDEX_DELAY_MS)
+        self._search_index_timer.timeout.connect(self._rebuild_search_index)
+
+        # Populate instantly from the last snapshot; _refresh_issues() then
+        # revalidates it in the background, list by list.
+        self._per_list = self._cached_issues()
+        self._set_issues(merge_list_issues(self._list_ids, self._per_list))
+        self.list_fetched.connect(
+            self._on_list_fetched, Qt.ConnectionType.QueuedConnection
+        )
+
+        popup = cast(QListView, self._completer.popup())
+        popup.setWindowFlags(Qt.WindowType.ToolTip)
+        popup.setUniformItemSizes(True)
+
+        self.duration_selector = QComboBox()
+        self.duration_selector.setEditable(True)
+        duration_values = [
+            self.tr("4 h"),
+            self.tr("1 h"),
+            self.tr("8 h"),
+        ]
+        for label in duration_values:
+            self.duration_selector.addItem(label)
+        register_button = QPushButton(
+            QIcon(resolve_icon("log-work.png")), self.tr("&Register"), self
+        )
+        register_button.clicked.connect(self._register_action)
+        cancel_button = QPushButton(
+            QIcon(resolve_icon("cancel.png")), self.tr("&Cancel")
+        )
+        cancel_button.clicked.connect(self._cancel_action)
+
+        snooze_button = QToolButton(self)
+        snooze_button.setIcon(QIcon(resolve_icon("snooze.png")))
+        snooze_button.setPopupMode(QToolButton.ToolButtonPopupMode.InstantPopup)
+        snooze_menu = QMenu(self)
+        snooze_menu.addAction(self.tr("15 minutes"), lambda: self._snooze(15))
+        snooze_menu.addAction(self.tr("30 minutes"), lambda: self._snooze(30))
+        snooze_menu.addAction(self.tr("1 hour"), lambda: self._snooze(60))
+        snooze_menu.addAction(self.tr("4 hours"), lambda: self._snooze(4 * 60))
+        snooze_menu.addAction(self.tr("Next day"), lambda: self._snooze(-1))
+        snooze_menu.addAction(self.tr("Next Monday"), lambda: self._snooze(-2))
+        snooze_button.setMenu(snooze_menu)
+
+        input_layout = QHBoxLayout()
+        input_layout.addWidget(snooze_button)
+        input_layout.addWidget(self.issue_selector)
+        input_layout.addWidget(self.duration_selector)
+        input_layout.addWidget(register_button)
+        input_layout.addWidget(cancel_button)
+
+        self._loading_label = QLabel(self.tr("Loading tasks from ClickUp..."))
+        self._loading_label.setVisible(False)
+
+        self.toggle_history_button = QToolButton()
+        self.toggle_history_button.setText("Registration history")
+        self.toggle_history_button.setToolButtonStyle(
+            Qt.ToolButtonStyle.ToolButtonTextBesideIcon
+        )
+        self.toggle_history_button.setArrowType(Qt.ArrowType.RightArrow)
+        self.toggle_history_button.setCheckable(True)
+        self.toggle_history_button.setChecked(False)
+        self.toggle_history_button.setStyleSheet("QToolButton { border: none; }")
+        self.toggle_history_button.toggled.connect(self.toggle_log_content)
+
+        # The history is loaded a page at a time, the first time it is shown.
+        self.log_widget = QWidget()
+        self.log_layout = QVBoxLayout(self.log_widget)
+        self._history_loaded = False
+        self._history_last_id: Optional[int] = None
+        self.more_history_button = QPushButton(self.tr("Show more"))
+        self.more_history_button.setVisible(False)
+        self.more_history_button.clicked.connect(self._load_history_page)
+        self.log_layout.addWidget(self.more_history_button)
+        self.log_layout.addStretch(1)
+        self.log_widget.setVisible(False)
+
+        base_layout = QVBoxLayout()
+        base_layout.addLayout(input_layout)
+        base_layout.addWidget(self._loading_label)
+        base_layout.addWidget(self.toggle_history_button)
+        base_layout.addWidget(self.log_widget)
+        base_layout.addStretch(1)
+        self.setLayout(base_layout)
+        self.setWindowFlag(Qt.WindowType.WindowStaysOnTopHint)
+        self.show()
+
+        # Center the dialog on the screen
+        screen = QApplication.primaryScreen()
+        dialog_geometry = self.frameGeometry()
+        center_point = screen.geometry().center()
+        dialog_geometry.moveCenter(center_point)
+        self.move(dialog_geometry.topLeft())
+
+        self._refresh_issues()
+
+    def _cached_issues(self) -> dict[str, list[dict]]:
+        return self.task_cache.get(
+            self._list_ids,
+            max_age_hours=self.config_store.get(
+                "task_cache_max_age_hours", DEFAULT_TASK_CACHE_MAX_AGE_HOURS
+            ),
+        )
+
+    def _fetch_issues(self) -> None:
+        """
+        Sync the configured lists into the task cache, handing each list to
+        the GUI thread through list_fetched as soon as it arrives.
+
+        Runs on a worker thread; must not touch any widgets.
+        """
+        assert self.cu_client is not None
+        _sync_task_cache(
+            self.cu_client,
+            self.config_store,
+            on_snapshot=lambda list_id, snapshot: self.list_fetched.emit(
+                list_id, snapshot["tasks"]
+            ),
+        )
+
+    def _refresh_issues(self) -> None:
+        """
+        Revalidate the issue selector against ClickUp in the background.
+        """
+        if self.cu_client is None:
+            return
+        self._loading_label.setText(self.tr("Loading tasks from ClickUp..."))
+        self._loading_label.setVisible(True)
+        # Keep a reference so the signals outlive the worker's run().
+        self._refresh_worker = Worker(self._fetch_issues)
+        self._refresh_worker.signals.result.connect(self._on_issues_fetched)
+        self._refresh_worker.signals.error.connect(self._on_issues_fetch_failed)
+        self.submit_thread_pool.start(self._refresh_worker)
+
+    @Slot(str, object)
+    def _on_list_fetched(self, list_id: str, tasks: list[dict]) -> None:
+        self._per_list[list_id] = tasks
+        self._set_issues(merge_list_issues(self._list_ids, self._per_list))
+
+    @Slot(object)
+    def _on_issues_fetched(self, _result: None) -> None:
+        self._loading_label.setVisible(False)
+
+    @Slot(str)
+    def _on_issues_fetch_failed(self, message: str) -> None:
+        LOG.warning("Failed to refresh ClickUp tasks: %s", message)
+        self._loading_label.setText(self.tr("Could not refresh tasks from ClickUp."))
+
+    def _on_issue_chosen(self, *_args: Any) -> None:
+        self._pending_issue_id = ""
+
+    def _set_issues(self, issues: list[dict]) -> None:
+        """
+        Replace the issues offered by the issue selector.
+
+        The last registered issue is selected as soon as it is present. After
+        that, the current selection is kept if the selected issue is still
+        present; otherwise whatever the user has typed so far is left
+        untouched.
+        """
+        current_id = self._current_issue_id()
+        current_text = self.issue_selector.currentText()
+        had_issues = self._issue_model.rowCount() > 0
+
+        self.issue_selector.blockSignals(True)
+        self._issue_model.set_issues(issues)
+        self.issue_selector.blockSignals(False)
+        self._issues = issues
+        self._search_index_generation += 1
+        self._search_index_timer.start()
+
+        if self._select_issue(self._pending_issue_id):
+            self._pending_issue_id = ""
+        elif not self._select_issue(current_id) and had_issues:
+            self.issue_selector.setEditText(current_text)
+
+    def _rebuild_search_index(self) -> None:
+        self._search_index_worker = Worker(
+            self._build_search_index, self._search_index_generation, self._issues
+        )
+        self._search_index_worker.signals.result.connect(self._on_search_index_built)
+        self.submit_thread_pool.start(self._search_index_worker)
+
+    @staticmethod
+    def _build_search_index(
+        generation: int, issues: list[dict]
+    ) -> tuple[int, IssueSearchIndex]:
+        return generation, IssueSearchIndex(issues)
+
+    @Slot(object)
+    def _on_search_index_built(self, built: tuple[int, IssueSearchIndex]) -> None:
+        generation, search_index = built
+        if generation == self._search_index_generation:
+            self._search_index = search_index
+
+    @Slot(str)
+    def _search_issues(self, text: str) -> None:
+        """
+        Offer the issues best matching the typed text in the completer.
+        """
+        if self._search_index is None:
+            # Typed before the first background build finished.
+            self._search_index_timer.stop()
+            self._search_index = IssueSearchIndex(self._issues)
+        labels = []
+        for issue_id in self._search_index.search(
+            text, self._issue_usage, limit=_SEARCH_RESULT_LIMIT
+        ):
+            row = self._issue_model.row_of(issue_id)
+            if row >= 0:
+                labels.append(self._issue_model.label(row))
+        self._search_results.setStringList(labels)
+        if labels:
+            self._completer.complete()
+        else:
+            popup = self._completer.popup()
+            assert popup is not None
+            popup.hide()
+
+    def _current_issue_id(self) -> Optional[str]:
+        return self._issue_model.issue_id(self.issue_selector.currentIndex())
+
+    def _select_issue(self, issue_id: Optional[str]) -> bool:
+        """
+        Select the given issue in the issue selector, if present.
+        """
+        if not issue_id:
+            return False
+        index = self._issue_model.row_of(issue_id)
+        if index < 0:
+            return False
+        self.issue_selector.setCurrentIndex(index)
+        return True
+
+    @Slot()
+    def _load_history_page(self) -> None:
+        """Appends the next page of registrations, newest first."""
+        self._history_loaded = True
+        page = self.state_store.registrations(
+            REGISTRATION_HISTORY_PAGE_SIZE, before_id=self._history_last_id
+        )
+        insert_at = self.log_layout.indexOf(self.more_history_button)
+        for offset, item in enumerate(page):
+            item_datetime = pendulum.from_timestamp(
+                item["registered_ms"] / 1000, tz="local"
+            ).format("YYYY-MM-DD HH:mm:ss")
+            self.log_layout.insertWidget(
+                insert_at + offset,
+                QLabel(
+                    f"{item_datetime}: {item['issue_title']}: {item['time_spent']} hours"
+                ),
+            )
+        if page:
+            self._history_last_id = page[-1]["id"]
+        self.more_history_button.setVisible(
+            len(page) == REGISTRATION_HISTORY_PAGE_SIZE
+        )
+
+    @Slot(bool)
+    def toggle_log_content(self, checked):
+        if checked:
+            if not self._history_loaded:
+                self._load_history_page()
+            self.toggle_history_button.setArrowType(Qt.ArrowType.DownArrow)
+            self.toggle_history_button.setText("")
+            self.log_widget.setVisible(True)
+        else:
+            self.toggle_history_button.setArrowType(Qt.ArrowType.RightArrow)
+            self.toggle_history_button.setText("Registration history")
+            self.log_widget.setVisible(False)
+            QTimer.singleShot(1, self.adjustSize)
+
+    def internal_close(self):
+        self.internal_close_flag = True
+        self.close()
+        self.internal_close_flag = False
+
+    def closeEvent(self, event: QCloseEvent) -> None:
+        LOG.debug("EventHandler: closeEvent")
+        event.ignore()
+        if self.internal_close_flag:
+            LOG.debug("EventHandler: closeEvent: Internal close. Not doing anything.")
+            self.hide()
+            return
+        if self.scheduler.is_due():
+            LOG.debug("Snoozing due to closeEvent")
+            self._snooze(15)
+        else:
+            LOG.debug("Just closing.")
+            self.hide()
+
+    def eventFilter(self, widget, event: QEvent) -> bool:
+        if (
+            event.type() == QEvent.Type.KeyPress
+            and isinstance(event, QKeyEvent)
+            and event.key()
+            in (
+                Qt.Key.Key_Enter,
+                Qt.Key.Key_Return,
+                Qt.Key.Key_Escape,
+            )
+        ):
+            LOG.debug("Ignoring keystroke")
+            return True
+        else:
+            return super(LogWorkDialog, self).eventFilter(widget, event)
+
+    def _snooze(self, duration: int) -> None:
+        if duration > 0:
+            LOG.debug("Snooze: Normal duration: %d", duration)
+            next_run = pendulum.now().add(minutes=duration)
+        else:
+            LOG.debug("Snooze: Special duration: %d", duration)
+            if duration == -1:
+                next_run = pendulum.tomorrow().add(hours=6)
+            elif duration == -2:
+                next_run = pendulum.now().next(pendulum.MONDAY).add(hours=6)
+            else:
+                raise ValueError(f"Unknown snooze duration: {duration}")
+
+        self.scheduler.set_next_run(next_run)
+        self.hide()
+
+    def _register_action(self) -> None:
+        issue_id = self._current_issue_id()
+        issue_title: str = self.issue_selector.currentText()
+        if not issue_id:
+            QMessageBox.warning(
+                self,
+                self.tr("No task selected"),
+                self.tr("Select the task to register the time on."),
+            )
+            return
+        try:
+            decimal_hours = _parse_duration(self.duration_selector.currentText())
+        except ValueError as e:
+            QMessageBox.warning(
+                self,
+                self.tr("Invalid duration"),
+                self.tr(
+                    f"Could not parse duration: {e}\n\n"
+                    "Use units: h (hours), m (minutes), d (day = 8 h).\n"
+                    'Examples: "1 h", "30 m", "1 h 30 m", "0.5 h"'
+                ),
+            )
+            return
+
+        self.registration_queue.enqueue(issue_id, issue_title, decimal_hours)
+
+        # The registration is queued; a broken history must not undo that.
+        try:
+            self.state_store.add_registration(
+                {
+                    "datetime": str(pendulum.now()),
+                    "issue_id": issue_id,
+                    "issue_title": issue_title,
+                    "time_spent": decimal_hours,
+                }
+            )
+            self.state_store.set("last_registration_issue_id", issue_id)
+        except (sqlite3.Error, ValueError):
+            LOG.exception("Failed to record registration on %s", issue_id)
+        self.scheduler.schedule_next_run()
+        self.close()
+
+    def _cancel_action(self) -> None:
+        self.scheduler.schedule_next_run()
+        self.close()
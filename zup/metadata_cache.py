@@ -0,0 +1,62 @@
+"""
+Persistent on-disk cache of the ClickUp metadata that a client needs before it
+can fetch any tasks: the token's user, the workspace (team) ID and members,
+and the ID of the Release custom task type.
+
+With these cached, a new session skips the authorisation call and the team
+and custom-type lookups, and goes straight to the task fetches. The client
+revalidates them in the background once they are older than their TTL.
+"""
+
+import time
+from typing import Any
+
+from zup.json_cache import JsonFileCache
+from zup.workspace_cache import token_fingerprint
+
+
+class ClickUpMetadataCache(JsonFileCache):
+    """
+    A class for managing the cached ClickUp metadata.
+
+    The cache file looks like:
+        {"token": str, "fetched_at": float, "metadata": {...}}
+    where "token" is a fingerprint of the API token the metadata belongs to
+    and "fetched_at" is a UNIX timestamp in seconds. "metadata" holds any of
+    "user", "team_id", "team_members" and "release_type_id"; see
+    ClickUpClient.
+    """
+
+    _FILENAME = "clickup_metadata.json"
+
+    def get(self, user_token: str) -> tuple[dict[str, Any], float] | None:
+        """
+        Returns (metadata, fetched_at) cached for the given token, or None.
+        """
+        with self._lock:
+            cached = self._load()
+        if (
+            not isinstance(cached, dict)
+            or cached.get("token") != token_fingerprint(user_token)
+            or not isinstance(cached.get("metadata"), dict)
+        ):
+            return None
+        return cached["metadata"], cached.get("fetched_at", 0)
+
+    def set(
+        self,
+        user_token: str,
+        metadata: dict[str, Any],
+        fetched_at: float | None = None,
+    ) -> None:
+        """
+        Stores the metadata for the given token and writes it to disk.
+        fetched_at defaults to now.
+        """
+        cached = {
+            "token": token_fingerprint(user_token),
+            "fetched_at": time.time() if fetched_at is None else fetched_at,
+            "metadata": metadata,
+        }
+        with self._lock:
+            self._save(cached)
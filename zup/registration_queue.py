@@ -0,0 +1,256 @@
+"""
+Durable queue of time registrations waiting to be submitted to ClickUp.
+
+Every registration is first appended to an on-disk journal (a write-ahead
+log in the user data dir) and only then submitted in the background. Entries
+are marked done in the journal once ClickUp has accepted them, so anything
+still pending when the application quits is resumed at the next start.
+
+Delivery is at-least-once: if the application dies after ClickUp accepted a
+registration but before it was marked done, it is submitted again.
+"""
+
+import json
+import logging
+import math
+import os
+import time
+import uuid
+from typing import Callable, Optional
+
+from appdirs import user_data_dir
+from PySide6.QtCore import QObject, QThreadPool, QTimer, Signal, Slot
+
+from zup.clickup_client import is_auth_error, is_retryable_error
+from zup.constants import (
+    APPLICATION_AUTHOR,
+    APPLICATION_NAME,
+    DEFAULT_SUBMIT_WORKERS,
+)
+from zup.worker import Worker
+
+LOG = logging.getLogger(__name__)
+
+_RETRY_BASE_SECONDS = 5
+_RETRY_MAX_SECONDS = 15 * 60
+
+
+class RegistrationQueue(QObject):
+    """
+    Journals time registrations and drains them in the background.
+
+    At most max_concurrent registrations are submitted at once. Failed
+    submissions are retried with exponential backoff, unless they failed
+    permanently (see is_retryable_error()), in which case they are
+    dropped and reported through the failed signal. A submission that
+    ClickUp rejected the API token for (see is_auth_error()) is kept, and
+    the queue is paused and reports auth_failed; resume() starts it again
+    once the token has been changed.
+
+    All methods must be called on the GUI thread.
+    """
+
+    pending_changed = Signal(int)  # emits the number of pending registrations
+    failed = Signal(str)  # emits a message for each dropped registration
+    auth_failed = Signal()  # emitted when the queue pauses on a rejected token
+
+    def __init__(
+        self,
+        submit: Callable[[str, float], None],
+        max_concurrent: int = DEFAULT_SUBMIT_WORKERS,
+        parent: Optional[QObject] = None,
+    ) -> None:
+        super().__init__(parent)
+        self._submit = submit
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(max(1, max_concurrent))
+        # Pending entries by ID, in the order they were queued.
+        self._pending: dict[str, dict] = {}
+        self._in_flight: dict[str, Worker] = {}
+        self._retry_at: dict[str, float] = {}
+        self._attempts: dict[str, int] = {}
+        self._paused = False
+        # Calls flush() when the next retry is due; see _arm_retry_timer().
+        self._retry_timer = QTimer(self)
+        self._retry_timer.setSingleShot(True)
+        self._retry_timer.timeout.connect(self.flush)
+        self._load_journal()
+
+    def _get_journal_path(self) -> str:
+        """Returns the path to the journal file."""
+        data_dir = user_data_dir(APPLICATION_NAME, APPLICATION_AUTHOR)
+        return os.path.join(data_dir, "registrations.jsonl")
+
+    def _load_journal(self) -> None:
+        """
+        Replays the journal into the pending entries and compacts it.
+        """
+        try:
+            with open(self._get_journal_path(), "r") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A torn last line from a crash mid-append.
+                        LOG.warning("Skipping corrupt journal line: %r", line)
+                        continue
+                    if record.get("op") == "add":
+                        self._pending[record["id"]] = record["entry"]
+                    else:
+                        self._pending.pop(record.get("id"), None)
+        except FileNotFoundError:
+            pass
+        if self._pending:
+            LOG.debug("Resuming %d pending registration(s)", len(self._pending))
+        self._compact_journal()
+
+    def _append_journal(self, record: dict) -> None:
+        journal_path = self._get_journal_path()
+        os.makedirs(os.path.dirname(journal_path), exist_ok=True)
+        with open(journal_path, "a") as f:
+            f.write(json.dumps(record) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _compact_journal(self) -> None:
+        """
+        Rewrites the journal with just the pending entries.
+        """
+        journal_path = self._get_journal_path()
+        if not self._pending:
+            try:
+                os.remove(journal_path)
+            except FileNotFoundError:
+                pass
+            return
+        os.makedirs(os.path.dirname(journal_path), exist_ok=True)
+        tmp_path = journal_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            for entry_id, entry in self._pending.items():
+                f.write(json.dumps({"op": "add", "id": entry_id, "entry": entry}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, journal_path)
+
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    @Slot()
+    def resume(self) -> None:
+        """
+        Resumes submitting after the queue was paused on a rejected token.
+        """
+        if not self._paused:
+            return
+        LOG.debug("Resuming %d pending registration(s)", len(self._pending))
+        self._paused = False
+        self._retry_at.clear()
+        self._attempts.clear()
+        self.flush()
+
+    def enqueue(self, issue_id: str, issue_title: str, decimal_hours: float) -> None:
+        """
+        Journals a time registration and starts submitting it.
+        """
+        entry_id = uuid.uuid4().hex
+        entry = {
+            "issue_id": issue_id,
+            "issue_title": issue_title,
+            "decimal_hours": decimal_hours,
+            "queued_at": time.time(),
+        }
+        self._append_journal({"op": "add", "id": entry_id, "entry": entry})
+        self._pending[entry_id] = entry
+        self.pending_changed.emit(len(self._pending))
+        self.flush()
+
+    @Slot()
+    def flush(self) -> None:
+        """
+        Starts submitting every pending entry that is not already in flight
+        or waiting for its retry delay to pass, unless the queue is paused.
+        """
+        if self._paused:
+            return
+        now = time.time()
+        for entry_id, entry in self._pending.items():
+            if entry_id in self._in_flight or self._retry_at.get(entry_id, 0) > now:
+                continue
+            worker = Worker(self._submit_entry, entry_id, entry)
+            worker.signals.result.connect(self._on_entry_done)
+            self._in_flight[entry_id] = worker
+            self._pool.start(worker)
+        self._arm_retry_timer()
+
+    def _arm_retry_timer(self) -> None:
+        """
+        Starts the retry timer for the earliest retry still to come, if any.
+        A timer that fires a little early (Qt timers are coarse) re-arms
+        itself through flush() for the rest of the delay.
+        """
+        retry_at = [
+            self._retry_at[entry_id]
+            for entry_id in self._pending
+            if entry_id in self._retry_at and entry_id not in self._in_flight
+        ]
+        if not retry_at:
+            return
+        delay = max(min(retry_at) - time.time(), 0)
+        self._retry_timer.start(math.ceil(delay * 1000))
+
+    def _submit_entry(self, entry_id: str, entry: dict) -> tuple[str, Exception | None]:
+        """
+        Submits one entry. Runs on a worker thread.
+        """
+        try:
+            self._submit(entry["issue_id"], entry["decimal_hours"])
+        except Exception as exc:
+            LOG.warning(
+                "Failed to submit registration %s (%s): %s",
+                entry_id,
+                entry["issue_id"],
+                exc,
+            )
+            return entry_id, exc
+        return entry_id, None
+
+    @Slot(object)
+    def _on_entry_done(self, outcome: tuple[str, Exception | None]) -> None:
+        entry_id, exc = outcome
+        self._in_flight.pop(entry_id, None)
+        entry = self._pending.get(entry_id)
+        if entry is None:
+            return
+
+        if exc is None:
+            self._append_journal({"op": "done", "id": entry_id})
+        elif is_retryable_error(exc):
+            attempts = self._attempts.get(entry_id, 0) + 1
+            self._attempts[entry_id] = attempts
+            delay = min(_RETRY_BASE_SECONDS * 2 ** (attempts - 1), _RETRY_MAX_SECONDS)
+            LOG.debug("Retrying registration %s in %d s", entry_id, delay)
+            self._retry_at[entry_id] = time.time() + delay
+            self._arm_retry_timer()
+            return
+        elif is_auth_error(exc):
+            # Kept in the journal until resume().
+            if not self._paused:
+                LOG.warning("ClickUp rejected the API token; pausing submissions")
+                self._paused = True
+                self.auth_failed.emit()
+            return
+        else:
+            LOG.error("Dropping registration %s: %s", entry_id, exc)
+            self._append_journal({"op": "failed", "id": entry_id})
+            self.failed.emit(
+                self.tr("Could not register {hours} h on {title}.").format(
+                    hours=entry["decimal_hours"], title=entry["issue_title"]
+                )
+            )
+
+        del self._pending[entry_id]
+        self._retry_at.pop(entry_id, None)
+        self._attempts.pop(entry_id, None)
+        self.pending_changed.emit(len(self._pending))
+        if not self._pending:
+            self._compact_journal()
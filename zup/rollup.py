@@ -0,0 +1,171 @@
+"""
+Columnar aggregation of time entries for zup-timesheet.
+
+EntryColumns keeps time entries as parallel integer arrays (start, duration,
+day, task and list), with task and list IDs interned once. Start timestamps
+are bucketed into local days by a binary search over the precomputed local
+midnights of the range (DayBuckets), instead of creating a datetime per
+entry. Durations are summed as integer milliseconds and only converted to
+hours for output.
+"""
+
+import bisect
+import datetime
+from array import array
+from typing import Iterable
+
+ROLLUPS = ("day", "week", "task", "list")
+
+
+def local_midnight_ms(day: datetime.date) -> int:
+    """Return the start of the given day in local time, in UTC milliseconds."""
+    return int(datetime.datetime(day.year, day.month, day.day).timestamp() * 1000)
+
+
+class DayBuckets:
+    """
+    Maps UTC millisecond timestamps to the local days first_day..last_day
+    (inclusive). Day boundaries are computed once, so they follow DST.
+    """
+
+    def __init__(self, first_day: datetime.date, last_day: datetime.date) -> None:
+        self.days = [
+            first_day + datetime.timedelta(days=offset)
+            for offset in range((last_day - first_day).days + 1)
+        ]
+        self._bounds = [local_midnight_ms(day) for day in self.days]
+        self._bounds.append(
+            local_midnight_ms(last_day + datetime.timedelta(days=1))
+        )
+
+    def index(self, ms: int) -> int:
+        """Return the index of the day ms falls on, or -1 if out of range."""
+        index = bisect.bisect_right(self._bounds, ms) - 1
+        return index if index < len(self.days) else -1
+
+    def date(self, ms: int) -> datetime.date | None:
+        """Return the local day ms falls on, or None if out of range."""
+        index = self.index(ms)
+        return self.days[index] if index >= 0 else None
+
+
+class EntryColumns:
+    """
+    Time entries of a date range as columns, ready to be rolled up.
+
+    Entries outside the range of the buckets, running timers and empty
+    entries (duration <= 0) are not added.
+    """
+
+    def __init__(self, buckets: DayBuckets) -> None:
+        self.buckets = buckets
+        self.durations = array("q")
+        self.day_indexes = array("l")
+        self.task_indexes = array("l")
+        self.list_indexes = array("l")
+        # Interned (id, name) pairs; the first name seen for an ID wins.
+        self._task_rows: dict[str, int] = {}
+        self.tasks: list[tuple[str, str]] = []
+        self._list_rows: dict[str, int] = {}
+        self.lists: list[tuple[str, str]] = []
+
+    def __len__(self) -> int:
+        return len(self.durations)
+
+    @staticmethod
+    def _intern(
+        rows: dict[str, int], values: list[tuple[str, str]], key: str, name: str
+    ) -> int:
+        row = rows.get(key)
+        if row is None:
+            row = rows[key] = len(values)
+            values.append((key, name))
+        return row
+
+    def append(
+        self,
+        start_ms: int,
+        duration_ms: int,
+        task_id: str,
+        task_name: str,
+        list_id: str = "",
+        list_name: str = "",
+    ) -> None:
+        if duration_ms <= 0:
+            return
+        day_index = self.buckets.index(start_ms)
+        if day_index < 0:
+            return
+        self.durations.append(duration_ms)
+        self.day_indexes.append(day_index)
+        self.task_indexes.append(
+            self._intern(self._task_rows, self.tasks, task_id, task_name)
+        )
+        self.list_indexes.append(
+            self._intern(self._list_rows, self.lists, list_id, list_name)
+        )
+
+    def extend(self, entries: Iterable[tuple[int, int, str, str, str, str]]) -> None:
+        """
+        Add (start_ms, duration_ms, task_id, task_name, list_id, list_name)
+        tuples.
+        """
+        for entry in entries:
+            self.append(*entry)
+
+    @staticmethod
+    def _sum_by(groups: array, group_count: int, durations: array) -> list[int]:
+        totals = [0] * group_count
+        for group, duration in zip(groups, durations):
+            totals[group] += duration
+        return totals
+
+    def total_ms(self) -> int:
+        return sum(self.durations)
+
+    def rollup(self, by: str) -> list[tuple[str, str, int]]:
+        """
+        Return (key, name, total_ms) per day, ISO week, task or list (see
+        ROLLUPS), leaving out groups without time. Days and weeks are in
+        chronological order with keys "YYYY-MM-DD" and "YYYY-Www"; tasks and
+        lists in the order they first appear.
+        """
+        if by == "day":
+            totals = self._sum_by(
+                self.day_indexes, len(self.buckets.days), self.durations
+            )
+            keys = [day.isoformat() for day in self.buckets.days]
+            return [(key, key, total) for key, total in zip(keys, totals) if total]
+        if by == "week":
+            week_keys: list[str] = []
+            day_weeks = array("l")
+            for day in self.buckets.days:
+                year, week, _ = day.isocalendar()
+                key = f"{year}-W{week:02d}"
+                if not week_keys or week_keys[-1] != key:
+                    week_keys.append(key)
+                day_weeks.append(len(week_keys) - 1)
+            day_totals = self._sum_by(
+                self.day_indexes, len(self.buckets.days), self.durations
+            )
+            totals = [0] * len(week_keys)
+            for week_index, total in zip(day_weeks, day_totals):
+                totals[week_index] += total
+            return [
+                (key, key, total) for key, total in zip(week_keys, totals) if total
+            ]
+        if by == "task":
+            totals = self._sum_by(self.task_indexes, len(self.tasks), self.durations)
+            return [
+                (task_id, name, total)
+                for (task_id, name), total in zip(self.tasks, totals)
+                if total
+            ]
+        if by == "list":
+            totals = self._sum_by(self.list_indexes, len(self.lists), self.durations)
+            return [
+                (list_id, name, total)
+                for (list_id, name), total in zip(self.lists, totals)
+                if total
+            ]
+        raise ValueError(f"Unknown rollup: {by!r}")
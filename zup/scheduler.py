@@ -0,0 +1,458 @@
+"""
+Event-driven scheduling of the log-work pop-up.
+
+Schedule compiles the configured pop-up schedule once into an index of
+sorted minutes of the day per weekday (see below for the expressions).
+Scheduler keeps the next pop-up time (persisted as "next_run" in the
+StateStore) and arms a single precise single-shot timer for the next point on
+its timeline: the task prefetch shortly before the pop-up, then the pop-up
+itself.
+
+Schedule expressions ("schedule_list" entries) are "[DAYS] TIMES":
+    DAYS   mon..sun, ranges and lists of those ("mon-fri", "mon,wed,fri") or
+           "*"; every day when left out.
+    TIMES  comma-separated "HH:MM" times or cron-style "HH:MM-HH:MM/N" steps
+           (every N minutes from the first time through the last).
+e.g. "09:00", "mon-fri 09:00,13:00", "sat 10:00-16:00/60".
+
+Working hours ("working_hours", for the interval schedule) are
+"[DAYS] HH:MM-HH:MM" windows (the end is exclusive and may be "24:00");
+interval pop-ups falling outside all windows move to the start of the next
+one. Exclusions ("schedule_exclusions", for both) are "YYYY-MM-DD" days or
+"YYYY-MM-DD..YYYY-MM-DD" ranges without pop-ups.
+
+Timers run on a monotonic clock, which may stand still while the computer
+sleeps and does not follow changes of the wall clock. The timer is therefore
+re-armed when logind reports a resume (on Linux), and never armed for longer
+than _MAX_TIMER_MS, after which the timeline is checked against the wall
+clock again.
+"""
+
+import bisect
+import datetime
+import logging
+import re
+from typing import Any, Optional, cast
+
+import pendulum
+from PySide6.QtCore import SLOT, QObject, Qt, QTimer, Signal, Slot
+
+from zup.constants import (
+    DEFAULT_INTERVAL_HOURS,
+    DEFAULT_INTERVAL_MINUTES,
+    DEFAULT_PREFETCH_MINUTES,
+    DEFAULT_SCHEDULE_EXCLUSIONS,
+    DEFAULT_SCHEDULE_LIST,
+    DEFAULT_SCHEDULE_TYPE,
+    DEFAULT_WORKING_HOURS,
+)
+from zup.state_store import StateStore
+
+try:
+    from PySide6.QtDBus import QDBusConnection
+except ImportError:  # Not built on every platform.
+    QDBusConnection = None
+
+LOG = logging.getLogger(__name__)
+
+# Upper bound for a single wait, see the module docstring.
+_MAX_TIMER_MS = 10 * 60 * 1000
+# While the pop-up is due but nobody has moved the next run (e.g. there is no
+# token configured yet), "due" is repeated this often.
+_DUE_RETRY_MS = 60 * 1000
+
+WEEKDAYS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+_MINUTES_PER_DAY = 24 * 60
+_TIME_RE = re.compile(r"^(\d{1,2}):(\d{2})$")
+_STEP_RE = re.compile(r"^(\d{1,2}:\d{2})-(\d{1,2}:\d{2})/(\d+)$")
+_WINDOW_RE = re.compile(r"^(\d{1,2}:\d{2})-(\d{1,2}:\d{2})$")
+
+
+def _parse_days(text: str) -> list[int]:
+    """Parses DAYS (see the module docstring) into sorted weekday numbers."""
+    if text == "*":
+        return list(range(7))
+    days: set[int] = set()
+    for part in text.casefold().split(","):
+        first, separator, last = part.partition("-")
+        if first not in WEEKDAYS or (separator and last not in WEEKDAYS):
+            raise ValueError(f"Unknown day: {part!r}")
+        day = WEEKDAYS.index(first)
+        days.add(day)
+        # Ranges may wrap around the week, e.g. "fri-mon".
+        while last and WEEKDAYS[day] != last:
+            day = (day + 1) % 7
+            days.add(day)
+    return sorted(days)
+
+
+def _parse_time(text: str, allow_end_of_day: bool = False) -> int:
+    """Parses "HH:MM" into minutes since midnight."""
+    match = _TIME_RE.match(text)
+    if match is not None:
+        hours, minutes = int(match.group(1)), int(match.group(2))
+        if hours < 24 and minutes < 60:
+            return hours * 60 + minutes
+        if allow_end_of_day and hours == 24 and minutes == 0:
+            return _MINUTES_PER_DAY
+    raise ValueError(f"Invalid time: {text!r}")
+
+
+def _split_expression(expression: str) -> tuple[list[int], str]:
+    """Splits "[DAYS] REST" into (weekday numbers, REST)."""
+    parts = expression.split()
+    if len(parts) == 1:
+        return list(range(7)), parts[0]
+    if len(parts) == 2:
+        return _parse_days(parts[0]), parts[1]
+    raise ValueError(f"Invalid schedule expression: {expression!r}")
+
+
+def _parse_times(text: str) -> list[int]:
+    """Parses TIMES (see the module docstring) into minutes since midnight."""
+    times: list[int] = []
+    for part in text.split(","):
+        match = _STEP_RE.match(part)
+        if match is None:
+            times.append(_parse_time(part))
+            continue
+        first, last = _parse_time(match.group(1)), _parse_time(match.group(2))
+        step = int(match.group(3))
+        if step <= 0 or last < first:
+            raise ValueError(f"Invalid time range: {part!r}")
+        times.extend(range(first, last + 1, step))
+    return times
+
+
+def _parse_date(text: str) -> int:
+    try:
+        return datetime.date.fromisoformat(text).toordinal()
+    except ValueError:
+        raise ValueError(f"Invalid date: {text!r}") from None
+
+
+def _merge_ranges(ranges: list[tuple[int, int]]) -> tuple[list[int], list[int]]:
+    """
+    Merges overlapping and adjacent (first, last) integer ranges into sorted
+    lists of firsts and lasts, for lookups with bisect.
+    """
+    firsts: list[int] = []
+    lasts: list[int] = []
+    for first, last in sorted(ranges):
+        if lasts and first <= lasts[-1] + 1:
+            lasts[-1] = max(lasts[-1], last)
+        else:
+            firsts.append(first)
+            lasts.append(last)
+    return firsts, lasts
+
+
+class Schedule:
+    """
+    The configured pop-up schedule, compiled for next_run() lookups.
+
+    Raises ValueError for an invalid expression, window or exclusion.
+    """
+
+    def __init__(
+        self,
+        schedule_type: str,
+        schedule_list: list[str],
+        interval_hours: int,
+        interval_minutes: int,
+        working_hours: Optional[list[str]] = None,
+        exclusions: Optional[list[str]] = None,
+    ) -> None:
+        self.schedule_type = schedule_type
+        self.interval_hours = interval_hours
+        self.interval_minutes = interval_minutes
+
+        # Sorted minutes of the day, per weekday (Monday first).
+        day_times: list[set[int]] = [set() for _ in range(7)]
+        for expression in schedule_list:
+            days, text = _split_expression(expression)
+            times = _parse_times(text)
+            for day in days:
+                day_times[day].update(times)
+        self._times = [sorted(times) for times in day_times]
+
+        # Merged [start, end) windows in minutes of the day, per weekday; None
+        # for no restriction.
+        self._windows: Optional[list[tuple[list[int], list[int]]]] = None
+        if working_hours:
+            day_windows: list[list[tuple[int, int]]] = [[] for _ in range(7)]
+            for expression in working_hours:
+                days, text = _split_expression(expression)
+                match = _WINDOW_RE.match(text)
+                if match is None:
+                    raise ValueError(f"Invalid working hours: {expression!r}")
+                start = _parse_time(match.group(1))
+                end = _parse_time(match.group(2), allow_end_of_day=True)
+                if end <= start:
+                    raise ValueError(f"Invalid working hours: {expression!r}")
+                for day in days:
+                    # Stored as inclusive ranges of minutes for merging.
+                    day_windows[day].append((start, end - 1))
+            self._windows = []
+            for windows in day_windows:
+                starts, lasts = _merge_ranges(windows)
+                self._windows.append((starts, [last + 1 for last in lasts]))
+
+        # Merged excluded days, as inclusive ranges of date ordinals.
+        excluded: list[tuple[int, int]] = []
+        for text in exclusions or []:
+            first_text, separator, last_text = text.strip().partition("..")
+            first = _parse_date(first_text)
+            last = _parse_date(last_text) if separator else first
+            if last < first:
+                raise ValueError(f"Invalid date range: {text!r}")
+            excluded.append((first, last))
+        self._excluded_firsts, self._excluded_lasts = _merge_ranges(excluded)
+
+    @staticmethod
+    def config_key(config_store: Any) -> tuple:
+        """Returns the settings a Schedule is compiled from, as a tuple."""
+        return (
+            config_store.get("schedule_type", DEFAULT_SCHEDULE_TYPE),
+            tuple(config_store.get("schedule_list", DEFAULT_SCHEDULE_LIST)),
+            config_store.get("interval_hours", DEFAULT_INTERVAL_HOURS),
+            config_store.get("interval_minutes", DEFAULT_INTERVAL_MINUTES),
+            tuple(config_store.get("working_hours", DEFAULT_WORKING_HOURS)),
+            tuple(
+                config_store.get("schedule_exclusions", DEFAULT_SCHEDULE_EXCLUSIONS)
+            ),
+        )
+
+    @classmethod
+    def from_config_key(cls, key: tuple) -> "Schedule":
+        (
+            schedule_type,
+            schedule_list,
+            interval_hours,
+            interval_minutes,
+            working_hours,
+            exclusions,
+        ) = key
+        return cls(
+            schedule_type,
+            list(schedule_list),
+            interval_hours,
+            interval_minutes,
+            list(working_hours),
+            list(exclusions),
+        )
+
+    def _included_day(self, day: datetime.date) -> datetime.date:
+        """Returns day, or the first day after it that is not excluded."""
+        ordinal = day.toordinal()
+        index = bisect.bisect_right(self._excluded_firsts, ordinal) - 1
+        if index >= 0 and self._excluded_lasts[index] >= ordinal:
+            return datetime.date.fromordinal(self._excluded_lasts[index] + 1)
+        return day
+
+    @staticmethod
+    def _at(
+        now: pendulum.DateTime, day: datetime.date, minute: int
+    ) -> pendulum.DateTime:
+        """
+        Returns the wall-clock time minute (since midnight) on day, in the
+        time zone of now. A time skipped by a DST change moves forward.
+        """
+        return pendulum.datetime(
+            day.year,
+            day.month,
+            day.day,
+            minute // 60,
+            minute % 60,
+            tz=now.timezone,
+        )
+
+    def next_run(self, now: pendulum.DateTime) -> pendulum.DateTime:
+        """
+        Returns the first pop-up time after now: the next scheduled time, or
+        now plus the interval (moved into the working hours). An interval
+        pop-up falling on an excluded day moves to the start of the first
+        working hours of the next day that is not, or without working hours,
+        to one interval past its midnight.
+
+        Each day looked at costs a bisection, and excluded days are skipped
+        a whole range at a time. Only days without any time or window are
+        stepped over one by one, at most a week in a row.
+        """
+        if self.schedule_type == "schedule" and any(self._times):
+            day = now.date()
+            after = now.hour * 60 + now.minute
+            while True:
+                included = self._included_day(day)
+                if included != day:
+                    day, after = included, -1
+                times = self._times[day.weekday()]
+                index = bisect.bisect_right(times, after)
+                if index < len(times):
+                    return self._at(now, day, times[index])
+                day += datetime.timedelta(days=1)
+                after = -1
+
+        run = now.add(hours=self.interval_hours, minutes=self.interval_minutes)
+        day = run.date()
+        minute = run.hour * 60 + run.minute + run.second / 60
+        while True:
+            included = self._included_day(day)
+            if included != day:
+                if self._windows is None:
+                    # The interval starts over on the next included day.
+                    run = self._at(now, included, 0).add(
+                        hours=self.interval_hours, minutes=self.interval_minutes
+                    )
+                    day = run.date()
+                    continue
+                day, minute = included, -1
+            if self._windows is None:
+                return run
+            starts, ends = self._windows[day.weekday()]
+            index = bisect.bisect_right(ends, minute)
+            if index < len(ends):
+                if starts[index] <= minute:
+                    return run
+                return self._at(now, day, starts[index])
+            day += datetime.timedelta(days=1)
+            minute = -1
+
+
+class Scheduler(QObject):
+    """
+    Tells when to pop up the log-work dialog (due) and when to warm the task
+    cache ahead of it (prefetch_due, with the pop-up time).
+
+    Everything that moves the next run goes through set_next_run() or
+    schedule_next_run(), which re-arm the timer.
+    """
+
+    due = Signal()
+    prefetch_due = Signal(object)
+
+    def __init__(self, config_store: Any, parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self.config_store = config_store
+        self.state_store = StateStore()
+        self._schedule_key: Optional[tuple] = None
+        self._schedule: Optional[Schedule] = None
+        next_run = self.state_store.get("next_run")
+        self._next_run: Optional[pendulum.DateTime] = (
+            cast(pendulum.DateTime, pendulum.parse(next_run)) if next_run else None
+        )
+        # The next run the cache has been prefetched for.
+        self._prefetched_for: Optional[pendulum.DateTime] = None
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._timer.timeout.connect(self._on_timeout)
+
+        if QDBusConnection is not None:
+            connected = QDBusConnection.systemBus().connect(
+                "org.freedesktop.login1",
+                "/org/freedesktop/login1",
+                "org.freedesktop.login1.Manager",
+                "PrepareForSleep",
+                self,
+                # The stubs want bytes; SLOT() returns the str PySide expects.
+                SLOT("_on_prepare_for_sleep(bool)"),  # type: ignore[arg-type]
+            )
+            LOG.debug("Listening for resume from sleep: %s", connected)
+
+    def start(self) -> None:
+        """Checks the timeline right away and arms the timer."""
+        self._timer.start(0)
+
+    def next_run(self) -> Optional[pendulum.DateTime]:
+        """Returns the next pop-up time, or None to pop up right away."""
+        return self._next_run
+
+    def is_due(self, now: Optional[pendulum.DateTime] = None) -> bool:
+        if self._next_run is None:
+            return True
+        return self._next_run <= (now or pendulum.now())
+
+    def set_next_run(self, next_run: Optional[pendulum.DateTime]) -> None:
+        """Moves the next pop-up (None: right away) and re-arms the timer."""
+        self._next_run = next_run
+        self.state_store.set("next_run", next_run.for_json() if next_run else "")
+        self.start()
+
+    def schedule_next_run(self) -> None:
+        """
+        Moves a due pop-up to the next time on the configured schedule. A
+        pop-up that is not due yet (the dialog was opened manually) stays.
+        """
+        now = pendulum.now()
+        if not self.is_due(now):
+            LOG.debug("We were probably executed manually. Won't schedule.")
+            return
+        next_run = self._compiled_schedule().next_run(now)
+        LOG.debug("Next run scheduled at: %s", next_run)
+        self.set_next_run(next_run)
+
+    def _compiled_schedule(self) -> Schedule:
+        key = Schedule.config_key(self.config_store)
+        if self._schedule is None or key != self._schedule_key:
+            self._schedule_key = key
+            try:
+                self._schedule = Schedule.from_config_key(key)
+            except ValueError as exc:
+                LOG.warning("Invalid schedule (%s); using the default.", exc)
+                self._schedule = Schedule(
+                    DEFAULT_SCHEDULE_TYPE,
+                    DEFAULT_SCHEDULE_LIST,
+                    DEFAULT_INTERVAL_HOURS,
+                    DEFAULT_INTERVAL_MINUTES,
+                )
+        return self._schedule
+
+    def _prefetch_at(self) -> Optional[pendulum.DateTime]:
+        """Returns when to prefetch for the next run, or None not to."""
+        prefetch_minutes = self.config_store.get(
+            "prefetch_minutes", DEFAULT_PREFETCH_MINUTES
+        )
+        if (
+            self._next_run is None
+            or prefetch_minutes <= 0
+            or self._prefetched_for == self._next_run
+        ):
+            return None
+        return self._next_run.subtract(minutes=prefetch_minutes)
+
+    @Slot()
+    def _on_timeout(self) -> None:
+        now = pendulum.now()
+        if self.is_due(now):
+            LOG.debug("It's time to pop up the registration window")
+            self.due.emit()
+        else:
+            prefetch_at = self._prefetch_at()
+            if prefetch_at is not None and prefetch_at <= now:
+                self._prefetched_for = self._next_run
+                self.prefetch_due.emit(self._next_run)
+        self._arm()
+
+    def _arm(self) -> None:
+        """Arms the timer for the next point on the timeline."""
+        now = pendulum.now()
+        if self.is_due(now):
+            self._timer.start(_DUE_RETRY_MS)
+            return
+        assert self._next_run is not None
+        timeline = sorted(
+            point
+            for point in (self._prefetch_at(), self._next_run)
+            if point is not None
+        )
+        delay_ms = max(int((timeline[0] - now).total_seconds() * 1000), 0)
+        LOG.debug("Next scheduler event at %s", timeline[0])
+        self._timer.start(min(delay_ms, _MAX_TIMER_MS))
+
+    @Slot(bool)
+    def _on_prepare_for_sleep(self, going_to_sleep: bool) -> None:
+        if not going_to_sleep:
+            LOG.debug("Resumed from sleep; re-arming the scheduler.")
+            self.start()
@@ -0,0 +1,270 @@
+"""
+Persistent store of volatile runtime state, kept apart from the configuration.
+
+Values that change on every tick or registration (the next pop-up time, the
+last registered issue and the registration history) live in a SQLite
+database in the user data dir, so updating one of them is a small
+transaction instead of a rewrite of config.json.
+
+The registration history is an append-only log that is never truncated. It is
+indexed by time and by issue, and read a page or a time range at a time.
+"""
+
+import datetime
+import json
+import logging
+import os
+import sqlite3
+import threading
+from typing import Any, Iterator, Optional
+
+from appdirs import user_data_dir
+
+from zup.constants import APPLICATION_AUTHOR, APPLICATION_NAME
+
+LOG = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS state (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS registrations (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    datetime TEXT NOT NULL,
+    issue_id TEXT NOT NULL,
+    issue_title TEXT NOT NULL,
+    time_spent REAL NOT NULL,
+    registered_ms INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+_INDEXES = """
+CREATE INDEX IF NOT EXISTS registrations_time
+    ON registrations (registered_ms);
+CREATE INDEX IF NOT EXISTS registrations_issue
+    ON registrations (issue_id, registered_ms);
+"""
+
+# Bumped whenever the schema changes; see _migrate().
+_SCHEMA_VERSION = 1
+
+_REGISTRATION_COLUMNS = (
+    "id, datetime, issue_id, issue_title, time_spent, registered_ms"
+)
+
+# Keys that used to live in config.json; see migrate_from_config().
+_MIGRATED_KEYS = ("next_run", "last_registration_issue_id", "registration_history")
+
+
+def _timestamp_ms(text: str) -> int:
+    """
+    Converts an ISO 8601 date-time (local time if it has no offset) to UTC
+    milliseconds, or 0 if it cannot be parsed.
+    """
+    try:
+        registered_at = datetime.datetime.fromisoformat(text)
+    except (TypeError, ValueError):
+        return 0
+    return int(registered_at.timestamp() * 1000)
+
+
+def _registration(row: tuple) -> dict:
+    return {
+        "id": row[0],
+        "datetime": row[1],
+        "issue_id": row[2],
+        "issue_title": row[3],
+        "time_spent": row[4],
+        "registered_ms": row[5],
+    }
+
+
+class StateStore:
+    """
+    A class for managing the application's runtime state.
+
+    Single values are stored as JSON under a key (get()/set()). Registrations
+    are appended to their own table, oldest first.
+    """
+
+    _instance: "StateStore | None" = None
+    _lock = threading.Lock()
+    _connection: Optional[sqlite3.Connection]
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super(StateStore, cls).__new__(cls)
+                    cls._instance._connection = None
+        return cls._instance
+
+    def _get_database_path(self) -> str:
+        """Returns the path to the database file."""
+        data_dir = user_data_dir(APPLICATION_NAME, APPLICATION_AUTHOR)
+        return os.path.join(data_dir, "state.sqlite3")
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Returns the database connection, opening it on first use.
+        Must be called with the lock held.
+        """
+        if self._connection is None:
+            database_path = self._get_database_path()
+            os.makedirs(os.path.dirname(database_path), exist_ok=True)
+            self._connection = sqlite3.connect(
+                database_path, check_same_thread=False
+            )
+            # Commits append to the write-ahead log without an fsync each.
+            self._connection.execute("PRAGMA journal_mode = WAL")
+            self._connection.execute("PRAGMA synchronous = NORMAL")
+            self._connection.executescript(_SCHEMA)
+            self._migrate(self._connection)
+            self._connection.executescript(_INDEXES)
+        return self._connection
+
+    @staticmethod
+    def _migrate(connection: sqlite3.Connection) -> None:
+        """Upgrades a database written by an older version in place."""
+        (version,) = connection.execute("PRAGMA user_version").fetchone()
+        if version == _SCHEMA_VERSION:
+            return
+        columns = {
+            row[1] for row in connection.execute("PRAGMA table_info(registrations)")
+        }
+        with connection:
+            if "registered_ms" not in columns:
+                connection.execute(
+                    "ALTER TABLE registrations"
+                    " ADD COLUMN registered_ms INTEGER NOT NULL DEFAULT 0"
+                )
+            rows = connection.execute(
+                "SELECT id, datetime FROM registrations WHERE registered_ms = 0"
+            ).fetchall()
+            connection.executemany(
+                "UPDATE registrations SET registered_ms = ? WHERE id = ?",
+                [(_timestamp_ms(text), row_id) for row_id, text in rows],
+            )
+            connection.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+
+    def get(self, key: str, default_value: Any = "") -> Any:
+        """
+        Reads the specified state value.
+        """
+        with self._lock:
+            row = (
+                self._connect()
+                .execute("SELECT value FROM state WHERE key = ?", (key,))
+                .fetchone()
+            )
+        return json.loads(row[0]) if row else default_value
+
+    def set(self, key: str, value: Any) -> None:
+        """
+        Sets the specified state value.
+        """
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO state VALUES (?, ?)",
+                    (key, json.dumps(value)),
+                )
+
+    def add_registration(self, entry: dict) -> None:
+        """
+        Appends a registration ({"datetime", "issue_id", "issue_title",
+        "time_spent"}) to the history. Raises ValueError without an issue_id.
+        """
+        if not entry.get("issue_id"):
+            raise ValueError(f"Registration without an issue: {entry!r}")
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute(
+                    "INSERT INTO registrations"
+                    " (datetime, issue_id, issue_title, time_spent, registered_ms)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    (
+                        entry["datetime"],
+                        entry["issue_id"],
+                        entry["issue_title"],
+                        entry["time_spent"],
+                        _timestamp_ms(entry["datetime"]),
+                    ),
+                )
+
+    def registrations(
+        self,
+        limit: int,
+        before_id: Optional[int] = None,
+        issue_id: Optional[str] = None,
+    ) -> list[dict]:
+        """
+        Returns a page of at most limit registrations, newest first,
+        optionally only those of one issue. Pass the "id" of the last
+        registration of a page as before_id to get the next page.
+
+        Registrations are dicts shaped like those passed to add_registration(),
+        plus "id" and "registered_ms" (UTC milliseconds).
+        """
+        conditions = []
+        parameters: list[Any] = []
+        if before_id is not None:
+            conditions.append("id < ?")
+            parameters.append(before_id)
+        if issue_id is not None:
+            conditions.append("issue_id = ?")
+            parameters.append(issue_id)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        with self._lock:
+            rows = (
+                self._connect()
+                .execute(
+                    f"SELECT {_REGISTRATION_COLUMNS} FROM registrations{where}"
+                    " ORDER BY id DESC LIMIT ?",
+                    (*parameters, limit),
+                )
+                .fetchall()
+            )
+        return [_registration(row) for row in rows]
+
+    def iter_registrations(
+        self, start_ms: Optional[int] = None, end_ms: Optional[int] = None
+    ) -> Iterator[dict]:
+        """
+        Yields the registrations made at start_ms..end_ms (UTC milliseconds,
+        end exclusive; either may be None), in the order they were made.
+        See registrations() for their shape.
+        """
+        query = f"SELECT {_REGISTRATION_COLUMNS} FROM registrations"
+        query += " WHERE registered_ms >= ? AND registered_ms < ?"
+        query += " ORDER BY registered_ms, id"
+        bounds = (
+            start_ms if start_ms is not None else -(2**63),
+            end_ms if end_ms is not None else 2**63 - 1,
+        )
+        with self._lock:
+            rows = self._connect().execute(query, bounds).fetchall()
+        for row in rows:
+            yield _registration(row)
+
+    def migrate_from_config(self, config_store: Any) -> None:
+        """
+        Moves runtime state still kept in the configuration (by older
+        versions) into this store, and removes it from the configuration.
+        """
+        legacy_keys = [
+            key for key in _MIGRATED_KEYS if config_store.get(key, None) is not None
+        ]
+        if not legacy_keys:
+            return
+        for key in ("next_run", "last_registration_issue_id"):
+            if key in legacy_keys:
+                self.set(key, config_store.get(key))
+        for entry in config_store.get("registration_history", None) or []:
+            if entry.get("issue_id"):
+                self.add_registration(entry)
+        config_store.remove_keys(legacy_keys)
+        LOG.debug("Moved %s from the configuration to the state store", legacy_keys)
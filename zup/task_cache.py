@@ -0,0 +1,132 @@
+"""
+Persistent on-disk cache of the tasks offered in the log-work dialog.
+
+Tasks are stored per ClickUp list ID, together with the time they were
+fetched. The log-work dialog populates itself from the cached snapshot and
+refreshes it in the background (stale-while-revalidate). The snapshots also
+carry the high-water mark used by ClickUpClient.sync_list_snapshots() to
+fetch only the tasks that changed since.
+"""
+
+import logging
+import time
+from typing import Any
+
+from zup.constants import (
+    DEFAULT_TASK_CACHE_MAX_AGE_HOURS,
+    DEFAULT_TASK_CACHE_MAX_LISTS,
+    DEFAULT_TASK_FULL_SYNC_HOURS,
+)
+from zup.json_cache import JsonFileCache
+
+LOG = logging.getLogger(__name__)
+
+
+class TaskCache(JsonFileCache):
+    """
+    A class for managing the cached per-list task snapshots.
+
+    The cache file maps list IDs to the snapshots returned by
+    ClickUpClient.sync_list_snapshots(), each extended with "fetched_at", the
+    UNIX timestamp in seconds of the last successful sync.
+    """
+
+    _FILENAME = "tasks.json"
+    _entries: dict[str, dict[str, Any]]
+
+    def _initialize(self) -> None:
+        entries = self._load()
+        self._entries = entries if isinstance(entries, dict) else {}
+
+    def get(
+        self,
+        list_ids: list[str],
+        max_age_hours: float = DEFAULT_TASK_CACHE_MAX_AGE_HOURS,
+    ) -> dict[str, list[dict]]:
+        """
+        Returns the cached tasks of the given lists.
+
+        Lists that were never cached, or whose snapshot is older than
+        max_age_hours, are left out of the result.
+        """
+        oldest = time.time() - max_age_hours * 3600
+        with self._lock:
+            return {
+                list_id: list(self._entries[list_id]["tasks"])
+                for list_id in list_ids
+                if list_id in self._entries
+                and self._entries[list_id].get("fetched_at", 0) >= oldest
+            }
+
+    def get_snapshots(
+        self,
+        list_ids: list[str],
+        full_sync_hours: float = DEFAULT_TASK_FULL_SYNC_HOURS,
+    ) -> dict[str, dict]:
+        """
+        Returns the cached snapshots of the given lists, for incremental sync.
+
+        Snapshots whose last full fetch is older than full_sync_hours are left
+        out, forcing a full re-fetch that also catches changes an incremental
+        sync cannot see (archived, deleted or moved tasks, renamed lists).
+        """
+        oldest = time.time() - full_sync_hours * 3600
+        with self._lock:
+            return {
+                list_id: self._entries[list_id]
+                for list_id in list_ids
+                if list_id in self._entries
+                and self._entries[list_id].get("full_sync_at", 0) >= oldest
+            }
+
+    def age(self, list_ids: list[str]) -> float | None:
+        """
+        Returns the age in seconds of the oldest snapshot among the given
+        lists, or None if any of them is not cached at all.
+        """
+        now = time.time()
+        with self._lock:
+            ages = [
+                now - self._entries[list_id].get("fetched_at", 0)
+                if list_id in self._entries
+                else None
+                for list_id in list_ids
+            ]
+        if not ages or None in ages:
+            return None
+        return max(ages)  # type: ignore[type-var]
+
+    def update(
+        self,
+        snapshots: dict[str, dict],
+        max_lists: int = DEFAULT_TASK_CACHE_MAX_LISTS,
+    ) -> None:
+        """
+        Stores freshly synced snapshots and writes the cache to disk.
+
+        When more than max_lists lists are cached, the least recently
+        fetched ones are evicted.
+        """
+        if not snapshots:
+            return
+        now = time.time()
+        with self._lock:
+            for list_id, snapshot in snapshots.items():
+                self._entries.pop(list_id, None)
+                self._entries[list_id] = {**snapshot, "fetched_at": now}
+            if len(self._entries) > max_lists:
+                by_age = sorted(
+                    self._entries, key=lambda k: self._entries[k].get("fetched_at", 0)
+                )
+                for list_id in by_age[: len(self._entries) - max_lists]:
+                    del self._entries[list_id]
+            self._save(self._entries)
+
+    def invalidate(self) -> None:
+        """
+        Drops all cached tasks, both in memory and on disk.
+        """
+        with self._lock:
+            self._entries = {}
+            self._remove()
+        LOG.debug("Task cache invalidated.")
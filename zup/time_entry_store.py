@@ -0,0 +1,262 @@
+"""
+Local SQLite store of ClickUp time entries, used by zup-timesheet.
+
+Time entries are stored per user together with the local date they started
+on. Every day that has been fetched from ClickUp is recorded as synced, so a
+day that can no longer change (see the lock horizon in zup.timesheet) only
+ever has to be fetched once. Reports are aggregated with indexed SQL queries.
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Iterator, Optional
+
+from appdirs import user_cache_dir
+
+from zup.constants import APPLICATION_AUTHOR, APPLICATION_NAME
+from zup.workspace_cache import token_fingerprint
+
+LOG = logging.getLogger(__name__)
+
+_FETCH_BATCH_SIZE = 500
+
+# Bump when the schema changes; the store is then rebuilt from scratch.
+_SCHEMA_VERSION = 2
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    date TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    start_ms INTEGER NOT NULL,
+    duration_ms INTEGER NOT NULL,
+    task_id TEXT NOT NULL,
+    task_name TEXT NOT NULL,
+    list_id TEXT NOT NULL,
+    list_name TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_user_date ON entries (user_id, date, seq);
+CREATE TABLE IF NOT EXISTS synced_days (
+    user_id TEXT NOT NULL,
+    date TEXT NOT NULL,
+    synced_at REAL NOT NULL,
+    PRIMARY KEY (user_id, date)
+);
+CREATE TABLE IF NOT EXISTS identities (
+    token TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    user_name TEXT NOT NULL
+);
+"""
+
+
+class TimeEntryStore:
+    """
+    A class for managing the local time-entry store.
+
+    Dates are local "YYYY-MM-DD" strings. Within a day, "seq" keeps the order
+    in which ClickUp returned the entries, so reports list tasks in the same
+    order as when they are built straight from the API response.
+    """
+
+    _instance: "TimeEntryStore | None" = None
+    _lock = threading.Lock()
+    _connection: Optional[sqlite3.Connection]
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super(TimeEntryStore, cls).__new__(cls)
+                    cls._instance._connection = None
+        return cls._instance
+
+    def _get_database_path(self) -> str:
+        """Returns the path to the database file."""
+        cache_dir = user_cache_dir(APPLICATION_NAME, APPLICATION_AUTHOR)
+        return os.path.join(cache_dir, "time_entries.sqlite3")
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Returns the database connection, opening it on first use.
+        Must be called with the lock held.
+        """
+        if self._connection is None:
+            database_path = self._get_database_path()
+            os.makedirs(os.path.dirname(database_path), exist_ok=True)
+            self._connection = sqlite3.connect(
+                database_path, check_same_thread=False
+            )
+            (version,) = self._connection.execute("PRAGMA user_version").fetchone()
+            if version != _SCHEMA_VERSION:
+                LOG.debug("Rebuilding time-entry store (schema %d)", version)
+                self._connection.executescript(
+                    "DROP TABLE IF EXISTS entries;"
+                    " DROP TABLE IF EXISTS synced_days;"
+                    f" PRAGMA user_version = {_SCHEMA_VERSION};"
+                )
+            self._connection.executescript(_SCHEMA)
+        return self._connection
+
+    def get_identity(self, user_token: str) -> tuple[str, str] | None:
+        """
+        Returns (user_id, user_name) stored for the given token, or None.
+        """
+        with self._lock:
+            row = (
+                self._connect()
+                .execute(
+                    "SELECT user_id, user_name FROM identities WHERE token = ?",
+                    (token_fingerprint(user_token),),
+                )
+                .fetchone()
+            )
+        return (row[0], row[1]) if row else None
+
+    def set_identity(self, user_token: str, user_id: str, user_name: str) -> None:
+        """
+        Stores the user the given token belongs to.
+        """
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO identities VALUES (?, ?, ?)",
+                    (token_fingerprint(user_token), user_id, user_name),
+                )
+
+    def synced_days(self, user_id: str, first_date: str, last_date: str) -> set[str]:
+        """
+        Returns the dates between first_date and last_date (inclusive) that
+        have been synced for the user.
+        """
+        with self._lock:
+            rows = (
+                self._connect()
+                .execute(
+                    "SELECT date FROM synced_days"
+                    " WHERE user_id = ? AND date BETWEEN ? AND ?",
+                    (user_id, first_date, last_date),
+                )
+                .fetchall()
+            )
+        return {row[0] for row in rows}
+
+    def replace_days(
+        self, user_id: str, dates: list[str], entries: list[dict]
+    ) -> None:
+        """
+        Replaces the user's entries on the given dates and marks them synced,
+        in a single transaction.
+
+        entries are dicts with "id", "date", "start_ms", "duration_ms",
+        "task_id", "task_name", "list_id" and "list_name", in the order
+        ClickUp returned them. An entry stored
+        under another date before (because it was moved) is replaced.
+        """
+        now = time.time()
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.executemany(
+                    "DELETE FROM entries WHERE user_id = ? AND date = ?",
+                    ((user_id, date) for date in dates),
+                )
+                connection.executemany(
+                    "INSERT OR REPLACE INTO entries"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        (
+                            entry["id"],
+                            user_id,
+                            entry["date"],
+                            seq,
+                            entry["start_ms"],
+                            entry["duration_ms"],
+                            entry["task_id"],
+                            entry["task_name"],
+                            entry["list_id"],
+                            entry["list_name"],
+                        )
+                        for seq, entry in enumerate(entries)
+                    ),
+                )
+                connection.executemany(
+                    "INSERT OR REPLACE INTO synced_days VALUES (?, ?, ?)",
+                    ((user_id, date, now) for date in dates),
+                )
+
+    def iter_task_totals(
+        self, user_id: str, first_date: str, last_date: str
+    ) -> Iterator[tuple[str, str, str, int]]:
+        """
+        Yields (date, task_id, task_name, total_ms) per day and task between
+        first_date and last_date (inclusive), ordered by date and, within a
+        day, by the task's first entry. Running timers and empty entries
+        (duration <= 0) are left out; task_name is taken from the first entry.
+
+        Rows are read from the database in batches as they are consumed.
+        """
+        with self._lock:
+            # SQLite takes the bare task_name from the row MIN(seq) came from.
+            cursor = self._connect().execute(
+                "SELECT date, task_id, task_name, MIN(seq) AS first_seq,"
+                " SUM(duration_ms)"
+                " FROM entries"
+                " WHERE user_id = ? AND date BETWEEN ? AND ? AND duration_ms > 0"
+                " GROUP BY date, task_id"
+                " ORDER BY date, first_seq",
+                (user_id, first_date, last_date),
+            )
+        try:
+            while True:
+                with self._lock:
+                    rows = cursor.fetchmany(_FETCH_BATCH_SIZE)
+                if not rows:
+                    return
+                for date, task_id, task_name, _, total_ms in rows:
+                    yield date, task_id, task_name, total_ms
+        finally:
+            cursor.close()
+
+    def iter_entries(
+        self, user_ids: list[str], first_date: str, last_date: str
+    ) -> Iterator[tuple[int, int, str, str, str, str]]:
+        """
+        Yields (start_ms, duration_ms, task_id, task_name, list_id, list_name)
+        of the users' entries between first_date and last_date (inclusive),
+        ordered by user, date and the order ClickUp returned them. Rows are
+        read in batches as they are consumed.
+        """
+        placeholders = ", ".join("?" * len(user_ids))
+        with self._lock:
+            cursor = self._connect().execute(
+                "SELECT start_ms, duration_ms, task_id, task_name, list_id, list_name"
+                " FROM entries"
+                f" WHERE user_id IN ({placeholders}) AND date BETWEEN ? AND ?"
+                " ORDER BY user_id, date, seq",
+                (*user_ids, first_date, last_date),
+            )
+        try:
+            while True:
+                with self._lock:
+                    rows = cursor.fetchmany(_FETCH_BATCH_SIZE)
+                if not rows:
+                    return
+                yield from rows
+        finally:
+            cursor.close()
+
+    def invalidate(self) -> None:
+        """
+        Drops all stored entries and sync state.
+        """
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute("DELETE FROM entries")
+                connection.execute("DELETE FROM synced_days")
+        LOG.debug("Time-entry store invalidated.")
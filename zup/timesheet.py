@@ -1,140 +1,371 @@
 """
-Export a monthly time-sheet for the authenticated ClickUp user.
+Export a monthly time-sheet for the authenticated ClickUp user (or others).
 
-Fetches all time entries for a given year/month, accumulates them per day
-and per task, and prints the result as JSON to stdout.
+Fetches all time entries for a given year/month (or any range of days),
+accumulates them per day and per task, and prints the result to stdout: as a
+single JSON document, or streamed as one NDJSON/CSV row per day and task.
 
 Usage:
-    python -m zup.timesheet [--year YEAR] [--month MONTH]
-
-Both options default to the current year and month. The ClickUp API token
-is read from the Zup configuration file (set via the Zup settings dialog).
+    python -m zup.timesheet [--year YEAR] [--month MONTH] [--format FORMAT]
+    python -m zup.timesheet --from YYYY-MM-DD [--to YYYY-MM-DD] [--format FORMAT]
+    python -m zup.timesheet (--assignees A,B,... | --all-members) [...]
+    python -m zup.timesheet --local [...]
+
+--year and --month default to the current year and month, --to to today.
+Time entries are kept in a local SQLite store (see zup.time_entry_store).
+Days older than the lock horizon (the "timesheet_lock_months" setting: the
+current month plus that many previous months may still change) are fetched
+once and then served offline; --refresh fetches everything again. The other
+days are fetched in windows of --window-days days, several at once,
+at most "requests_per_minute" (setting) per minute. --assignees and
+--all-members export other workspace members too, as a report keyed by user ID
+(always with "from"/"to"). --rollup day|week|task|list exports totals per
+day, ISO week, task or list instead (see zup.rollup). --local previews the
+time-sheet from the registrations made with Zup on this machine (see
+zup.state_store) without contacting ClickUp.
+The ClickUp API token is read from the Zup configuration file (set via the
+Zup settings dialog).
 """
 
 import calendar
+import csv
 import datetime
+import itertools
 import json
 import logging
+import operator
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import TYPE_CHECKING, Iterable, Iterator, TextIO
 
 import click
 
-from zup.clickup_client import ClickUpClient
+from zup.clickup_client import ClickUpClient, RateLimiter
 from zup.config_store import ConfigStore
+from zup.constants import (
+    DEFAULT_FETCH_WORKERS,
+    DEFAULT_REQUESTS_PER_MINUTE,
+    DEFAULT_TIMESHEET_LOCK_MONTHS,
+    DEFAULT_TIMESHEET_WINDOW_DAYS,
+)
+from zup.metadata_cache import ClickUpMetadataCache
+from zup.rollup import ROLLUPS, DayBuckets, EntryColumns, local_midnight_ms
+from zup.state_store import StateStore
+from zup.time_entry_store import TimeEntryStore
+
+if TYPE_CHECKING:
+    from clickup_python_sdk.exceptions import ClickupRequestException
 
 LOG = logging.getLogger(__name__)
 
 _MS_TO_HOURS = 1 / (1000 * 3600)
 
+_RATE_LIMIT_RETRIES = 3
+_RATE_LIMIT_FALLBACK_SECONDS = 60.0
 
-def _month_range_ms(year: int, month: int) -> tuple[int, int]:
-    """Return (start_ms, end_ms) covering the full month in local time."""
-    start = datetime.datetime(year, month, 1)
+_ROW_FIELDS = ["date", "user", "task_id", "task_name", "hours"]
+_ROLLUP_FIELDS = ["key", "name", "hours"]
+
+
+def _month_range(year: int, month: int) -> tuple[datetime.date, datetime.date]:
+    """Return the first and last day of the month."""
     last_day = calendar.monthrange(year, month)[1]
-    end = datetime.datetime(year, month, last_day, 23, 59, 59, 999999)
-    return int(start.timestamp() * 1000), int(end.timestamp() * 1000)
+    return datetime.date(year, month, 1), datetime.date(year, month, last_day)
+
+
+def _lock_date(today: datetime.date, lock_months: int) -> datetime.date:
+    """
+    Return the first day that may still change: the first day of the month
+    lock_months months before today's month. Earlier days are locked.
+    """
+    month_index = today.year * 12 + (today.month - 1) - max(lock_months, 0)
+    return datetime.date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def _windows(days: list[datetime.date], window_days: int) -> list[list[datetime.date]]:
+    """
+    Split ascending days into windows of at most window_days consecutive
+    days. window_days <= 0 only splits where days are not consecutive.
+    """
+    windows: list[list[datetime.date]] = []
+    for day in days:
+        if (
+            windows
+            and day - windows[-1][-1] == datetime.timedelta(days=1)
+            and (window_days <= 0 or len(windows[-1]) < window_days)
+        ):
+            windows[-1].append(day)
+        else:
+            windows.append([day])
+    return windows
 
 
 def _ms_to_local_date(ms: int) -> str:
-    """Convert a millisecond UTC timestamp to a local YYYY-MM-DD string."""
+    """
+    Convert a millisecond UTC timestamp to a local YYYY-MM-DD string.
+    Only used for entries outside the requested days; see DayBuckets.
+    """
     return datetime.datetime.fromtimestamp(ms / 1000).strftime("%Y-%m-%d")
 
 
-def fetch_timesheet(client: ClickUpClient, year: int, month: int) -> dict:
+def _get_identity(client: ClickUpClient, store: TimeEntryStore) -> tuple[str, str]:
     """
-    Fetch and accumulate time entries for the given month.
-
-    Returns a dict with shape:
-        {
-          "year": int,
-          "month": int,
-          "user": str,
-          "days": [
-            {
-              "date": "YYYY-MM-DD",
-              "tasks": [{"id": str, "name": str, "hours": float}],
-              "total_hours": float
-            }
-          ],
-          "total_hours": float
-        }
+    Return (user_id, user_name) of the token's user, asking ClickUp only the
+    first time.
     """
+    identity = store.get_identity(client._user_token)
+    if identity is None:
+        user = client._get_client().TOKEN_USER
+        identity = (str(user["id"]), user["username"])
+        store.set_identity(client._user_token, *identity)
+    return identity
+
+
+def _fetch_windows(
+    client: ClickUpClient,
+    jobs: list[tuple[str, list[datetime.date]]],
+    max_workers: int,
+    rate_limiter: RateLimiter | None = None,
+) -> Iterator[tuple[tuple[str, list[datetime.date]], list[dict]]]:
+    """
+    Fetch the raw time entries of every (user_id, window) job, up to
+    max_workers jobs at once and, with a rate_limiter, no faster than it
+    allows. Yields (job, entries) as each job completes, so only the windows
+    not consumed yet are held in memory. Each window's entries are in the
+    order the API returned them.
+
+    Windows start at local midnight, so all entries dated on one day (by their
+    start) come from the same window.
+    """
+    from clickup_python_sdk.exceptions import ClickupRequestException
+
     sdk_client = client._get_client()
     team_id = client._get_team_id()
     if not team_id:
         raise RuntimeError("No workspace found for this token.")
 
-    user = sdk_client.TOKEN_USER
-    user_name: str = user["username"]
-    user_id: str = str(user["id"])
+    def fetch_window(job: tuple[str, list[datetime.date]]) -> list[dict]:
+        user_id, window = job
+        start_ms = local_midnight_ms(window[0])
+        end_ms = local_midnight_ms(window[-1] + datetime.timedelta(days=1)) - 1
+        for attempt in range(_RATE_LIMIT_RETRIES + 1):
+            if rate_limiter is not None:
+                rate_limiter.acquire()
+            try:
+                response = sdk_client.make_request(
+                    method="GET",
+                    route=f"team/{team_id}/time_entries",
+                    params={
+                        "start_date": str(start_ms),
+                        "end_date": str(end_ms),
+                        "assignee": user_id,
+                        "include_location_names": "true",
+                    },
+                )
+            except ClickupRequestException as exc:
+                if exc.http_status() != 429 or attempt == _RATE_LIMIT_RETRIES:
+                    raise
+                delay = _rate_limit_delay(exc)
+                LOG.debug("Rate limited, retrying in %.0f s", delay)
+                time.sleep(delay)
+                continue
+            response_data: dict = response or {}  # type: ignore[assignment]
+            return response_data.get("data", [])
+        raise AssertionError("unreachable")
+
+    if max_workers <= 1 or len(jobs) <= 1:
+        for job in jobs:
+            yield job, fetch_window(job)
+        return
+    with ThreadPoolExecutor(
+        max_workers=min(max_workers, len(jobs)),
+        thread_name_prefix="timesheet",
+    ) as executor:
+        futures = {executor.submit(fetch_window, job): job for job in jobs}
+        try:
+            for future in as_completed(futures):
+                yield futures.pop(future), future.result()
+        finally:
+            # Don't start any more requests after a failure.
+            for future in futures:
+                future.cancel()
+
+
+def _rate_limit_delay(exc: "ClickupRequestException") -> float:
+    """Seconds to wait after a 429, from X-RateLimit-Reset if present."""
+    reset_header = (exc.http_headers() or {}).get("X-RateLimit-Reset")
+    if reset_header is None:
+        return _RATE_LIMIT_FALLBACK_SECONDS
+    try:
+        reset_at = float(reset_header)
+    except ValueError:
+        return _RATE_LIMIT_FALLBACK_SECONDS
+    return min(max(reset_at - time.time(), 1.0), _RATE_LIMIT_FALLBACK_SECONDS)
+
+
+def _stale_days(
+    store: TimeEntryStore,
+    user_id: str,
+    first_day: datetime.date,
+    last_day: datetime.date,
+    lock_months: int,
+    refresh: bool,
+) -> list[datetime.date]:
+    """
+    Return the days first_day..last_day that have to be fetched for the user:
+    those at or after the lock horizon (see _lock_date()) and those never
+    synced. With refresh, all of them.
+    """
+    lock_date = _lock_date(datetime.date.today(), lock_months)
+    synced = (
+        set()
+        if refresh
+        else store.synced_days(user_id, first_day.isoformat(), last_day.isoformat())
+    )
+    days = [
+        first_day + datetime.timedelta(days=offset)
+        for offset in range((last_day - first_day).days + 1)
+    ]
+    return [day for day in days if day >= lock_date or day.isoformat() not in synced]
+
+
+def _sync_entries(
+    client: ClickUpClient,
+    store: TimeEntryStore,
+    user_ids: list[str],
+    first_day: datetime.date,
+    last_day: datetime.date,
+    window_days: int,
+    max_workers: int,
+    lock_months: int,
+    refresh: bool = False,
+    rate_limiter: RateLimiter | None = None,
+) -> None:
+    """
+    Bring the store up to date for the given users and the days
+    first_day..last_day (inclusive).
+
+    Days returned by _stale_days() are fetched from ClickUp in windows of
+    window_days days, for all users through one pool of max_workers threads,
+    and each window is written to the store as soon as it arrives; all other
+    days are served from the store. An entry returned for more than one
+    window is stored once, under the date it started on.
+    """
+    jobs: list[tuple[str, list[datetime.date]]] = []
+    for user_id in user_ids:
+        stale_days = _stale_days(
+            store, user_id, first_day, last_day, lock_months, refresh
+        )
+        jobs.extend((user_id, window) for window in _windows(stale_days, window_days))
+    if not jobs:
+        LOG.debug("Serving %s to %s from the local store", first_day, last_day)
+        return
 
-    start_ms, end_ms = _month_range_ms(year, month)
     LOG.debug(
-        "Fetching time entries for user %s (%s), %04d-%02d",
-        user_name,
-        user_id,
-        year,
-        month,
+        "Fetching time entries for %d user(s), %s to %s, in %d window(s)",
+        len(user_ids),
+        first_day,
+        last_day,
+        len(jobs),
     )
+    buckets = DayBuckets(first_day, last_day)
+    for (user_id, window), raw_entries in _fetch_windows(
+        client, jobs, max_workers, rate_limiter
+    ):
+        entries = []
+        seen_ids: set[str] = set()
+        for index, entry in enumerate(raw_entries):
+            entry_id = entry.get("id")
+            if entry_id is None:
+                entry_id = f"{user_id}:{window[0]}:{index}"
+            elif entry_id in seen_ids:
+                continue
+            seen_ids.add(entry_id)
+            start_ms = int(entry.get("start", 0))
+            day = buckets.date(start_ms)
+            task = entry.get("task") or {}
+            location = entry.get("task_location") or {}
+            entries.append(
+                {
+                    "id": entry_id,
+                    "date": day.isoformat() if day else _ms_to_local_date(start_ms),
+                    "start_ms": start_ms,
+                    "duration_ms": int(entry.get("duration", 0)),
+                    "task_id": task.get("id", "unknown"),
+                    "task_name": task.get("name", "(no task name)"),
+                    "list_id": str(location.get("list_id") or ""),
+                    "list_name": location.get("list_name") or "",
+                }
+            )
+        LOG.debug(
+            "Received %d time entr(ies) of user %s from %s",
+            len(entries),
+            user_id,
+            window[0],
+        )
+        store.replace_days(user_id, [day.isoformat() for day in window], entries)
 
-    response = sdk_client.make_request(
-        method="GET",
-        route=f"team/{team_id}/time_entries",
-        params={
-            "start_date": str(start_ms),
-            "end_date": str(end_ms),
-            "assignee": user_id,
-        },
-    )
-    response_data: dict = response or {}  # type: ignore[assignment]
-    entries = response_data.get("data", [])
-    LOG.debug("Received %d raw time entr(ies)", len(entries))
-
-    # Accumulate: {date: {task_id: {"name": str, "ms": int}}}
-    # Preserve insertion order within each day for stable output.
-    days: dict[str, dict[str, dict]] = {}
-
-    for entry in entries:
-        duration_ms = int(entry.get("duration", 0))
-        if duration_ms <= 0:
-            # Negative means a timer is still running; zero is useless.
-            LOG.debug("Skipping entry with duration %d ms", duration_ms)
-            continue
 
-        start_ms_entry = int(entry.get("start", 0))
-        date = _ms_to_local_date(start_ms_entry)
+def _resolve_users(
+    client: ClickUpClient,
+    store: TimeEntryStore,
+    assignees: list[str] | None,
+) -> list[tuple[str, str]]:
+    """
+    Return (user_id, user_name) of the users to export.
 
-        task = entry.get("task") or {}
-        task_id: str = task.get("id", "unknown")
-        task_name: str = task.get("name", "(no task name)")
+    assignees None means the token's user. An empty list means every member
+    of the workspace; otherwise each assignee is a user ID, username or email
+    address of a workspace member.
+    """
+    if assignees is None:
+        return [_get_identity(client, store)]
+
+    members = client.get_team_members()
+    if not assignees:
+        return [(member["id"], member["username"]) for member in members]
+
+    by_key: dict[str, list[dict]] = {}
+    for member in members:
+        for key in {member["id"], member["username"], member["email"]}:
+            if key:
+                by_key.setdefault(key.casefold(), []).append(member)
+    users: list[tuple[str, str]] = []
+    for assignee in assignees:
+        matches = by_key.get(assignee.casefold(), [])
+        if not matches:
+            raise ValueError(f"No workspace member matches {assignee!r}.")
+        if len(matches) > 1:
+            raise ValueError(
+                f"{assignee!r} matches more than one workspace member;"
+                " use their user ID or email address."
+            )
+        member = matches[0]
+        if (member["id"], member["username"]) not in users:
+            users.append((member["id"], member["username"]))
+    return users
 
-        LOG.debug(
-            "  %s  +%dms  task=%s (%s)",
-            date,
-            duration_ms,
-            task_name,
-            task_id,
-        )
 
-        if date not in days:
-            days[date] = {}
-        if task_id not in days[date]:
-            days[date][task_id] = {"name": task_name, "ms": 0}
-        days[date][task_id]["ms"] += duration_ms
+def _build_days(
+    task_totals: Iterable[tuple[str, str, str, int]],
+) -> tuple[list[dict], float]:
+    """
+    Build the per-day output from TimeEntryStore.iter_task_totals().
 
-    # Build output structure.
+    Returns (days, total_hours), see fetch_timesheet() for the shape of days.
+    """
     total_ms = 0
     days_out = []
-    for date in sorted(days):
+    for date, rows in itertools.groupby(task_totals, key=operator.itemgetter(0)):
         day_ms = 0
         tasks_out = []
-        for task_id, data in days[date].items():
-            task_ms = data["ms"]
+        for _, task_id, task_name, task_ms in rows:
             day_ms += task_ms
             tasks_out.append(
                 {
                     "id": task_id,
-                    "name": data["name"],
+                    "name": task_name,
                     "hours": round(task_ms * _MS_TO_HOURS, 2),
                 }
             )
@@ -147,15 +378,340 @@ def fetch_timesheet(client: ClickUpClient, year: int, month: int) -> dict:
             }
         )
 
+    return days_out, round(total_ms * _MS_TO_HOURS, 2)
+
+
+def fetch_timesheet(
+    client: ClickUpClient,
+    year: int,
+    month: int,
+    window_days: int = DEFAULT_TIMESHEET_WINDOW_DAYS,
+    max_workers: int = DEFAULT_FETCH_WORKERS,
+    lock_months: int = DEFAULT_TIMESHEET_LOCK_MONTHS,
+    refresh: bool = False,
+    rate_limiter: RateLimiter | None = None,
+) -> dict:
+    """
+    Fetch and accumulate time entries for the given month.
+
+    Entries are kept in the local TimeEntryStore. Only days that may still
+    change (or were never synced) are fetched, in windows of window_days days
+    (0 for as few requests as possible), up to max_workers at once; see
+    _sync_entries(). The result does not depend on any of that.
+
+    Returns a dict with shape:
+        {
+          "year": int,
+          "month": int,
+          "user": str,
+          "days": [
+            {
+              "date": "YYYY-MM-DD",
+              "tasks": [{"id": str, "name": str, "hours": float}],
+              "total_hours": float
+            }
+          ],
+          "total_hours": float
+        }
+    """
+    first_day, last_day = _month_range(year, month)
+    sheet = fetch_timesheet_range(
+        client,
+        first_day,
+        last_day,
+        window_days,
+        max_workers,
+        lock_months,
+        refresh,
+        rate_limiter,
+    )
+    del sheet["from"], sheet["to"]
+    return {"year": year, "month": month, **sheet}
+
+
+def fetch_timesheet_range(
+    client: ClickUpClient,
+    first_day: datetime.date,
+    last_day: datetime.date,
+    window_days: int = DEFAULT_TIMESHEET_WINDOW_DAYS,
+    max_workers: int = DEFAULT_FETCH_WORKERS,
+    lock_months: int = DEFAULT_TIMESHEET_LOCK_MONTHS,
+    refresh: bool = False,
+    rate_limiter: RateLimiter | None = None,
+) -> dict:
+    """
+    Fetch and accumulate time entries for the days first_day..last_day
+    (inclusive), which may span any number of months.
+
+    Returns the same shape as fetch_timesheet(), with "from" and "to"
+    ("YYYY-MM-DD") instead of "year" and "month".
+    """
+    store = TimeEntryStore()
+    user_id, user_name = _get_identity(client, store)
+    _sync_entries(
+        client,
+        store,
+        [user_id],
+        first_day,
+        last_day,
+        window_days,
+        max_workers,
+        lock_months,
+        refresh,
+        rate_limiter,
+    )
+    days, total_hours = _build_days(
+        store.iter_task_totals(user_id, first_day.isoformat(), last_day.isoformat())
+    )
     return {
-        "year": year,
-        "month": month,
+        "from": first_day.isoformat(),
+        "to": last_day.isoformat(),
         "user": user_name,
-        "days": days_out,
-        "total_hours": round(total_ms * _MS_TO_HOURS, 2),
+        "days": days,
+        "total_hours": total_hours,
     }
 
 
+def _iter_local_task_totals(
+    first_day: datetime.date, last_day: datetime.date
+) -> Iterator[tuple[str, str, str, int]]:
+    """
+    Like TimeEntryStore.iter_task_totals(), from the local registration
+    history: (date, task_id, task_name, total_ms) per day and task, by day
+    and then in the order the tasks were first registered that day.
+    """
+    buckets = DayBuckets(first_day, last_day)
+    totals: dict[tuple[int, str], list] = {}
+    for registration in StateStore().iter_registrations(
+        local_midnight_ms(first_day),
+        local_midnight_ms(last_day + datetime.timedelta(days=1)),
+    ):
+        day_index = buckets.index(registration["registered_ms"])
+        if day_index < 0:
+            continue
+        key = (day_index, registration["issue_id"])
+        if key not in totals:
+            totals[key] = [registration["issue_title"], 0]
+        totals[key][1] += round(registration["time_spent"] * 3600 * 1000)
+    for (day_index, task_id), (task_name, task_ms) in sorted(
+        totals.items(), key=lambda item: item[0][0]
+    ):
+        yield buckets.days[day_index].isoformat(), task_id, task_name, task_ms
+
+
+def local_timesheet(
+    first_day: datetime.date, last_day: datetime.date, user_name: str = ""
+) -> dict:
+    """
+    Preview the time-sheet of the days first_day..last_day (inclusive) from
+    the registrations made with Zup on this machine, without contacting
+    ClickUp. Tasks are named as they were registered.
+
+    Returns the same shape as fetch_timesheet_range().
+    """
+    days, total_hours = _build_days(_iter_local_task_totals(first_day, last_day))
+    return {
+        "from": first_day.isoformat(),
+        "to": last_day.isoformat(),
+        "user": user_name,
+        "days": days,
+        "total_hours": total_hours,
+    }
+
+
+def fetch_team_timesheet(
+    client: ClickUpClient,
+    first_day: datetime.date,
+    last_day: datetime.date,
+    assignees: list[str],
+    window_days: int = DEFAULT_TIMESHEET_WINDOW_DAYS,
+    max_workers: int = DEFAULT_FETCH_WORKERS,
+    lock_months: int = DEFAULT_TIMESHEET_LOCK_MONTHS,
+    refresh: bool = False,
+    rate_limiter: RateLimiter | None = None,
+) -> dict:
+    """
+    Fetch and accumulate time entries of several workspace members for the
+    days first_day..last_day (inclusive). assignees are member IDs, usernames
+    or email addresses; an empty list means all members. Members are resolved
+    once and all their windows are fetched through one pool.
+
+    Returns a dict with shape:
+        {
+          "from": "YYYY-MM-DD",
+          "to": "YYYY-MM-DD",
+          "users": {
+            user_id: {"name": str, "days": [...], "total_hours": float}
+          },
+          "total_hours": float
+        }
+    where "days" is as in fetch_timesheet(). Users are keyed by ID, as
+    usernames need not be unique.
+    """
+    store = TimeEntryStore()
+    users = _resolve_users(client, store, assignees)
+    _sync_entries(
+        client,
+        store,
+        [user_id for user_id, _ in users],
+        first_day,
+        last_day,
+        window_days,
+        max_workers,
+        lock_months,
+        refresh,
+        rate_limiter,
+    )
+    users_out = {}
+    total_hours = 0.0
+    for user_id, user_name in users:
+        days, user_total_hours = _build_days(
+            store.iter_task_totals(
+                user_id, first_day.isoformat(), last_day.isoformat()
+            )
+        )
+        users_out[user_id] = {
+            "name": user_name,
+            "days": days,
+            "total_hours": user_total_hours,
+        }
+        total_hours += user_total_hours
+    return {
+        "from": first_day.isoformat(),
+        "to": last_day.isoformat(),
+        "users": users_out,
+        "total_hours": round(total_hours, 2),
+    }
+
+
+def iter_timesheet_rows(
+    client: ClickUpClient,
+    first_day: datetime.date,
+    last_day: datetime.date,
+    window_days: int = DEFAULT_TIMESHEET_WINDOW_DAYS,
+    max_workers: int = DEFAULT_FETCH_WORKERS,
+    lock_months: int = DEFAULT_TIMESHEET_LOCK_MONTHS,
+    refresh: bool = False,
+    rate_limiter: RateLimiter | None = None,
+    assignees: list[str] | None = None,
+) -> Iterator[dict]:
+    """
+    Sync the days first_day..last_day (inclusive) like fetch_timesheet_range()
+    (or, given assignees, like fetch_team_timesheet()) and yield one flat row
+    per user, day and task, in the same order:
+        {"date": "YYYY-MM-DD", "user": str, "task_id": str,
+         "task_name": str, "hours": float}
+
+    Rows are aggregated and yielded one at a time, so memory use does not
+    grow with the length of the range or the number of users.
+    """
+    store = TimeEntryStore()
+    users = _resolve_users(client, store, assignees)
+    _sync_entries(
+        client,
+        store,
+        [user_id for user_id, _ in users],
+        first_day,
+        last_day,
+        window_days,
+        max_workers,
+        lock_months,
+        refresh,
+        rate_limiter,
+    )
+    for user_id, user_name in users:
+        for date, task_id, task_name, task_ms in store.iter_task_totals(
+            user_id, first_day.isoformat(), last_day.isoformat()
+        ):
+            yield {
+                "date": date,
+                "user": user_name,
+                "task_id": task_id,
+                "task_name": task_name,
+                "hours": round(task_ms * _MS_TO_HOURS, 2),
+            }
+
+
+def rollup_timesheet(
+    client: ClickUpClient,
+    first_day: datetime.date,
+    last_day: datetime.date,
+    by: str,
+    window_days: int = DEFAULT_TIMESHEET_WINDOW_DAYS,
+    max_workers: int = DEFAULT_FETCH_WORKERS,
+    lock_months: int = DEFAULT_TIMESHEET_LOCK_MONTHS,
+    refresh: bool = False,
+    rate_limiter: RateLimiter | None = None,
+    assignees: list[str] | None = None,
+) -> dict:
+    """
+    Sync the days first_day..last_day (inclusive) like fetch_timesheet_range()
+    (or, given assignees, like fetch_team_timesheet()) and roll the entries
+    of all users up per "day", ISO "week", "task" or "list" (see
+    EntryColumns.rollup()).
+
+    Returns a dict with shape:
+        {
+          "from": "YYYY-MM-DD",
+          "to": "YYYY-MM-DD",
+          "users": [str],
+          "rollup": str,
+          "rows": [{"key": str, "name": str, "hours": float}],
+          "total_hours": float
+        }
+    """
+    if by not in ROLLUPS:
+        raise ValueError(f"Unknown rollup: {by!r}")
+    store = TimeEntryStore()
+    users = _resolve_users(client, store, assignees)
+    user_ids = [user_id for user_id, _ in users]
+    _sync_entries(
+        client,
+        store,
+        user_ids,
+        first_day,
+        last_day,
+        window_days,
+        max_workers,
+        lock_months,
+        refresh,
+        rate_limiter,
+    )
+    columns = EntryColumns(DayBuckets(first_day, last_day))
+    columns.extend(
+        store.iter_entries(user_ids, first_day.isoformat(), last_day.isoformat())
+    )
+    return {
+        "from": first_day.isoformat(),
+        "to": last_day.isoformat(),
+        "users": [user_name for _, user_name in users],
+        "rollup": by,
+        "rows": [
+            {"key": key, "name": name, "hours": round(total_ms * _MS_TO_HOURS, 2)}
+            for key, name, total_ms in columns.rollup(by)
+        ],
+        "total_hours": round(columns.total_ms() * _MS_TO_HOURS, 2),
+    }
+
+
+def _write_rows(
+    rows: Iterable[dict],
+    output_format: str,
+    out: TextIO,
+    fieldnames: list[str] = _ROW_FIELDS,
+) -> None:
+    """Write timesheet rows to out as NDJSON or CSV, one row at a time."""
+    if output_format == "csv":
+        writer = csv.DictWriter(out, fieldnames=fieldnames, lineterminator="\n")
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+    else:
+        for row in rows:
+            out.write(json.dumps(row, ensure_ascii=False))
+            out.write("\n")
+
+
 @click.command()
 @click.option(
     "--year",
@@ -171,23 +727,251 @@ def fetch_timesheet(client: ClickUpClient, year: int, month: int) -> dict:
     type=click.IntRange(1, 12),
     help="Month to export (1–12).",
 )
-def main(year: int, month: int) -> None:
-    """Print a monthly time-sheet as JSON to stdout."""
+@click.option(
+    "--from",
+    "from_date",
+    type=click.DateTime(formats=["%Y-%m-%d"]),
+    default=None,
+    help="First day to export (YYYY-MM-DD), instead of --year/--month.",
+)
+@click.option(
+    "--to",
+    "to_date",
+    type=click.DateTime(formats=["%Y-%m-%d"]),
+    default=None,
+    show_default="today",
+    help="Last day to export (YYYY-MM-DD), used with --from.",
+)
+@click.option(
+    "--window-days",
+    default=DEFAULT_TIMESHEET_WINDOW_DAYS,
+    show_default=True,
+    type=click.IntRange(min=0),
+    help="Fetch this many days per request (0 for a single request).",
+)
+@click.option(
+    "--workers",
+    default=None,
+    show_default="configured fetch workers",
+    type=click.IntRange(min=1),
+    help="Number of requests to run at once.",
+)
+@click.option(
+    "--refresh",
+    is_flag=True,
+    help="Fetch all days from ClickUp, even those stored locally.",
+)
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(["json", "ndjson", "csv"]),
+    default="json",
+    show_default=True,
+    help="json: one nested document; ndjson/csv: one row per day and task, "
+    "streamed as it is aggregated.",
+)
+@click.option(
+    "--assignees",
+    default=None,
+    help="Comma-separated user IDs, usernames or emails of workspace members "
+    "to export instead of yourself.",
+)
+@click.option(
+    "--all-members",
+    is_flag=True,
+    help="Export every member of the workspace.",
+)
+@click.option(
+    "--rollup",
+    type=click.Choice(ROLLUPS),
+    default=None,
+    help="Export totals per day, ISO week, task or list (of all exported "
+    "users together) instead of per day and task.",
+)
+@click.option(
+    "--local",
+    is_flag=True,
+    help="Preview from the registrations made with Zup on this machine, "
+    "without contacting ClickUp.",
+)
+def main(
+    year: int,
+    month: int,
+    from_date: datetime.datetime | None,
+    to_date: datetime.datetime | None,
+    window_days: int,
+    workers: int | None,
+    refresh: bool,
+    output_format: str,
+    assignees: str | None,
+    all_members: bool,
+    rollup: str | None,
+    local: bool,
+) -> None:
+    """Print a monthly (or --from/--to) time-sheet to stdout."""
     logging.basicConfig(
         level=logging.WARNING,
         format="%(levelname)-8s %(name)s: %(message)s",
     )
     LOG.setLevel(logging.DEBUG)
 
-    token = ConfigStore().get("clickup_token")
+    if to_date is not None and from_date is None:
+        raise click.UsageError("--to requires --from.")
+    first_day = from_date.date() if from_date else None
+    last_day = to_date.date() if to_date else datetime.date.today()
+    if first_day is not None and first_day > last_day:
+        raise click.UsageError("--from must not be after --to.")
+
+    if assignees is not None and all_members:
+        raise click.UsageError("--assignees and --all-members are exclusive.")
+    assignee_list: list[str] | None = None
+    if all_members:
+        assignee_list = []
+    elif assignees is not None:
+        assignee_list = [a.strip() for a in assignees.split(",") if a.strip()]
+        if not assignee_list:
+            raise click.UsageError("--assignees must name at least one member.")
+
+    config_store = ConfigStore()
+    token = config_store.get("clickup_token")
+
+    if local:
+        if assignee_list is not None or rollup is not None or refresh:
+            raise click.UsageError(
+                "--local cannot be combined with --assignees, --all-members, "
+                "--rollup or --refresh."
+            )
+        identity = TimeEntryStore().get_identity(token) if token else None
+        user_name = identity[1] if identity else ""
+        if first_day is None:
+            first_day, last_day = _month_range(year, month)
+        if output_format != "json":
+            _write_rows(
+                (
+                    {
+                        "date": date,
+                        "user": user_name,
+                        "task_id": task_id,
+                        "task_name": task_name,
+                        "hours": round(task_ms * _MS_TO_HOURS, 2),
+                    }
+                    for date, task_id, task_name, task_ms in _iter_local_task_totals(
+                        first_day, last_day
+                    )
+                ),
+                output_format,
+                sys.stdout,
+            )
+            return
+        sheet = local_timesheet(first_day, last_day, user_name)
+        if from_date is None:
+            del sheet["from"], sheet["to"]
+            sheet = {"year": year, "month": month, **sheet}
+        json.dump(sheet, sys.stdout, indent=2, ensure_ascii=False)
+        sys.stdout.write("\n")
+        return
+
     if not token:
         raise click.ClickException(
             "No ClickUp API token configured. Set it via the Zup settings dialog."
         )
 
-    client = ClickUpClient(user_token=token)
+    max_workers: int = (
+        config_store.get("fetch_workers", DEFAULT_FETCH_WORKERS)
+        if workers is None
+        else workers
+    )
+    lock_months = config_store.get(
+        "timesheet_lock_months", DEFAULT_TIMESHEET_LOCK_MONTHS
+    )
+    rate_limiter = RateLimiter(
+        config_store.get("requests_per_minute", DEFAULT_REQUESTS_PER_MINUTE)
+    )
+
+    client = ClickUpClient(user_token=token, metadata_cache=ClickUpMetadataCache())
+
+    if rollup is not None:
+        if first_day is None:
+            first_day, last_day = _month_range(year, month)
+        try:
+            sheet = rollup_timesheet(
+                client,
+                first_day,
+                last_day,
+                rollup,
+                window_days,
+                max_workers,
+                lock_months,
+                refresh,
+                rate_limiter,
+                assignee_list,
+            )
+        except Exception as exc:
+            raise click.ClickException(str(exc)) from exc
+        if output_format != "json":
+            _write_rows(sheet["rows"], output_format, sys.stdout, _ROLLUP_FIELDS)
+            return
+        json.dump(sheet, sys.stdout, indent=2, ensure_ascii=False)
+        sys.stdout.write("\n")
+        return
+
+    if output_format != "json":
+        if first_day is None:
+            first_day, last_day = _month_range(year, month)
+        rows = iter_timesheet_rows(
+            client,
+            first_day,
+            last_day,
+            window_days,
+            max_workers,
+            lock_months,
+            refresh,
+            rate_limiter,
+            assignee_list,
+        )
+        try:
+            _write_rows(rows, output_format, sys.stdout)
+        except Exception as exc:
+            raise click.ClickException(str(exc)) from exc
+        return
+
     try:
-        sheet = fetch_timesheet(client, year, month)
+        if assignee_list is not None:
+            if first_day is None:
+                first_day, last_day = _month_range(year, month)
+            sheet = fetch_team_timesheet(
+                client,
+                first_day,
+                last_day,
+                assignee_list,
+                window_days,
+                max_workers,
+                lock_months,
+                refresh,
+                rate_limiter,
+            )
+        elif first_day is not None:
+            sheet = fetch_timesheet_range(
+                client,
+                first_day,
+                last_day,
+                window_days,
+                max_workers,
+                lock_months,
+                refresh,
+                rate_limiter,
+            )
+        else:
+            sheet = fetch_timesheet(
+                client,
+                year,
+                month,
+                window_days,
+                max_workers,
+                lock_months,
+                refresh,
+                rate_limiter,
+            )
     except Exception as exc:
         raise click.ClickException(str(exc)) from exc
 
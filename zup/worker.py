@@ -0,0 +1,45 @@
+"""
+A generic QThreadPool worker, shared by the dialogs and background services.
+"""
+
+import logging
+from typing import Any, Callable
+
+from PySide6.QtCore import QObject, QRunnable, Signal, Slot
+
+LOG = logging.getLogger(__name__)
+
+
+class WorkerSignals(QObject):
+    """
+    Signals emitted by a Worker. Connected slots run on the receiver's thread.
+    """
+
+    result = Signal(object)  # the return value of the worker's function
+    error = Signal(str)  # the exception message if the function raised
+
+
+class Worker(QRunnable):
+    """
+    A generic worker thread that can run any function with arguments.
+    """
+
+    def __init__(self, fn: Callable, *args: Any, **kwargs: Any) -> None:
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = WorkerSignals()
+
+    @Slot()
+    def run(self) -> None:
+        """
+        Execute the worker's function.
+        """
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception as exc:
+            LOG.exception("Worker function %s failed", self.fn)
+            self.signals.error.emit(str(exc))
+        else:
+            self.signals.result.emit(result)
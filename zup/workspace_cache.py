@@ -0,0 +1,56 @@
+"""
+Persistent on-disk cache of the ClickUp workspace tree shown in the list picker.
+
+The tree has the shape returned by ClickUpClient.get_workspace_tree(), except
+that spaces without a "folders" key and folders without a "lists" key have
+not been loaded yet (see the lazy mode of ListPickerDialog).
+"""
+
+import hashlib
+import time
+
+from zup.json_cache import JsonFileCache
+
+
+def token_fingerprint(user_token: str) -> str:
+    """Identifies the token (and so the workspace) a tree belongs to."""
+    return hashlib.sha256(user_token.encode()).hexdigest()[:16]
+
+
+class WorkspaceTreeCache(JsonFileCache):
+    """
+    A class for managing the cached workspace tree.
+
+    The cache file looks like:
+        {"token": str, "fetched_at": float, "tree": [...]}
+    where "token" is a fingerprint of the API token the tree was fetched with
+    and "fetched_at" is a UNIX timestamp in seconds.
+    """
+
+    _FILENAME = "workspace_tree.json"
+
+    def get(self, user_token: str) -> tuple[list[dict], float] | None:
+        """
+        Returns (tree, fetched_at) cached for the given token, or None.
+        """
+        with self._lock:
+            cached = self._load()
+        if (
+            not isinstance(cached, dict)
+            or cached.get("token") != token_fingerprint(user_token)
+            or not isinstance(cached.get("tree"), list)
+        ):
+            return None
+        return cached["tree"], cached.get("fetched_at", 0)
+
+    def set(self, user_token: str, tree: list[dict]) -> None:
+        """
+        Stores the tree for the given token and writes it to disk.
+        """
+        cached = {
+            "token": token_fingerprint(user_token),
+            "fetched_at": time.time(),
+            "tree": tree,
+        }
+        with self._lock:
+            self._save(cached)
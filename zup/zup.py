@@ -1,379 +1,41 @@
 """
 A PySide6 (Qt6) application for registering time spent on ClickUp tasks.
+
+Startup shows the tray icon first. The rest (the registration queue, the
+scheduler and their dependencies) is set up right after that, on the first
+pass of the event loop. The log-work dialog (zup.log_work), the settings
+dialog (zup.configuration) and the ClickUp SDK are only loaded when first
+used.
 """
 
 import logging
-import os
-import re
 import signal
 import sys
-from typing import Any, Callable, Optional, cast
-
-import pendulum
-from PySide6.QtCore import QEvent, QRunnable, Qt, QThreadPool, QTimer, Slot
-from PySide6.QtGui import QCloseEvent, QIcon, QKeyEvent
-from PySide6.QtWidgets import (
-    QApplication,
-    QComboBox,
-    QCompleter,
-    QDialog,
-    QHBoxLayout,
-    QLabel,
-    QMenu,
-    QMessageBox,
-    QPushButton,
-    QSystemTrayIcon,
-    QToolButton,
-    QVBoxLayout,
-    QWidget,
-)
+from typing import TYPE_CHECKING, Any, Optional
+
+from PySide6.QtCore import QThreadPool, QTimer, Slot
+from PySide6.QtGui import QIcon
+from PySide6.QtWidgets import QApplication, QMenu, QMessageBox, QSystemTrayIcon, QWidget
 
-from zup.clickup_client import ClickUpClient
 from zup.config_store import ConfigStore
-from zup.configuration import Configuration
 from zup.constants import (
     DEFAULT_CLICKUP_LISTS,
-    DEFAULT_INTERVAL_HOURS,
-    DEFAULT_INTERVAL_MINUTES,
-    DEFAULT_SCHEDULE_LIST,
-    DEFAULT_SCHEDULE_TYPE,
+    DEFAULT_PREFETCH_MINUTES,
+    DEFAULT_SUBMIT_WORKERS,
 )
+from zup.icons import resolve_icon
 
-LOG = logging.getLogger(__name__)
-
-
-def resolve_icon(filename: str) -> str:
-    return os.path.join(os.path.dirname(os.path.abspath(__file__)), "icons", filename)
-
-
-_DURATION_TOKEN = re.compile(r"(\d+(?:\.\d+)?)\s*(h|m|d)", re.IGNORECASE)
-
-
-def _parse_duration(text: str) -> float:
-    """
-    Parse a human-readable duration string into decimal hours.
-
-    Supported units: h (hours), m (minutes), d (day = 8 hours).
-    Multiple tokens are summed: e.g. "1 h 30 m" -> 1.5.
-    Raises ValueError for unrecognised content.
-    """
-    text = text.strip()
-    matches = _DURATION_TOKEN.findall(text)
-    if not matches:
-        raise ValueError(f"no valid tokens found in {text!r}")
-    remainder = _DURATION_TOKEN.sub("", text).strip()
-    if remainder:
-        raise ValueError(f"unrecognised content {remainder!r}")
-    total = 0.0
-    for value, unit in matches:
-        n = float(value)
-        if unit.lower() == "h":
-            total += n
-        elif unit.lower() == "m":
-            total += n / 60
-        elif unit.lower() == "d":
-            total += n * 8
-    return total
-
-
-class Worker(QRunnable):
-    """
-    A generic worker thread that can run any function with arguments.
-    """
-
-    def __init__(self, fn: Callable, *args: Any, **kwargs: Any) -> None:
-        super().__init__()
-        self.fn = fn
-        self.args = args
-        self.kwargs = kwargs
-
-    @Slot()
-    def run(self) -> None:
-        """
-        Execute the worker's function.
-        """
-        self.fn(*self.args, **self.kwargs)
-
-
-class LogWorkDialog(QDialog):
-    """
-    This is the main log-work dialog of this application.
-    """
-
-    def __init__(
-        self, config_store: ConfigStore, parent: Optional[QWidget] = None
-    ) -> None:
-        QDialog.__init__(self, parent)
-        self.config_store = config_store
-        self.setWindowTitle(self.tr("Log Work"))
-        self.installEventFilter(self)
-        self.internal_close_flag = False
-        self.submit_thread_pool = QThreadPool()
-
-        token = self.config_store.get("clickup_token", "")
-        list_ids = self.config_store.get("clickup_lists", DEFAULT_CLICKUP_LISTS)
-        try:
-            self.cu_client = ClickUpClient(user_token=token)
-            raw_issues = self.cu_client.get_relevant_issues(list_ids)
-        except Exception:
-            LOG.exception("Failed to initialise ClickUp client or fetch issues")
-            self.cu_client = None
-            raw_issues = []
-
-        self.issue_selector = QComboBox(self)
-        self.issue_selector.setEditable(True)
-        relevant_issues = []
-        for issue in raw_issues:
-            list_prefix = f"[{issue['list_name']}] " if issue.get("list_name") else ""
-            issue_display_string = f"{list_prefix}{issue['name']}  ({issue['id']})"
-            relevant_issues.append(issue_display_string)
-            self.issue_selector.addItem(issue_display_string, issue["id"])
-
-        completer = QCompleter(relevant_issues)
-        completer.setCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
-        completer.setFilterMode(Qt.MatchFlag.MatchContains)
-        self.issue_selector.setCompleter(completer)
-
-        popup = completer.popup()
-        popup.setWindowFlags(Qt.WindowType.ToolTip)
-
-        self.duration_selector = QComboBox()
-        self.duration_selector.setEditable(True)
-        duration_values = [
-            self.tr("4 h"),
-            self.tr("1 h"),
-            self.tr("8 h"),
-        ]
-        for label in duration_values:
-            self.duration_selector.addItem(label)
-        register_button = QPushButton(
-            QIcon(resolve_icon("log-work.png")), self.tr("&Register"), self
-        )
-        register_button.clicked.connect(self._register_action)
-        cancel_button = QPushButton(
-            QIcon(resolve_icon("cancel.png")), self.tr("&Cancel")
-        )
-        cancel_button.clicked.connect(self._cancel_action)
-
-        snooze_button = QToolButton(self)
-        snooze_button.setIcon(QIcon(resolve_icon("snooze.png")))
-        snooze_button.setPopupMode(QToolButton.ToolButtonPopupMode.InstantPopup)
-        snooze_menu = QMenu(self)
-        snooze_menu.addAction(self.tr("15 minutes"), lambda: self._snooze(15))
-        snooze_menu.addAction(self.tr("30 minutes"), lambda: self._snooze(30))
-        snooze_menu.addAction(self.tr("1 hour"), lambda: self._snooze(60))
-        snooze_menu.addAction(self.tr("4 hours"), lambda: self._snooze(4 * 60))
-        snooze_menu.addAction(self.tr("Next day"), lambda: self._snooze(-1))
-        snooze_menu.addAction(self.tr("Next Monday"), lambda: self._snooze(-2))
-        snooze_button.setMenu(snooze_menu)
-
-        input_layout = QHBoxLayout()
-        input_layout.addWidget(snooze_button)
-        input_layout.addWidget(self.issue_selector)
-        input_layout.addWidget(self.duration_selector)
-        input_layout.addWidget(register_button)
-        input_layout.addWidget(cancel_button)
-
-        self.toggle_history_button = QToolButton()
-        self.toggle_history_button.setText("Registration history")
-        self.toggle_history_button.setToolButtonStyle(
-            Qt.ToolButtonStyle.ToolButtonTextBesideIcon
-        )
-        self.toggle_history_button.setArrowType(Qt.ArrowType.RightArrow)
-        self.toggle_history_button.setCheckable(True)
-        self.toggle_history_button.setChecked(False)
-        self.toggle_history_button.setStyleSheet("QToolButton { border: none; }")
-        self.toggle_history_button.toggled.connect(self.toggle_log_content)
-
-        self.log_widget = QWidget()
-        self.log_layout = QVBoxLayout(self.log_widget)
-        for item in reversed(self.config_store.get("registration_history", [])):
-            item_datetime = cast(
-                pendulum.DateTime, pendulum.parse(item["datetime"])
-            ).format("YYYY-MM-DD HH:mm:ss")
-            self.log_layout.addWidget(
-                QLabel(
-                    f"{item_datetime}: {item['issue_title']}: {item['time_spent']} hours"
-                )
-            )
-        self.log_layout.addStretch(1)
-        self.log_widget.setVisible(False)
-
-        last_issue_id = self.config_store.get("last_registration_issue_id", "")
-        if last_issue_id:
-            last_index = self.issue_selector.findData(last_issue_id)
-            if last_index >= 0:
-                self.issue_selector.setCurrentIndex(last_index)
-
-        base_layout = QVBoxLayout()
-        base_layout.addLayout(input_layout)
-        base_layout.addWidget(self.toggle_history_button)
-        base_layout.addWidget(self.log_widget)
-        base_layout.addStretch(1)
-        self.setLayout(base_layout)
-        self.setWindowFlag(Qt.WindowType.WindowStaysOnTopHint)
-        self.show()
-
-        # Center the dialog on the screen
-        screen = QApplication.primaryScreen()
-        dialog_geometry = self.frameGeometry()
-        center_point = screen.geometry().center()
-        dialog_geometry.moveCenter(center_point)
-        self.move(dialog_geometry.topLeft())
-
-    @Slot(bool)
-    def toggle_log_content(self, checked):
-        if checked:
-            self.toggle_history_button.setArrowType(Qt.ArrowType.DownArrow)
-            self.toggle_history_button.setText("")
-            self.log_widget.setVisible(True)
-        else:
-            self.toggle_history_button.setArrowType(Qt.ArrowType.RightArrow)
-            self.toggle_history_button.setText("Registration history")
-            self.log_widget.setVisible(False)
-            QTimer.singleShot(1, self.adjustSize)
-
-    def internal_close(self):
-        self.internal_close_flag = True
-        self.close()
-        self.internal_close_flag = False
-
-    def closeEvent(self, event: QCloseEvent) -> None:
-        LOG.debug("EventHandler: closeEvent")
-        event.ignore()
-        if self.internal_close_flag:
-            LOG.debug("EventHandler: closeEvent: Internal close. Not doing anything.")
-            self.hide()
-            return
-        next_run = self.config_store.get("next_run")
-        if (
-            len(next_run) == 0
-            or cast(pendulum.DateTime, pendulum.parse(next_run)) < pendulum.now()
-        ):
-            LOG.debug("Snoozing due to closeEvent")
-            self._snooze(15)
-        else:
-            LOG.debug("Just closing.")
-            self.hide()
+if TYPE_CHECKING:
+    import pendulum
 
-    def eventFilter(self, widget, event: QEvent) -> bool:
-        if (
-            event.type() == QEvent.Type.KeyPress
-            and isinstance(event, QKeyEvent)
-            and event.key()
-            in (
-                Qt.Key.Key_Enter,
-                Qt.Key.Key_Return,
-                Qt.Key.Key_Escape,
-            )
-        ):
-            LOG.debug("Ignoring keystroke")
-            return True
-        else:
-            return super(LogWorkDialog, self).eventFilter(widget, event)
-
-    def _snooze(self, duration: int) -> None:
-        if duration > 0:
-            LOG.debug("Snooze: Normal duration: %d", duration)
-            next_run = pendulum.now().add(minutes=duration)
-        else:
-            LOG.debug("Snooze: Special duration: %d", duration)
-            if duration == -1:
-                next_run = pendulum.tomorrow().add(hours=6)
-            elif duration == -2:
-                next_run = pendulum.now().next(pendulum.MONDAY).add(hours=6)
-            else:
-                raise ValueError(f"Unknown snooze duration: {duration}")
-
-        self.config_store.set("next_run", next_run.for_json())
-        self.hide()
-
-    def _schedule_next_run(self) -> None:
-        next_run = self.config_store.get("next_run")
-        if (
-            len(next_run) == 0
-            or cast(pendulum.DateTime, pendulum.parse(next_run)) < pendulum.now()
-        ):
-            LOG.debug("Schedule run in the future")
-            if (
-                self.config_store.get("schedule_type", DEFAULT_SCHEDULE_TYPE)
-                == "schedule"
-            ):
-                scheduled_run = None
-                for time_value in self.config_store.get(
-                    "schedule_list", DEFAULT_SCHEDULE_LIST
-                ):
-                    hours, minutes = time_value.split(":")
-                    pendulum_time = pendulum.today().add(
-                        hours=int(hours), minutes=int(minutes)
-                    )
-                    if pendulum_time > pendulum.now():
-                        scheduled_run = pendulum_time
-                        break
-                if scheduled_run is None:
-                    hours, minutes = self.config_store.get(
-                        "schedule_list", DEFAULT_SCHEDULE_LIST
-                    )[0].split(":")
-                    scheduled_run = pendulum.tomorrow().add(
-                        hours=int(hours), minutes=int(minutes)
-                    )
-            else:
-                interval_hours = self.config_store.get(
-                    "interval_hours", DEFAULT_INTERVAL_HOURS
-                )
-                interval_minutes = self.config_store.get(
-                    "interval_minutes", DEFAULT_INTERVAL_MINUTES
-                )
-                scheduled_run = pendulum.now().add(
-                    hours=interval_hours, minutes=interval_minutes
-                )
-            LOG.debug("Next run scheduled at: %s", scheduled_run)
-            self.config_store.set("next_run", scheduled_run.for_json())
-        else:
-            LOG.debug("We were probably executed manually. Won't schedule.")
-
-    def _register_action(self) -> None:
-        issue_id: str = self.issue_selector.currentData()
-        issue_title: str = self.issue_selector.currentText()
-        try:
-            decimal_hours = _parse_duration(self.duration_selector.currentText())
-        except ValueError as e:
-            QMessageBox.warning(
-                self,
-                self.tr("Invalid duration"),
-                self.tr(
-                    f"Could not parse duration: {e}\n\n"
-                    "Use units: h (hours), m (minutes), d (day = 8 h).\n"
-                    'Examples: "1 h", "30 m", "1 h 30 m", "0.5 h"'
-                ),
-            )
-            return
+    from zup.clickup_client import ClickUpClient
+    from zup.configuration import Configuration
+    from zup.log_work import LogWorkDialog
+    from zup.registration_queue import RegistrationQueue
+    from zup.scheduler import Scheduler
+    from zup.worker import Worker
 
-        if self.cu_client is not None:
-            self.submit_thread_pool.start(
-                Worker(self.cu_client.submit_time_registration, issue_id, decimal_hours)
-            )
-        else:
-            LOG.warning("No ClickUp client available; skipping time submission.")
-
-        registration_history = self.config_store.get("registration_history", [])
-        registration_history.append(
-            {
-                "datetime": str(pendulum.now()),
-                "issue_id": issue_id,
-                "issue_title": issue_title,
-                "time_spent": decimal_hours,
-            }
-        )
-        registration_history = registration_history[-5:]
-        self.config_store.set("registration_history", registration_history)
-        self.config_store.set("last_registration_issue_id", issue_id)
-        self._schedule_next_run()
-        self.close()
-
-    def _cancel_action(self) -> None:
-        self._schedule_next_run()
-        self.close()
+LOG = logging.getLogger(__name__)
 
 
 class SystemTrayIcon(QSystemTrayIcon):
@@ -385,13 +47,23 @@ class SystemTrayIcon(QSystemTrayIcon):
         QSystemTrayIcon.__init__(self, icon, parent)
         self._parent_widget = parent
         self.config_store = ConfigStore()
-        self._logwork_dialog: Optional[LogWorkDialog] = None
-        self._settings_dialog: Optional[Configuration] = None
-        self.setToolTip(self.tr("Log work to ClickUp"))
+        self._logwork_dialog: Optional["LogWorkDialog"] = None
+        self._settings_dialog: Optional["Configuration"] = None
+        self._thread_pool = QThreadPool(self)
+        self._prefetch_worker: Optional["Worker"] = None
+        # The token ClickUp last rejected; see _registration_auth_failed().
+        self._rejected_token: Optional[str] = None
+        # Set up by start().
+        self.registration_queue: Optional["RegistrationQueue"] = None
+        self.scheduler: Optional["Scheduler"] = None
+        self._update_tool_tip(0)
+
         self.main_menu = QMenu(parent)
-        log_work_item = self.main_menu.addAction(self.tr("Log work now"))
-        log_work_item.triggered.connect(self._log_work)
-        log_work_item.setIcon(QIcon(resolve_icon("log-work.png")))
+        # Enabled by start(), once there is a queue to register work with.
+        self._log_work_item = self.main_menu.addAction(self.tr("Log work now"))
+        self._log_work_item.triggered.connect(self._log_work)
+        self._log_work_item.setIcon(QIcon(resolve_icon("log-work.png")))
+        self._log_work_item.setEnabled(False)
 
         settings_item = self.main_menu.addAction(self.tr("Settings"))
         settings_item.setIcon(QIcon(resolve_icon("settings.png")))
@@ -405,34 +77,169 @@ class SystemTrayIcon(QSystemTrayIcon):
         self.setContextMenu(self.main_menu)
         self.activated.connect(self._activated_action)
 
-        # Set up a wake-timer that checks every minute if it is time to show a
-        # LogWorkDialog.
-        self.wake_timer = QTimer(self._parent_widget)
-        self.wake_timer.setTimerType(Qt.TimerType.VeryCoarseTimer)
-        self.wake_timer.timeout.connect(self._timer_tick)
-        self.wake_timer.start(60 * 1000)
-        self._timer_tick()
+    def start(self) -> None:
+        """
+        Starts sending registrations and scheduling pop-ups. Called once the
+        icon is shown.
+        """
+        from zup.registration_queue import RegistrationQueue
+        from zup.scheduler import Scheduler
+
+        # Registrations journaled by an earlier session are resumed right away.
+        self.registration_queue = RegistrationQueue(
+            self._submit_registration,
+            max_concurrent=self.config_store.get(
+                "submit_workers", DEFAULT_SUBMIT_WORKERS
+            ),
+            parent=self,
+        )
+        self.registration_queue.pending_changed.connect(self._update_tool_tip)
+        self.registration_queue.failed.connect(self._registration_failed)
+        self.registration_queue.auth_failed.connect(self._registration_auth_failed)
+        self._update_tool_tip(self.registration_queue.pending_count())
+        self.registration_queue.flush()
+
+        # The scheduler wakes us up when it is time to show a LogWorkDialog,
+        # and shortly before that to warm the task cache.
+        self.scheduler = Scheduler(self.config_store, self)
+        self.scheduler.due.connect(self._on_due)
+        self.scheduler.prefetch_due.connect(self._maybe_prefetch)
+        self.scheduler.start()
+        self._log_work_item.setEnabled(True)
+        self._prewarm()
+
+    def _get_client(self) -> "ClickUpClient":
+        """
+        Returns the shared ClickUpClient for the configured token.
+        """
+        from zup.clickup_client import shared_client
+
+        return shared_client(self.config_store.get("clickup_token", ""))
+
+    def _submit_registration(self, issue_id: str, decimal_hours: float) -> None:
+        """
+        Submits a queued registration. Runs on a RegistrationQueue worker thread.
+        """
+        self._get_client().submit_time_registration(issue_id, decimal_hours)
+
+    def _prewarm(self) -> None:
+        """
+        Opens a connection to ClickUp in the background, for the requests
+        that follow shortly.
+        """
+        if not self.config_store.get("clickup_token", ""):
+            return
+        from zup.worker import Worker
+
+        self._thread_pool.start(Worker(self._get_client().prewarm))
+
+    @Slot(object)
+    def _maybe_prefetch(self, next_run_dt: "pendulum.DateTime") -> None:
+        """
+        Warms the task cache in the background ahead of the pop-up at
+        next_run_dt (the scheduler calls this prefetch_minutes before it),
+        unless the cache is younger than prefetch_minutes. In that case only
+        a connection to ClickUp is opened.
+        """
+        prefetch_minutes = self.config_store.get(
+            "prefetch_minutes", DEFAULT_PREFETCH_MINUTES
+        )
+        if prefetch_minutes <= 0 or self._prefetch_worker is not None:
+            return
+        from zup.log_work import _sync_task_cache
+        from zup.task_cache import TaskCache
+        from zup.worker import Worker
+
+        list_ids = self.config_store.get("clickup_lists", DEFAULT_CLICKUP_LISTS)
+        age = TaskCache().age(list_ids)
+        if age is not None and age < prefetch_minutes * 60:
+            LOG.debug("Task cache is %d s old; not prefetching.", age)
+            self._prewarm()
+            return
+
+        LOG.debug("Prefetching tasks ahead of the pop-up at %s", next_run_dt)
+        self._prefetch_worker = Worker(
+            _sync_task_cache, self._get_client(), self.config_store
+        )
+        self._prefetch_worker.signals.result.connect(self._prefetch_done)
+        self._prefetch_worker.signals.error.connect(self._prefetch_done)
+        self._thread_pool.start(self._prefetch_worker)
+
+    def _prefetch_done(self, *_args: Any) -> None:
+        self._prefetch_worker = None
+
+    @Slot(int)
+    def _update_tool_tip(self, pending: int) -> None:
+        tool_tip = self.tr("Log work to ClickUp")
+        if pending:
+            tool_tip += self.tr(" ({0} registration(s) waiting to be sent)").format(
+                pending
+            )
+        self.setToolTip(tool_tip)
+
+    @Slot(str)
+    def _registration_failed(self, message: str) -> None:
+        self.showMessage(
+            self.tr("Registration failed"),
+            message,
+            QSystemTrayIcon.MessageIcon.Warning,
+        )
+
+    @Slot()
+    def _registration_auth_failed(self) -> None:
+        # Submissions resume once the token is changed; see _settings_saved().
+        self._rejected_token = self.config_store.get("clickup_token", "")
+        assert self.registration_queue is not None
+        self.showMessage(
+            self.tr("ClickUp rejected the API token"),
+            self.tr(
+                "{0} registration(s) will be sent once the token is updated in"
+                " the settings."
+            ).format(self.registration_queue.pending_count()),
+            QSystemTrayIcon.MessageIcon.Warning,
+        )
+
+    @Slot()
+    def _settings_saved(self) -> None:
+        if (
+            self.registration_queue is not None
+            and self.config_store.get("clickup_token", "") != self._rejected_token
+        ):
+            self.registration_queue.resume()
 
     def _activated_action(self, reason: QSystemTrayIcon.ActivationReason) -> None:
         LOG.debug(reason)
 
     def _settings_action(self) -> None:
         LOG.debug("Open settings window")
+        from zup.configuration import Configuration
+
         if self._settings_dialog is not None:
             self._settings_dialog.close()
             self._settings_dialog.destroy()
         self._settings_dialog = Configuration(self.config_store, self._parent_widget)
+        self._settings_dialog.saved.connect(self._settings_saved)
         self._settings_dialog.show()
 
     def _log_work(self) -> None:
+        if self.registration_queue is None or self.scheduler is None:
+            LOG.debug("Not started yet; not opening LogWorkDialog.")
+            return
         LOG.debug("Open LogWorkDialog.")
+        from zup.log_work import LogWorkDialog
 
         if self._logwork_dialog is not None:
             self._logwork_dialog.internal_close()
             self._logwork_dialog.destroy()
-        self._logwork_dialog = LogWorkDialog(self.config_store, self._parent_widget)
+        self._logwork_dialog = LogWorkDialog(
+            self.config_store,
+            self.registration_queue,
+            self.scheduler,
+            self._parent_widget,
+        )
 
-    def _timer_tick(self) -> None:
+    @Slot()
+    def _on_due(self) -> None:
         if self._logwork_dialog is not None and self._logwork_dialog.isVisible():
             LOG.debug("Window is already open.")
             return
@@ -443,22 +250,13 @@ class SystemTrayIcon(QSystemTrayIcon):
                 self._settings_action()
             return
 
-        next_run = self.config_store.get("next_run")
-        if len(next_run) == 0:
-            LOG.debug("We have never executed. We should do that right now..")
-            self._log_work()
-        else:
-            next_run_dt = cast(pendulum.DateTime, pendulum.parse(next_run))
-            LOG.debug("Next run at/after: %s", next_run_dt)
-            if next_run_dt <= pendulum.now():
-                LOG.debug("It's time to pop up the registration window")
-                self._log_work()
+        self._log_work()
 
 
 def _maybe_migrate_tp_config(config_store: ConfigStore) -> None:
     """
     If legacy TargetProcess keys are present in config, prompt the user to
-    remove them. This runs once at startup before the main window is shown.
+    remove them. This runs once at startup, before pop-ups are scheduled.
     """
     legacy_keys = config_store.get_legacy_tp_keys()
     if not legacy_keys:
@@ -483,9 +281,21 @@ def _maybe_migrate_tp_config(config_store: ConfigStore) -> None:
         LOG.debug("User chose to keep legacy TP keys.")
 
 
-def main() -> None:
+def _start(tray_icon: SystemTrayIcon) -> None:
+    """
+    The part of the startup that can wait until the tray icon is shown.
+    """
+    from zup.state_store import StateStore
+
     config_store = ConfigStore()
-    config_store.set("next_run", "")
+    _maybe_migrate_tp_config(config_store)
+    state_store = StateStore()
+    state_store.migrate_from_config(config_store)
+    state_store.set("next_run", "")
+    tray_icon.start()
+
+
+def main() -> None:
     logging.basicConfig(
         level=logging.DEBUG,
         format="%(levelname)-8s %(funcName)s:%(filename)s:%(lineno)d %(message)s",
@@ -495,11 +305,11 @@ def main() -> None:
     sigint_timer = QTimer()
     sigint_timer.start(500)
     sigint_timer.timeout.connect(lambda: None)
-    _maybe_migrate_tp_config(config_store)
     root_widget = QWidget()
     tray_icon = SystemTrayIcon(QIcon(resolve_icon("zup.png")), root_widget)
     tray_icon.show()
     tray_icon.showMessage("'zup", app.tr("I'm here in case you need me."))
+    QTimer.singleShot(0, lambda: _start(tray_icon))
     sys.exit(app.exec())
 
 